@@ -1,3 +1,5 @@
+from pathlib import Path
+
 from pydantic_settings import BaseSettings
 
 
@@ -7,6 +9,53 @@ class Settings(BaseSettings):
     CLOUD_RUN_PARSE_URL: str = "https://dawsheet-proxy-service-1046102063670.us-central1.run.app/parse"
     CORS_ORIGINS: str = "*"
     LYRICS_PROVIDER_ENABLED: bool = True
+    # LRCLIB "get" endpoint; point at bench/lrclib_standin.py for offline load tests
+    LYRICS_LRCLIB_URL: str = "https://lrclib.net/api/get"
+    # Shared LRCLIB client pool (HTTP/2 is used only when the h2 package is installed)
+    LYRICS_HTTP_MAX_CONNECTIONS: int = 20
+    LYRICS_HTTP_MAX_KEEPALIVE: int = 10
+    LYRICS_HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    LYRICS_HTTP2: bool = True
+    # Lyrics lookup cache: in-process LRU entries, TTLs (seconds) for found lyrics and for
+    # misses, and the SQLite file shared by all workers ("" keeps the cache in memory only)
+    LYRICS_CACHE_SIZE: int = 2048
+    LYRICS_CACHE_TTL: float = 7 * 24 * 3600
+    LYRICS_CACHE_NEGATIVE_TTL: float = 3600
+    LYRICS_CACHE_PATH: str = "lyrics_cache.sqlite3"
+    # Offline lyrics corpus (<dir>/<Album>/<Title>.txt): untimed lines used when LRCLIB is
+    # unavailable (breaker open, budget spent), or before LRCLIB with LYRICS_LOCAL_FIRST;
+    # a missing directory just leaves the local tier empty
+    LYRICS_LOCAL_DIR: str = str(Path(__file__).resolve().parents[2] / "References" / "The Beatles Lyrics" / "lyrics")
+    LYRICS_LOCAL_ARTIST: str = "The Beatles"
+    LYRICS_LOCAL_MIN_SCORE: float = 0.75
+    LYRICS_LOCAL_FIRST: bool = False
+    # LRCLIB circuit breaker: opens when at least MIN_CALLS calls in the last WINDOW_S
+    # seconds failed in FAILURE_RATIO share (errors, 5xx/429, timeouts), then refuses
+    # calls for OPEN_S seconds before one probe; lookups meanwhile use the offline tiers
+    LYRICS_BREAKER_WINDOW_S: float = 30.0
+    LYRICS_BREAKER_MIN_CALLS: int = 5
+    LYRICS_BREAKER_FAILURE_RATIO: float = 0.5
+    LYRICS_BREAKER_OPEN_S: float = 30.0
+    # Total seconds of LRCLIB waiting allowed per request: one /import/multi batch (all
+    # its JCRD files together) and one /combine/jcrd-lyrics call
+    LYRICS_IMPORT_BUDGET_S: float = 6.0
+    LYRICS_COMBINE_BUDGET_S: float = 4.0
+    # Max songs kept in the songs_v1 analysis/timeline LRU (0 disables it)
+    ANALYSIS_CACHE_SIZE: int = 256
+    # Worker processes for POST /v1/songs/timelines (0 runs analyses on threads instead)
+    TIMELINE_WORKERS: int = 4
+    # Max ids accepted by one batch timeline request
+    TIMELINE_BATCH_MAX: int = 500
+    # Files processed at once by POST /import/multi
+    IMPORT_CONCURRENCY: int = 8
+    # Worker processes for import parsing (0 runs it on threads instead)
+    IMPORT_WORKERS: int = 2
+    # Songs per transaction (one multi-row INSERT each) for /import/multi?persist=true
+    IMPORT_PERSIST_CHUNK: int = 100
+    # Upload limits for the import endpoints (bytes); uploads above UPLOAD_SPOOL_BYTES go to disk
+    UPLOAD_MAX_FILE_BYTES: int = 50 * 1024 * 1024
+    UPLOAD_MAX_REQUEST_BYTES: int = 200 * 1024 * 1024
+    UPLOAD_SPOOL_BYTES: int = 1024 * 1024
 
 
 settings = Settings()
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 import json
 import os
-from typing import List, Dict, Tuple, Any
+from typing import IO, List, Dict, Tuple, Any, Union
 
 try:
     from .utils.tempo import convert_jcrd as _convert_jcrd
@@ -11,6 +11,8 @@ except Exception:  # pragma: no cover - fallback for import contexts
     _convert_jcrd = None  # type: ignore
     _chords_only = None  # type: ignore
 
+from .utils.chords import normalize_symbol
+
 
 def _decode_bytes(data: bytes) -> str:
     try:
@@ -104,7 +106,8 @@ def _normalize_song_obj(o: dict, warnings: List[str]) -> List[Dict[str, str]]:
                 if sym is None or sb is None:
                     continue
                 try:
-                    rows.append((str(sym), float(sb)))
+                    # Canonical spelling (Harte C:min7 -> Cm7) so analysis reads it as a chord line
+                    rows.append((normalize_symbol(str(sym)) or str(sym), float(sb)))
                 except Exception:
                     continue
             rows.sort(key=lambda x: x[1])
@@ -141,15 +144,21 @@ def _normalize_song_obj(o: dict, warnings: List[str]) -> List[Dict[str, str]]:
     return out
 
 
-def import_midi_file(filename: str, data: bytes) -> Tuple[List[Dict[str, str]], List[str]]:
+def _binary(data: Union[bytes, IO[bytes]]) -> IO[bytes]:
+    # Parsers take an upload's spooled file directly; bytes are wrapped for older callers
+    if isinstance(data, (bytes, bytearray)):
+        from io import BytesIO
+        return BytesIO(data)
+    return data
+
+
+def import_midi_file(filename: str, data: Union[bytes, IO[bytes]]) -> Tuple[List[Dict[str, str]], List[str]]:
     warnings: List[str] = []
     songs: List[Dict[str, str]] = []
     try:
         import mido  # type: ignore
-        from io import BytesIO
 
-        f = BytesIO(data)
-        mid = mido.MidiFile(file=f)
+        mid = mido.MidiFile(file=_binary(data))
         title = os.path.splitext(os.path.basename(filename))[0]
         track_names = []
         markers = []
@@ -178,14 +187,13 @@ def import_midi_file(filename: str, data: bytes) -> Tuple[List[Dict[str, str]],
     return songs, warnings
 
 
-def import_mp3_file(filename: str, data: bytes) -> Tuple[List[Dict[str, str]], List[str]]:
+def import_mp3_file(filename: str, data: Union[bytes, IO[bytes]]) -> Tuple[List[Dict[str, str]], List[str]]:
     warnings: List[str] = []
     songs: List[Dict[str, str]] = []
     try:
-        from io import BytesIO
         from mutagen import File as MutagenFile  # type: ignore
-        bio = BytesIO(data)
-        mf = MutagenFile(bio, easy=True)
+        # mutagen seeks to the tags; the audio itself is never read into memory
+        mf = MutagenFile(_binary(data), easy=True)
         title = ""
         artist = ""
         if mf is not None:
@@ -1,9 +1,14 @@
 from __future__ import annotations
 import csv
+import io
+import itertools
 import re
 from dataclasses import dataclass
 import json
-from typing import Iterable, List, Optional, Tuple
+from typing import IO, Iterable, Iterator, List, Optional, Tuple, Union
+
+# Text or an iterable of lines (e.g. a text file), read one line at a time
+Lines = Union[str, Iterable[str]]
 
 
 @dataclass
@@ -20,9 +25,18 @@ def _to_seconds(mins: int, secs: int, ms: int = 0) -> float:
     return mins * 60 + secs + ms / 1000.0
 
 
-def _parse_lrc(text: str) -> List[LineOut]:
+def _iter_lines(text: Lines) -> Iterator[str]:
+    # Same line breaks as str.splitlines() whether given one string or file lines
+    if isinstance(text, str):
+        yield from text.splitlines()
+        return
+    for chunk in text:
+        yield from chunk.splitlines()
+
+
+def _parse_lrc(text: Lines) -> List[LineOut]:
     lines: List[LineOut] = []
-    for raw in text.splitlines():
+    for raw in _iter_lines(text):
         matches = list(ts_lrc_re.finditer(raw))
         if not matches:
             # no timestamp; treat as untimed line
@@ -41,11 +55,11 @@ def _parse_lrc(text: str) -> List[LineOut]:
     return lines
 
 
-def _parse_vtt(text: str) -> List[LineOut]:
+def _parse_vtt(text: Lines) -> List[LineOut]:
     lines: List[LineOut] = []
     cur_ts: Optional[float] = None
     started = False  # flip to True after the first timing cue
-    for raw in text.splitlines():
+    for raw in _iter_lines(text):
         s = raw.strip()
         m = ts_vtt_re.match(s)
         if m:
@@ -61,18 +75,18 @@ def _parse_vtt(text: str) -> List[LineOut]:
     return lines
 
 
-def _parse_txt(text: str) -> List[LineOut]:
+def _parse_txt(text: Lines) -> List[LineOut]:
     out: List[LineOut] = []
-    for raw in text.splitlines():
+    for raw in _iter_lines(text):
         clean = raw.strip()
         if clean:
             out.append(LineOut(text=clean))
     return out
 
 
-def _parse_csv(text: str) -> List[LineOut]:
+def _parse_csv(text: Lines) -> List[LineOut]:
     out: List[LineOut] = []
-    reader = csv.reader(text.splitlines())
+    reader = csv.reader(_iter_lines(text))
     for row in reader:
         if not row:
             continue
@@ -205,3 +219,29 @@ def parse_lyrics_payload(text: str, filename: Optional[str] = None) -> List[Line
         return _parse_json(text)
     # default plain text
     return _parse_txt(text)
+
+
+def parse_lyrics_file(fp: IO[bytes], filename: Optional[str] = None, *, errors: str = "replace") -> List[LineOut]:
+    """parse_lyrics_payload over a binary file, reading it line by line (JSON is read whole)."""
+    text = io.TextIOWrapper(fp, encoding="utf-8", errors=errors, newline="")
+    try:
+        # Enough of the head to sniff the format the way parse_lyrics_payload does
+        head = text.readline()
+        while head.strip() == "" or len(head) < 20:
+            more = text.readline()
+            if not more:
+                break
+            head += more
+        lines = itertools.chain([head], text)
+        name = (filename or "").lower()
+        if name.endswith(".lrc"):
+            return _parse_lrc(lines)
+        if name.endswith(".vtt") or "WEBVTT" in head[:20].upper():
+            return _parse_vtt(lines)
+        if name.endswith(".csv"):
+            return _parse_csv(lines)
+        if name.endswith(".json") or head.strip().startswith("{"):
+            return _parse_json(head + text.read())
+        return _parse_txt(lines)
+    finally:
+        text.detach()
@@ -1,7 +1,10 @@
 from fastapi import APIRouter, Body, Request
-from .ingest.lyrics import parse_lyrics_payload
+from starlette.concurrency import run_in_threadpool
 
-router = APIRouter()
+from ..utils.uploads import LimitedUploadRoute, spool_body
+from .ingest.lyrics import parse_lyrics_file
+
+router = APIRouter(route_class=LimitedUploadRoute)
 
 
 @router.get("/ping")
@@ -11,15 +14,12 @@ def ping():
 
 @router.post("/lyrics/parse")
 async def parse_lyrics(request: Request, filename: str | None = None):
-    # Support both text/plain and application/json bodies
-    ctype = request.headers.get("content-type", "")
-    if "application/json" in ctype:
-        payload = await request.body()
-        raw = payload.decode("utf-8", errors="ignore")
-    else:
-        raw = await request.body()
-        raw = raw.decode("utf-8", errors="ignore")
-    lines = parse_lyrics_payload(raw, filename)
+    # Support both text/plain and application/json bodies; the body is spooled, not buffered
+    body = await spool_body(request)
+    try:
+        lines = await run_in_threadpool(parse_lyrics_file, body, filename, errors="ignore")
+    finally:
+        body.close()
     # Force SongDoc-like shape for UI: {lines:[{ts?,text}]}
     return {
         "lines": [{"text": l.text, **({"ts": l.ts} if l.ts is not None else {})} for l in lines],
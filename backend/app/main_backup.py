@@ -57,6 +57,10 @@ def import_json(data: dict):
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
+import io
+
+from starlette.concurrency import run_in_threadpool
+
 from .legacy.router import router as legacy_router
 from .routers import import_json as import_json_router
 from .routers import import_lyrics as import_lyrics_router
@@ -68,7 +72,16 @@ from .routers import combine as combine_router
 from .routers import songs_v1 as songs_v1_router
 from .routers import recordings as recordings_router
 from .routers import drafts as drafts_router
+from .routers import parse as parse_router
 from .importers import import_json_file, import_midi_file, import_mp3_file
+from .parser import iter_songs
+from .services import import_pool, timeline_batch
+from .services.analysis_cache import analysis_cache
+from .services.lyrics_providers import local as local_lyrics, lrclib
+from .services.materialize import materialize_song, drop_materialized
+from .services.song_hashes import digest_owner
+from .utils.content_hash import content_sha256
+from sqlalchemy.exc import IntegrityError
 
 app = FastAPI(title="DAWSheet API")
 
@@ -92,6 +105,7 @@ app.include_router(combine_router.router)
 app.include_router(songs_v1_router.router)
 app.include_router(recordings_router.router)
 app.include_router(drafts_router.router)
+app.include_router(parse_router.router)
 
 @app.on_event("startup")
 async def on_startup():
@@ -121,34 +135,44 @@ async def on_startup():
             session.add(default_user)
             await session.commit()
 
+    # Index the offline lyrics corpus now rather than on the first import
+    await run_in_threadpool(local_lyrics.get_index)
+
+@app.on_event("shutdown")
+async def on_shutdown():
+    # Release shared resources: pooled lyric-provider connections and worker pools
+    await lrclib.aclose()
+    import_pool.shutdown()
+    timeline_batch.shutdown()
+
 @app.get("/")
 async def health():
     return {"ok": True}
 
-@app.post("/parse", response_model=schemas.ParseResponse)
-async def parse_text(raw: str = Body(..., media_type="text/plain")):
-    # First, attempt local robust parser to support many common formats quickly
-    local = parse_songs(raw)
-    if local and len(local) > 0:
-        return {"songs": local, "warnings": None}
-    # Fallback to remote parser if local cannot parse
-    async with httpx.AsyncClient(timeout=30) as client:
-        r = await client.post(settings.CLOUD_RUN_PARSE_URL, content=raw)
-        if r.status_code != 200:
-            raise HTTPException(status_code=502, detail=f"Parser error {r.status_code}: {r.text}")
-        return r.json()
-
 @app.get("/songs", response_model=list[schemas.SongOut])
 async def list_songs(session: AsyncSession = Depends(get_session)):
     result = await session.execute(select(models.Song))
     rows = result.scalars().all()
     return [schemas.SongOut(id=row.id, title=row.title, artist=row.artist, content=row.content) for row in rows]
 
+async def _save_song(session: AsyncSession, song, digest: str | None) -> None:
+    """Materialize and commit `song`; 409 when another song already has its content digest."""
+    try:
+        await materialize_song(session, song)
+        await session.commit()
+    except IntegrityError as exc:
+        owner = await digest_owner(session, exc, digest)
+        if owner is None:
+            raise
+        raise HTTPException(status_code=409, detail={"message": "A song with this content already exists", "song_id": owner})
+
 @app.post("/songs", response_model=schemas.SongOut)
 async def create_song(payload: schemas.SongIn, session: AsyncSession = Depends(get_session)):
     song = models.Song(user_id=1, title=payload.title, artist=payload.artist or "", content=payload.content)
+    if payload.content_sha256:
+        song.content_sha256 = payload.content_sha256
     session.add(song)
-    await session.commit()
+    await _save_song(session, song, payload.content_sha256 or content_sha256(payload.content))
     await session.refresh(song)
     return schemas.SongOut(id=song.id, title=song.title, artist=song.artist, content=song.content)
 
@@ -176,14 +200,19 @@ async def attach_lyrics(song_id: int, payload: dict = Body(...), session: AsyncS
         song.content = block
     else:
         song.content = (song.content or "").rstrip() + ("\n\n" if song.content else "") + block
-    await session.commit()
+    await _save_song(session, song, content_sha256(song.content))
+    analysis_cache.invalidate(song_id)
     await session.refresh(song)
     return schemas.SongOut(id=song.id, title=song.title, artist=song.artist, content=song.content)
 
 @app.post("/import", response_model=schemas.ParseResponse)
 async def import_file(file: UploadFile = File(...)):
-    raw = (await file.read()).decode("utf-8", errors="replace")
-    songs = parse_songs(raw)
+    # Read the upload line by line instead of decoding it whole
+    text = io.TextIOWrapper(file.file, encoding="utf-8", errors="replace", newline=None)
+    try:
+        songs = list(iter_songs(text))
+    finally:
+        text.detach()
     return {"songs": songs, "warnings": None}
 
 @app.post("/import/files", response_model=schemas.ParseResponse)
@@ -251,7 +280,8 @@ async def update_song(song_id: int, payload: schemas.SongUpdate, session: AsyncS
         song.artist = payload.artist
     if payload.content is not None:
         song.content = payload.content
-    await session.commit()
+    await _save_song(session, song, content_sha256(song.content))
+    analysis_cache.invalidate(song_id)
     await session.refresh(song)
     return schemas.SongOut(id=song.id, title=song.title, artist=song.artist, content=song.content)
 
@@ -261,6 +291,8 @@ async def delete_song(song_id: int, session: AsyncSession = Depends(get_session)
     song = result.scalar_one_or_none()
     if not song:
         raise HTTPException(status_code=404, detail="Song not found")
+    await drop_materialized(session, song_id)
     await session.delete(song)
     await session.commit()
+    analysis_cache.invalidate(song_id)
     return None
@@ -1,17 +1,11 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Sequence, Tuple
 from math import isfinite
 
-from ..schemas_timeline import (
-    SongTimeline,
-    TimelineWarning,
-    TempoMark,
-    TimeSigMark,
-    Section as SectionModel,
-    ChordEvent as ChordEventModel,
-    LyricEvent as LyricEventModel,
-)
+from ..schemas_timeline import SongTimeline, TimelineWarning
+from ..utils.tempo_map import TempoMap
+from .timeline_frame import TimelineFrame
 
 DEFAULT_BPM = 120.0
 DEFAULT_SIG = (4, 4)
@@ -52,12 +46,49 @@ def _normalize_section_kind(name: str | None) -> str:
     return name
 
 
-def _guess_sections(chords: List[ChordEventModel], lyrics: List[LyricEventModel]) -> List[SectionModel]:
-    if not chords:
+def _guess_sections(first_chord_sec: float | None) -> List[Dict[str, Any]]:
+    if first_chord_sec is None:
         return []
     # naive: single section
-    first = chords[0]
-    return [SectionModel(kind="Verse", startSec=first.atSec, inferred=True)]
+    return [{"kind": "Verse", "startSec": first_chord_sec, "endSec": None, "name": None, "inferred": True}]
+
+
+def _pair_hover(chord_beats: Sequence[float], lyric_beats: Sequence[float], max_dist: float = 1.0) -> List[int]:
+    """Index of the nearest lyric within max_dist beats for every chord (-1 if none), O(C + L).
+
+    Both sequences must be sorted. Ties go to the earlier lyric in sorted order (the
+    first one a front-to-back scan would reach).
+    """
+    out = [-1] * len(chord_beats)
+    n = len(lyric_beats)
+    if not n:
+        return out
+    beats = lyric_beats
+    # first_of[i]: first index holding the same beat as i (earliest of a tie group)
+    first_of = list(range(n))
+    for i in range(1, n):
+        if beats[i] == beats[i - 1]:
+            first_of[i] = first_of[i - 1]
+    j = 0  # first lyric with beat >= chord beat; only moves forward
+    for ci, at in enumerate(chord_beats):
+        while j < n and beats[j] < at:
+            j += 1
+        best = -1
+        best_dist = 1e9
+        if j > 0:
+            k = first_of[j - 1]
+            best_dist = abs(beats[k] - at)
+            # Distinct beats can round to the same distance; the earlier one wins
+            while k > 0 and abs(beats[k - 1] - at) == best_dist:
+                k = first_of[k - 1]
+            best = k
+        if j < n:
+            d = abs(beats[j] - at)
+            if d < best_dist:
+                best, best_dist = j, d
+        if best >= 0 and best_dist <= max_dist:
+            out[ci] = best
+    return out
 
 
 def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTimeline, List[TimelineWarning], List[TimelineWarning]]:
@@ -66,7 +97,14 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
     Returns (timeline, warnings, validation_warnings)
     warnings: non-fatal heuristics
     validation_warnings: structural issues (missing bpm, etc.)
+    Internal callers should prefer to_frame() and materialize only at the API boundary.
     """
+    frame, warnings, validation = to_frame(raw_doc, snap=snap)
+    return frame.to_model(), warnings, validation
+
+
+def to_frame(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[TimelineFrame, List[TimelineWarning], List[TimelineWarning]]:
+    """Map an analyzed doc to a columnar TimelineFrame (same values to_timeline returns)."""
     warnings: List[TimelineWarning] = []
     validation: List[TimelineWarning] = []
 
@@ -100,12 +138,28 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
         num, den = DEFAULT_SIG
         validation.append(TimelineWarning(code="timesig.invalid", message="Invalid time signature, defaulted to 4/4"))
 
-    tempo_map = [TempoMark(atSec=0.0, bpm=bpm)]
-    time_sig_map = [TimeSigMark(atSec=0.0, num=num, den=den)]
+    # Multi-mark docs (tempoMap/timeSigMap) convert through the piecewise map; a single
+    # mark keeps the plain bpm arithmetic
+    tm = TempoMap.from_doc(raw_doc, bpm=bpm, time_sig=(num, den), quarter_beats=False)
+    tempo_map = [{"atSec": 0.0, "bpm": bpm}]
+    time_sig_map = [{"atSec": 0.0, "num": num, "den": den}]
+    if tm.is_constant:
+        def to_beats(sec: float) -> float:
+            return _sec_to_beats(sec, bpm)
+
+        def to_sec(beats: float) -> float:
+            return _beats_to_sec(beats, bpm)
+
+        def span(start_sec: float, dur_sec: float) -> float:
+            return _sec_to_beats(dur_sec, bpm)
+    else:
+        to_beats, to_sec, span = tm.sec_to_beats, tm.beats_to_sec, tm.span_beats
+        tempo_map = [{"atSec": float(r["atSec"]), "bpm": float(r["bpm"])} for r in tm.tempo_rows()]
+        time_sig_map = [{"atSec": float(r["atSec"]), "num": int(r["num"]), "den": int(r["den"])} for r in tm.meter_rows()]
 
     # Sections (analyzed doc provides sections with startBeat/lengthBeats OR startBeat only OR startSec)
     sections_in = raw_doc.get("sections") or []
-    sections: List[SectionModel] = []
+    sections: List[Dict[str, Any]] = []
     # Collect chords that may be nested inside section definitions (JCRD style)
     nested_section_chords: List[Dict[str, Any]] = []
     for s in sections_in:
@@ -113,7 +167,7 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
         start_beat = s.get("startBeat")
         start_sec = s.get("startSec")
         if start_beat is not None:
-            start_sec = _beats_to_sec(float(start_beat), bpm)
+            start_sec = to_sec(float(start_beat))
         if start_sec is None and s.get("start_time") is not None:
             start_sec = float(s.get("start_time"))
         end_sec = None
@@ -124,17 +178,16 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
         else:
             lb = s.get("lengthBeats")
             if lb is not None and start_beat is not None:
-                end_sec = _beats_to_sec(float(start_beat) + float(lb), bpm)
+                end_sec = to_sec(float(start_beat) + float(lb))
         orig_name = s.get("name")
         norm_kind = _normalize_section_kind(orig_name)
-        sections.append(
-            SectionModel(
-                kind=norm_kind,
-                startSec=float(start_sec or 0.0),
-                endSec=end_sec,
-                name=orig_name or norm_kind,
-            )
-        )
+        sections.append({
+            "kind": norm_kind,
+            "startSec": float(start_sec or 0.0),
+            "endSec": end_sec,
+            "name": orig_name or norm_kind,
+            "inferred": False,
+        })
         # Extract nested chords
         if isinstance(s.get("chords"), list):
             for c in s.get("chords"):
@@ -161,7 +214,11 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
     # Also merge nested section chords if we didn't already collect them (avoid duplicates)
     if nested_section_chords and chord_rows is not nested_section_chords:
         chord_rows.extend(nested_section_chords)
-    chords: List[ChordEventModel] = []
+    # Chord columns (unsorted until the index sort below)
+    c_sym: List[str] = []
+    c_beat: List[float] = []
+    c_sec: List[float] = []
+    c_dur: List[float | None] = []
     for c in chord_rows:
         if not c:
             continue
@@ -172,18 +229,17 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
             at_beat_raw = float(c.get("startBeat") or 0.0)
         else:
             # Support multiple second-based start fields: start_sec, start_time (JCRD), time, startTime
-            at_beat_raw = _sec_to_beats(
+            at_beat_raw = to_beats(
                 float(
                     c.get("start_sec")
                     or c.get("start_time")
                     or c.get("time")
                     or c.get("startTime")
                     or 0.0
-                ),
-                bpm,
+                )
             )
         at_beat = _quantize(at_beat_raw, snap)
-        at_sec = _beats_to_sec(at_beat, bpm)
+        at_sec = to_sec(at_beat)
         dur_beats = None
         if c.get("lengthBeats") is not None:
             dur_beats = float(c.get("lengthBeats"))
@@ -196,28 +252,37 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
             ):
                 st_sec = float(c.get("start_time") or c.get("time"))
                 et_sec = float(c.get("end_time"))
-                dur_beats = _sec_to_beats(max(0.0, et_sec - st_sec), bpm)
+                dur_beats = span(st_sec, max(0.0, et_sec - st_sec))
             elif c.get("duration") is not None:
                 # chord_progression structure
-                dur_beats = _sec_to_beats(float(c.get("duration")), bpm)
+                dur_beats = span(float(c.get("time") or c.get("start_time") or 0.0), float(c.get("duration")))
             elif c.get("duration_sec") is not None:
-                dur_beats = _sec_to_beats(float(c.get("duration_sec")), bpm)
-        chords.append(ChordEventModel(symbol=symbol, atSec=at_sec, atBeat=at_beat, durationBeats=dur_beats))
+                dur_beats = span(float(c.get("start_sec") or 0.0), float(c.get("duration_sec")))
+        c_sym.append(symbol)
+        c_beat.append(float(at_beat))
+        c_sec.append(float(at_sec))
+        c_dur.append(dur_beats)
 
-    chords.sort(key=lambda ch: ch.atBeat)
+    # Stable sort by beat, applied to every column
+    order = sorted(range(len(c_beat)), key=c_beat.__getitem__)
+    c_sym = [c_sym[i] for i in order]
+    c_beat = [c_beat[i] for i in order]
+    c_sec = [c_sec[i] for i in order]
+    c_dur = [c_dur[i] for i in order]
+    c_explicit = [d is not None for d in c_dur]
     # Infer missing durations from next chord or section boundaries
-    for i, ch in enumerate(chords):
-        if ch.durationBeats is not None:
+    n_chords = len(c_beat)
+    for i in range(n_chords):
+        if c_dur[i] is not None:
             continue
-        next_ch = chords[i + 1] if i + 1 < len(chords) else None
-        if next_ch:
-            ch.durationBeats = max(0.25, next_ch.atBeat - ch.atBeat)
+        if i + 1 < n_chords:
+            c_dur[i] = max(0.25, c_beat[i + 1] - c_beat[i])
         else:
             # Use section end if inside a section
             for sec in sections:
-                if ch.atSec >= sec.startSec and (sec.endSec is not None) and ch.atSec < sec.endSec:
-                    sec_end_beat = _sec_to_beats(sec.endSec, bpm)
-                    ch.durationBeats = max(0.25, sec_end_beat - ch.atBeat)
+                if c_sec[i] >= sec["startSec"] and (sec["endSec"] is not None) and c_sec[i] < sec["endSec"]:
+                    sec_end_beat = to_beats(sec["endSec"])
+                    c_dur[i] = max(0.25, sec_end_beat - c_beat[i])
                     break
 
     # Lyrics
@@ -235,7 +300,10 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
             for l in lyric_rows
             if l is not None
         ]
-    lyrics: List[LyricEventModel] = []
+    l_id: List[str] = []
+    l_text: List[str] = []
+    l_beat: List[float] = []
+    l_sec: List[float] = []
     for idx, l in enumerate(lyric_rows):
         if not isinstance(l, dict):
             continue
@@ -245,36 +313,24 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
         if "beat" in l and l.get("beat") is not None:
             at_beat_raw = float(l.get("beat") or 0.0)
         else:
-            at_beat_raw = _sec_to_beats(float(l.get("timeSec") or l.get("ts_sec") or 0.0), bpm)
+            at_beat_raw = to_beats(float(l.get("timeSec") or l.get("ts_sec") or 0.0))
         at_beat = _quantize(at_beat_raw, snap)
-        at_sec = _beats_to_sec(at_beat, bpm)
+        at_sec = to_sec(at_beat)
         lyr_id = l.get("id") or ("b" + str(at_beat))
-        lyrics.append(LyricEventModel(id=str(lyr_id), atSec=at_sec, atBeat=at_beat, text=text))
+        l_id.append(str(lyr_id))
+        l_text.append(text)
+        l_beat.append(float(at_beat))
+        l_sec.append(float(at_sec))
 
     if not sections:
-        sections = _guess_sections(chords, lyrics)
+        sections = _guess_sections(c_sec[0] if c_sec else None)
         if sections:
             warnings.append(TimelineWarning(code="sections.inferred", message="Sections inferred heuristically"))
 
-    # Hover pairing: chord -> nearest lyric within 1 beat
-    lyric_sorted = sorted(lyrics, key=lambda l: l.atBeat)
-    for ch in chords:
-        best = None
-        best_dist = 1e9
-        for ly in lyric_sorted:
-            d = abs(ly.atBeat - ch.atBeat)
-            if d < best_dist:
-                best_dist = d
-                best = ly
-            if ly.atBeat > ch.atBeat + 1:
-                break
-        if best and best_dist <= 1:
-            ch.lyricId = best.id
-
     # Structural validation
-    if not chords:
+    if not c_beat:
         validation.append(TimelineWarning(code="chords.empty", message="No chords present"))
-    if not lyrics:
+    if not l_beat:
         validation.append(TimelineWarning(code="lyrics.empty", message="No lyrics present"))
     if bpm <= 0:
         validation.append(TimelineWarning(code="bpm.missing", message="Missing BPM"))
@@ -293,18 +349,25 @@ def to_timeline(raw_doc: Dict[str, Any], *, snap: float = 0.25) -> Tuple[SongTim
                 key_val = tok.replace("Key", "").strip()
                 break
 
-    timeline = SongTimeline(
+    frame = TimelineFrame(
         id=str(raw_doc.get("id") or raw_doc.get("songId") or "unknown"),
         title=raw_doc.get("title"),
         artist=raw_doc.get("artist"),
-        bpmDefault=bpm,
-        timeSigDefault={"num": num, "den": den},
-        tempoMap=tempo_map,
-        timeSigMap=time_sig_map,
+        bpm=bpm,
+        num=num,
+        den=den,
+        tempo_map=tempo_map,
+        time_sig_map=time_sig_map,
         sections=sections,
-        chords=chords,
-        lyrics=lyrics,
         key=key_val,
         mode=mode_val,
     )
-    return timeline, warnings, validation
+    frame.set_chords(c_sym, c_beat, c_sec, c_dur, c_explicit)
+    frame.set_lyrics(l_id, l_text, l_beat, l_sec)
+
+    # Hover pairing: chord -> nearest lyric within 1 beat (indices map back to input order)
+    l_order = sorted(range(len(l_beat)), key=l_beat.__getitem__)
+    for ci, k in enumerate(_pair_hover(c_beat, [l_beat[i] for i in l_order])):
+        if k >= 0:
+            frame.chord_lyric[ci] = l_order[k]
+    return frame, warnings, validation
@@ -0,0 +1,270 @@
+"""Incremental edits on a TimelineFrame (insert / move / delete of chords, lyrics, sections).
+
+Each operation patches the frame in place and recomputes only what the edit can change:
+the inferred durationBeats of the neighbouring chord, the section-end fallback of the
+last chord, the guessed section, and hover lyricId pairings of chords within one beat
+of a changed lyric. After any sequence of edits the frame equals to_frame() over the
+doc with the same edit applied, where inserts append to the doc's chords/lyrics/sections
+lists and a move is a delete followed by an insert (so a moved event goes last among
+events on the same beat, and a moved lyric goes last in lyric order).
+"""
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+from .timeline import _guess_sections, _normalize_section_kind, _quantize
+from .timeline_frame import TimelineFrame
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy is optional; index shifts fall back to a loop
+    np = None  # type: ignore
+
+# Hover pairing radius in beats (matches _pair_hover's default)
+HOVER_BEATS = 1.0
+_NAN = float("nan")
+
+
+def _require_provenance(frame: TimelineFrame) -> None:
+    if frame.chord_explicit is None or len(frame.chord_explicit) != frame.n_chords:
+        raise ValueError("frame has no duration provenance (decoded from storage?); remap it with to_frame() first")
+
+
+def _shift_down(values: array, above: int) -> None:
+    """Decrement, in place, every entry greater than `above` (lyric indices after a delete)."""
+    if np is not None and values.itemsize == 4 and len(values) > 64:
+        view = np.frombuffer(values, dtype=np.int32)
+        view[view > above] -= 1
+        return
+    for i, v in enumerate(values):
+        if v > above:
+            values[i] = v - 1
+
+
+# -- chord durations / sections --------------------------------------------------------------
+
+def _infer_duration(frame: TimelineFrame, i: int) -> float:
+    """durationBeats the mapper would infer for chord i (NaN when it has none)."""
+    n = frame.n_chords
+    if i + 1 < n:
+        return max(0.25, frame.chord_beat[i + 1] - frame.chord_beat[i])
+    at_sec = frame.chord_sec[i]
+    for sec in frame.sections:
+        if sec.get("inferred"):
+            continue
+        if at_sec >= sec["startSec"] and (sec["endSec"] is not None) and at_sec < sec["endSec"]:
+            return max(0.25, frame.sec_to_beats(sec["endSec"]) - frame.chord_beat[i])
+    return _NAN
+
+
+def _refresh_duration(frame: TimelineFrame, i: int) -> None:
+    if 0 <= i < frame.n_chords and not frame.chord_explicit[i]:
+        frame.chord_dur[i] = _infer_duration(frame, i)
+        _note_duration(frame, frame.chord_dur[i])
+
+
+def _note_duration(frame: TimelineFrame, dur: float) -> None:
+    # The window index only needs an upper bound on chord length
+    if frame._index is not None and not math.isnan(dur) and dur > frame._index.max_dur:
+        frame._index.max_dur = dur
+
+
+def _refresh_sections(frame: TimelineFrame) -> None:
+    provided = [s for s in frame.sections if not s.get("inferred")]
+    frame.sections = provided or _guess_sections(frame.chord_sec[0] if frame.n_chords else None)
+
+
+# -- hover pairing ---------------------------------------------------------------------------
+
+def _nearest_lyric(beats: List[float], at: float) -> int:
+    """Sorted position of the lyric _pair_hover would pick for a chord at `at`, or -1."""
+    n = len(beats)
+    j = bisect_left(beats, at)
+    best = -1
+    best_dist = 1e9
+    if j > 0:
+        k = bisect_left(beats, beats[j - 1], 0, j)  # earliest of the tie group
+        best_dist = abs(beats[k] - at)
+        while k > 0 and abs(beats[k - 1] - at) == best_dist:
+            k = bisect_left(beats, beats[k - 1], 0, k)
+        best = k
+    if j < n:
+        d = abs(beats[j] - at)
+        if d < best_dist:
+            best, best_dist = j, d
+    return best if best >= 0 and best_dist <= HOVER_BEATS else -1
+
+
+def _repair(frame: TimelineFrame, lo_beat: float, hi_beat: float) -> None:
+    """Recompute lyricId for chords whose beat lies in [lo_beat, hi_beat]."""
+    idx = frame._window_index()
+    a = bisect_left(frame.chord_beat, lo_beat)
+    b = bisect_right(frame.chord_beat, hi_beat)
+    for i in range(a, b):
+        k = _nearest_lyric(idx.lyric_beats, frame.chord_beat[i])
+        frame.chord_lyric[i] = idx.lyric_order[k] if k >= 0 else -1
+
+
+def _lyric_window(beat: float) -> tuple:
+    # Slightly wider than the pairing radius so float rounding at the edge is covered
+    return beat - HOVER_BEATS - 1e-9, beat + HOVER_BEATS + 1e-9
+
+
+# -- chords ----------------------------------------------------------------------------------
+
+def insert_chord(
+    frame: TimelineFrame,
+    symbol: str,
+    at_beat: float,
+    duration_beats: Optional[float] = None,
+    *,
+    snap: float = 0.25,
+) -> int:
+    """Insert a chord (doc equivalent: append {symbol, startBeat, lengthBeats}); returns its row."""
+    _require_provenance(frame)
+    if not symbol:
+        raise ValueError("chord symbol must not be empty")
+    idx = frame._window_index()  # build before patching so it tracks the edit
+    beat = float(_quantize(float(at_beat or 0.0), snap))
+    i = bisect_right(frame.chord_beat, beat)
+    try:
+        sym = frame.symbols.index(symbol)
+    except ValueError:
+        sym = len(frame.symbols)
+        frame.symbols.append(symbol)
+    frame.chord_sym.insert(i, sym)
+    frame.chord_beat.insert(i, beat)
+    frame.chord_sec.insert(i, float(frame.beats_to_sec(beat)))
+    frame.chord_dur.insert(i, _NAN if duration_beats is None else float(duration_beats))
+    frame.chord_explicit.insert(i, 0 if duration_beats is None else 1)
+    frame.chord_lyric.insert(i, -1)
+    _note_duration(frame, frame.chord_dur[i])
+    _refresh_duration(frame, i)
+    _refresh_duration(frame, i - 1)
+    if i == 0:
+        _refresh_sections(frame)
+    k = _nearest_lyric(idx.lyric_beats, beat)
+    frame.chord_lyric[i] = idx.lyric_order[k] if k >= 0 else -1
+    return i
+
+
+def delete_chord(frame: TimelineFrame, i: int) -> Dict[str, Any]:
+    """Delete chord row i; returns its doc-shaped fields (symbol, startBeat, lengthBeats)."""
+    _require_provenance(frame)
+    removed = {
+        "symbol": frame.chord_symbol(i),
+        "startBeat": frame.chord_beat[i],
+        "lengthBeats": frame.chord_dur[i] if frame.chord_explicit[i] else None,
+    }
+    for col in (frame.chord_sym, frame.chord_beat, frame.chord_sec, frame.chord_dur, frame.chord_explicit, frame.chord_lyric):
+        del col[i]
+    _refresh_duration(frame, i - 1)
+    if i == 0:
+        _refresh_sections(frame)
+    return removed
+
+
+def move_chord(frame: TimelineFrame, i: int, at_beat: float, *, snap: float = 0.25) -> int:
+    """Move chord row i to at_beat (delete + insert); returns its new row."""
+    removed = delete_chord(frame, i)
+    return insert_chord(frame, removed["symbol"], at_beat, removed["lengthBeats"], snap=snap)
+
+
+# -- lyrics ----------------------------------------------------------------------------------
+
+def insert_lyric(
+    frame: TimelineFrame,
+    text: str,
+    at_beat: float,
+    lyric_id: Optional[str] = None,
+    *,
+    snap: float = 0.25,
+) -> int:
+    """Append a lyric (doc equivalent: append {text, beat, id}); returns its lyric index."""
+    if not text:
+        raise ValueError("lyric text must not be empty")
+    idx = frame._window_index()
+    beat = float(_quantize(float(at_beat or 0.0), snap))
+    j = frame.n_lyrics
+    frame.lyric_id.append(str(lyric_id or ("b" + str(beat))))
+    frame.lyric_text.append(text)
+    frame.lyric_beat.append(beat)
+    frame.lyric_sec.append(float(frame.beats_to_sec(beat)))
+    # Highest input index, so it sorts after every lyric on the same beat
+    pos = bisect_right(idx.lyric_beats, beat)
+    idx.lyric_beats.insert(pos, beat)
+    idx.lyric_order.insert(pos, j)
+    _repair(frame, *_lyric_window(beat))
+    return j
+
+
+def delete_lyric(frame: TimelineFrame, j: int) -> Dict[str, Any]:
+    """Delete lyric index j; returns its doc-shaped fields (text, beat, id)."""
+    idx = frame._window_index()
+    beat = frame.lyric_beat[j]
+    removed = {"text": frame.lyric_text[j], "beat": beat, "id": frame.lyric_id[j]}
+    pos = bisect_left(idx.lyric_beats, beat)
+    while idx.lyric_order[pos] != j:
+        pos += 1
+    del idx.lyric_beats[pos]
+    del idx.lyric_order[pos]
+    _shift_down(idx.lyric_order, j)
+    del frame.lyric_id[j]
+    del frame.lyric_text[j]
+    del frame.lyric_beat[j]
+    del frame.lyric_sec[j]
+    # Chords paired to j re-pair below; later indices move down one
+    _shift_down(frame.chord_lyric, j)
+    _repair(frame, *_lyric_window(beat))
+    return removed
+
+
+def move_lyric(frame: TimelineFrame, j: int, at_beat: float, *, snap: float = 0.25) -> int:
+    """Move lyric j to at_beat (delete + append, keeping text and id); returns its new index."""
+    removed = delete_lyric(frame, j)
+    return insert_lyric(frame, removed["text"], at_beat, removed["id"], snap=snap)
+
+
+# -- sections --------------------------------------------------------------------------------
+
+def insert_section(frame: TimelineFrame, name: Optional[str], start_beat: float, length_beats: Optional[float] = None) -> int:
+    """Append a section (doc equivalent: {name, startBeat, lengthBeats}); returns its index."""
+    _require_provenance(frame)
+    start_beat = float(start_beat)
+    kind = _normalize_section_kind(name)
+    section = {
+        "kind": kind,
+        "startSec": float(frame.beats_to_sec(start_beat) or 0.0),
+        "endSec": None if length_beats is None else frame.beats_to_sec(start_beat + float(length_beats)),
+        "name": name or kind,
+        "inferred": False,
+    }
+    frame.sections = [s for s in frame.sections if not s.get("inferred")] + [section]
+    # Only the last chord reads section bounds (as its duration fallback)
+    _refresh_duration(frame, frame.n_chords - 1)
+    return len(frame.sections) - 1
+
+
+def delete_section(frame: TimelineFrame, s: int) -> Dict[str, Any]:
+    """Delete section s (an index into frame.sections); returns the removed section."""
+    _require_provenance(frame)
+    removed = frame.sections[s]
+    frame.sections = frame.sections[:s] + frame.sections[s + 1:]
+    _refresh_sections(frame)
+    _refresh_duration(frame, frame.n_chords - 1)
+    return removed
+
+
+def move_section(frame: TimelineFrame, s: int, start_beat: float) -> int:
+    """Move section s to start_beat keeping its length (delete + append); returns its new index."""
+    section = frame.sections[s]
+    if section.get("inferred"):
+        raise ValueError("inferred sections follow the first chord and cannot be moved")
+    length = None
+    if section["endSec"] is not None:
+        length = frame.sec_to_beats(section["endSec"]) - frame.sec_to_beats(section["startSec"])
+    delete_section(frame, s)
+    return insert_section(frame, section["name"], start_beat, length)
@@ -0,0 +1,286 @@
+from __future__ import annotations
+
+import math
+from array import array
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from ..utils.tempo_map import TempoMap
+from ..schemas_timeline import (
+    SongTimeline,
+    TempoMark,
+    TimeSigMark,
+    Section as SectionModel,
+    ChordEvent as ChordEventModel,
+    LyricEvent as LyricEventModel,
+)
+
+_NAN = float("nan")
+
+
+class TimelineFrame:
+    """Columnar SongTimeline used between the mapper, caches and exporters.
+
+    Chords and lyrics are parallel arrays (float columns in array('d'), symbols
+    interned once per song, lyric pairing as an index into the lyric columns), so a
+    cached timeline holds a handful of containers instead of one Pydantic model per
+    event. Materialize a SongTimeline (to_model) or a plain dict (to_dict) only at the
+    HTTP boundary; both have exactly the shape SongTimeline.model_dump() had.
+    Chords are sorted by atBeat; lyrics keep input order.
+    """
+
+    __slots__ = (
+        "id", "title", "artist", "bpm", "num", "den", "tempo_map", "time_sig_map", "sections", "key", "mode",
+        "symbols", "chord_sym", "chord_beat", "chord_sec", "chord_dur", "chord_explicit", "chord_lyric",
+        "lyric_id", "lyric_text", "lyric_beat", "lyric_sec", "_index",
+    )
+
+    def __init__(self, *, id: str, title: Optional[str] = None, artist: Optional[str] = None,
+                 bpm: float, num: int, den: int,
+                 tempo_map: Optional[List[Dict[str, Any]]] = None,
+                 time_sig_map: Optional[List[Dict[str, Any]]] = None,
+                 sections: Optional[List[Dict[str, Any]]] = None,
+                 key: Optional[str] = None, mode: Optional[str] = None):
+        self.id = id
+        self.title = title
+        self.artist = artist
+        self.bpm = bpm
+        self.num = num
+        self.den = den
+        self.tempo_map = tempo_map if tempo_map is not None else [{"atSec": 0.0, "bpm": bpm}]
+        self.time_sig_map = time_sig_map if time_sig_map is not None else [{"atSec": 0.0, "num": num, "den": den}]
+        self.sections: List[Dict[str, Any]] = sections or []
+        self.key = key
+        self.mode = mode
+        self.symbols: List[str] = []
+        self.chord_sym = array("i")
+        self.chord_beat = array("d")
+        self.chord_sec = array("d")
+        self.chord_dur = array("d")  # NaN = no duration
+        self.chord_explicit: Optional[array] = array("b")  # 1 = duration given, 0 = inferred; None = unknown
+        self.chord_lyric = array("i")  # -1 = no hover lyric
+        self.lyric_id: List[str] = []
+        self.lyric_text: List[str] = []
+        self.lyric_beat = array("d")
+        self.lyric_sec = array("d")
+        self._index: Optional[_WindowIndex] = None
+
+    # -- building -------------------------------------------------------------------------
+    def set_chords(
+        self,
+        symbols: List[str],
+        beats: List[float],
+        secs: List[float],
+        durs: List[Optional[float]],
+        explicit: Optional[List[bool]] = None,
+    ) -> None:
+        """Replace the chord columns; rows must already be sorted by beat.
+
+        explicit marks durations that came from the doc (vs inferred); incremental edits
+        (timeline_edit) need it and refuse frames where it is unknown.
+        """
+        index: Dict[str, int] = {}
+        self.symbols = []
+        sym_ids = []
+        for s in symbols:
+            i = index.get(s)
+            if i is None:
+                i = index[s] = len(self.symbols)
+                self.symbols.append(s)
+            sym_ids.append(i)
+        self.chord_sym = array("i", sym_ids)
+        self.chord_beat = array("d", beats)
+        self.chord_sec = array("d", secs)
+        self.chord_dur = array("d", (_NAN if d is None else d for d in durs))
+        self.chord_explicit = None if explicit is None else array("b", (1 if e else 0 for e in explicit))
+        self.chord_lyric = array("i", [-1]) * len(sym_ids)
+        self._index = None
+
+    def set_lyrics(self, ids: List[str], texts: List[str], beats: List[float], secs: List[float]) -> None:
+        self.lyric_id = list(ids)
+        self.lyric_text = list(texts)
+        self.lyric_beat = array("d", beats)
+        self.lyric_sec = array("d", secs)
+        self._index = None
+
+    # -- access ---------------------------------------------------------------------------
+    @property
+    def n_chords(self) -> int:
+        return len(self.chord_beat)
+
+    @property
+    def n_lyrics(self) -> int:
+        return len(self.lyric_beat)
+
+    def chord_symbol(self, i: int) -> str:
+        return self.symbols[self.chord_sym[i]]
+
+    def chord_duration(self, i: int) -> Optional[float]:
+        d = self.chord_dur[i]
+        return None if math.isnan(d) else d
+
+    def chord_lyric_id(self, i: int) -> Optional[str]:
+        j = self.chord_lyric[i]
+        return self.lyric_id[j] if j >= 0 else None
+
+    def last_beat(self) -> float:
+        """Largest chord or lyric atBeat (0.0 for an empty timeline)."""
+        return max(0.0, max(self.chord_beat, default=0.0), max(self.lyric_beat, default=0.0))
+
+    def chord_dict(self, i: int) -> Dict[str, Any]:
+        return {
+            "symbol": self.symbols[self.chord_sym[i]],
+            "atSec": self.chord_sec[i],
+            "atBeat": self.chord_beat[i],
+            "durationBeats": self.chord_duration(i),
+            "lyricId": self.chord_lyric_id(i),
+        }
+
+    def lyric_dict(self, i: int) -> Dict[str, Any]:
+        return {"id": self.lyric_id[i], "atSec": self.lyric_sec[i], "atBeat": self.lyric_beat[i], "text": self.lyric_text[i]}
+
+    # -- windows --------------------------------------------------------------------------
+    def _window_index(self) -> "_WindowIndex":
+        # Built on first window query; frames are shared read-only, so a racing rebuild is harmless
+        if self._index is None:
+            self._index = _WindowIndex(self)
+        return self._index
+
+    def beats_to_sec(self, beats: float) -> float:
+        # Same arithmetic as the mapper: plain bpm for a single mark, the piecewise map otherwise
+        tempo = self._window_index().tempo
+        if tempo.is_constant:
+            return (beats * 60.0) / self.bpm if self.bpm > 0 else beats
+        return tempo.beats_to_sec(beats)
+
+    def sec_to_beats(self, sec: float) -> float:
+        tempo = self._window_index().tempo
+        if tempo.is_constant:
+            return (sec * self.bpm) / 60.0 if self.bpm > 0 else sec
+        return tempo.sec_to_beats(sec)
+
+    def window_rows(self, from_beat: Optional[float], to_beat: Optional[float]) -> Tuple[List[int], List[int], List[Dict[str, Any]]]:
+        """Chord rows, lyric rows and sections overlapping the half-open beat window [from, to).
+
+        A chord overlaps while it sounds (atBeat until atBeat + durationBeats); lyrics are
+        points. Rows come back in frame order. O(log n + k) via bisect over beat-sorted keys.
+        """
+        idx = self._window_index()
+        lo = -math.inf if from_beat is None else from_beat
+        hi = math.inf if to_beat is None else to_beat
+        # Chords sorted by start; anything starting more than max_dur before lo has ended
+        start = bisect_left(self.chord_beat, lo - idx.max_dur) if idx.max_dur < math.inf else 0
+        stop = bisect_left(self.chord_beat, hi)
+        chords = []
+        for i in range(start, stop):
+            beat = self.chord_beat[i]
+            if beat >= lo:
+                chords.append(i)
+            else:
+                dur = self.chord_dur[i]
+                if not math.isnan(dur) and beat + dur > lo:
+                    chords.append(i)
+        a = bisect_left(idx.lyric_beats, lo)
+        b = bisect_left(idx.lyric_beats, hi)
+        lyrics = sorted(idx.lyric_order[a:b])
+        lo_sec = -math.inf if from_beat is None else self.beats_to_sec(lo)
+        hi_sec = math.inf if to_beat is None else self.beats_to_sec(hi)
+        sections = [
+            s for s in self.sections
+            if s["startSec"] < hi_sec and (s.get("endSec") is None or s["endSec"] > lo_sec)
+        ]
+        return chords, lyrics, sections
+
+    def window(self, from_beat: Optional[float] = None, to_beat: Optional[float] = None) -> Dict[str, Any]:
+        """to_dict() restricted to the events overlapping [from_beat, to_beat)."""
+        chords, lyrics, sections = self.window_rows(from_beat, to_beat)
+        return self.to_dict(chords, lyrics, sections)
+
+    # -- boundary -------------------------------------------------------------------------
+    def to_dict(
+        self,
+        chord_rows: Optional[Iterable[int]] = None,
+        lyric_rows: Optional[Iterable[int]] = None,
+        sections: Optional[List[Dict[str, Any]]] = None,
+    ) -> Dict[str, Any]:
+        """JSON-ready dict shaped like SongTimeline.model_dump() (optionally a subset of rows)."""
+        return {
+            "id": self.id,
+            "title": self.title,
+            "artist": self.artist,
+            "bpmDefault": self.bpm,
+            "timeSigDefault": {"num": self.num, "den": self.den},
+            "tempoMap": [dict(m) for m in self.tempo_map],
+            "timeSigMap": [dict(m) for m in self.time_sig_map],
+            "sections": [dict(s) for s in (self.sections if sections is None else sections)],
+            "chords": [self.chord_dict(i) for i in (chord_rows if chord_rows is not None else range(self.n_chords))],
+            "lyrics": [self.lyric_dict(i) for i in (lyric_rows if lyric_rows is not None else range(self.n_lyrics))],
+            "key": self.key,
+            "mode": self.mode,
+        }
+
+    def to_model(self) -> SongTimeline:
+        """Materialize the Pydantic SongTimeline (values are already validated, so no re-validation)."""
+        d = self.to_dict()
+        return SongTimeline.model_construct(
+            **{k: d[k] for k in ("id", "title", "artist", "bpmDefault", "timeSigDefault", "key", "mode")},
+            tempoMap=[TempoMark.model_construct(**m) for m in d["tempoMap"]],
+            timeSigMap=[TimeSigMark.model_construct(**m) for m in d["timeSigMap"]],
+            sections=[SectionModel.model_construct(**s) for s in d["sections"]],
+            chords=[ChordEventModel.model_construct(**c) for c in d["chords"]],
+            lyrics=[LyricEventModel.model_construct(**l) for l in d["lyrics"]],
+        )
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "TimelineFrame":
+        """Inverse of to_dict (also reads stored SongTimeline JSON)."""
+        sig = d.get("timeSigDefault") or {}
+        frame = cls(
+            id=d["id"], title=d.get("title"), artist=d.get("artist"), bpm=d["bpmDefault"],
+            num=sig.get("num", 4), den=sig.get("den", 4),
+            tempo_map=list(d.get("tempoMap") or []), time_sig_map=list(d.get("timeSigMap") or []),
+            sections=[{"endSec": None, "name": None, "inferred": False, **s} for s in d.get("sections") or []],
+            key=d.get("key"), mode=d.get("mode"),
+        )
+        lyrics = d.get("lyrics") or []
+        frame.set_lyrics(
+            [l["id"] for l in lyrics], [l["text"] for l in lyrics],
+            [l["atBeat"] for l in lyrics], [l["atSec"] for l in lyrics],
+        )
+        chords = d.get("chords") or []
+        frame.set_chords(
+            [c["symbol"] for c in chords], [c["atBeat"] for c in chords],
+            [c["atSec"] for c in chords], [c.get("durationBeats") for c in chords],
+        )
+        first_index: Dict[str, int] = {}
+        for j, lid in enumerate(frame.lyric_id):
+            first_index.setdefault(lid, j)
+        for i, c in enumerate(chords):
+            if c.get("lyricId") is not None:
+                frame.chord_lyric[i] = first_index.get(c["lyricId"], -1)
+        return frame
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimelineFrame):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
+
+    def __repr__(self) -> str:
+        return f"TimelineFrame(id={self.id!r}, chords={self.n_chords}, lyrics={self.n_lyrics})"
+
+
+class _WindowIndex:
+    """Beat-sorted lookup keys for window queries over one frame."""
+
+    __slots__ = ("lyric_order", "lyric_beats", "max_dur", "tempo")
+
+    def __init__(self, frame: TimelineFrame):
+        order = sorted(range(frame.n_lyrics), key=frame.lyric_beat.__getitem__)
+        self.lyric_order = array("i", order)
+        self.lyric_beats = [frame.lyric_beat[i] for i in order]
+        durs = [d for d in frame.chord_dur if not math.isnan(d)]
+        self.max_dur = max(durs, default=0.0)
+        self.tempo = TempoMap.from_doc(
+            {"tempoMap": frame.tempo_map, "timeSigMap": frame.time_sig_map},
+            bpm=frame.bpm, time_sig=(frame.num, frame.den), quarter_beats=False,
+        )
@@ -1,6 +1,11 @@
 from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Text, ForeignKey, Integer, DateTime, func
+from sqlalchemy import String, Text, ForeignKey, Integer, DateTime, event, func, inspect
 from .database import Base
+from .utils.content_hash import content_sha256
+
+
+def _content_sha256_default(context) -> str | None:
+    return content_sha256(context.get_current_parameters().get("content"))
 
 class User(Base):
     __tablename__ = "users"
@@ -15,9 +20,29 @@ class Song(Base):
     title: Mapped[str] = mapped_column(String(255), index=True)
     artist: Mapped[str] = mapped_column(String(255), default="")
     content: Mapped[str] = mapped_column(Text)
+    # Import identity (utils/content_hash.py); importers skip songs whose digest exists
+    content_sha256: Mapped[str | None] = mapped_column(String(64), nullable=True, unique=True, index=True, default=_content_sha256_default)
     created_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now())
     updated_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
 
+@event.listens_for(Song, "before_update")
+def _rehash_edited_content(mapper, connection, target: Song) -> None:
+    state = inspect(target)
+    if state.attrs.content.history.has_changes() and not state.attrs.content_sha256.history.has_changes():
+        target.content_sha256 = content_sha256(target.content)
+
+class MaterializedTimeline(Base):
+    """Analyzed doc + SongTimeline computed when the song is written (see services/materialize.py)."""
+    __tablename__ = "song_timelines"
+    song_id: Mapped[int] = mapped_column(ForeignKey("songs.id", ondelete="CASCADE"), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, default=1)  # services.materialize.MATERIALIZE_VERSION
+    content_hash: Mapped[str] = mapped_column(String(64))  # digest of title/artist/content analyzed
+    analyzed_json: Mapped[str] = mapped_column(Text)
+    timeline_json: Mapped[str] = mapped_column(Text)
+    warnings_json: Mapped[str] = mapped_column(Text, default="[]")
+    validation_json: Mapped[str] = mapped_column(Text, default="[]")
+    updated_at: Mapped[DateTime] = mapped_column(DateTime, server_default=func.now(), onupdate=func.now())
+
 class Section(Base):
     __tablename__ = "sections"
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
@@ -15,7 +15,7 @@ import importlib.util
 import os
 from types import ModuleType
 
-User = SongORM = Section = Line = Job = Recording = SongDraft = None  # type: ignore
+User = SongORM = Section = Line = Job = Recording = SongDraft = MaterializedTimeline = None  # type: ignore
 try:
 	here = os.path.dirname(__file__)
 	orm_path = os.path.normpath(os.path.join(here, "..", "models.py"))
@@ -32,6 +32,7 @@ try:
 			Job = getattr(_orm_models, "Job", None)
 			Recording = getattr(_orm_models, "Recording", None)
 			SongDraft = getattr(_orm_models, "SongDraft", None)
+			MaterializedTimeline = getattr(_orm_models, "MaterializedTimeline", None)
 except Exception:
 	# If loading fails (e.g., minimal Docker image), keep None placeholders.
 	pass
@@ -49,4 +50,5 @@ __all__ = [
 	"Job",
 	"Recording",
 	"SongDraft",
+	"MaterializedTimeline",
 ]
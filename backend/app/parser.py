@@ -1,5 +1,7 @@
+import codecs
+import io
 import re
-from typing import List, Dict, Tuple
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 _SEP_RE = re.compile(r"^\s*([-=#*_])\1{2,}\s*$")
@@ -7,6 +9,9 @@ _CHORDPRO_TITLE_RE = re.compile(r"^\s*\{\s*(title|t)\s*:\s*(.*?)\s*}\s*$", re.IG
 _CHORDPRO_ARTIST_RE = re.compile(r"^\s*\{\s*(artist|subtitle|st)\s*:\s*(.*?)\s*}\s*$", re.IGNORECASE)
 
 
+_QUOTES = str.maketrans({"\u2018": "'", "\u2019": "'", "\u201C": '"', "\u201D": '"'})
+
+
 def _normalize(text: str) -> str:
     # Normalize line endings and quotes
     text = text.replace("\r\n", "\n").replace("\r", "\n")
@@ -40,6 +45,86 @@ def _split_songs(text: str) -> List[str]:
     return ["\n".join(c).strip() for c in chunks if any(t.strip() for t in c)]
 
 
+class SongSplitter:
+    """Incremental _split_songs: feed() lines one at a time, get each song chunk back
+    as soon as the next boundary (a second ChordPro title or a separator line) arrives."""
+
+    def __init__(self) -> None:
+        self._buf: List[str] = []
+        self._title_hits = 0
+        self._started = False
+
+    def _take(self) -> Optional[str]:
+        buf, self._buf = self._buf, []
+        if not any(t.strip() for t in buf):
+            return None
+        return "\n".join(buf).strip()
+
+    def feed(self, line: str) -> Optional[str]:
+        # Same per-line normalization as _normalize (line endings are handled by the reader)
+        ln = line.rstrip().translate(_QUOTES)
+        if not self._started:
+            # _normalize strips the whole text, so leading blank lines never count as content
+            if not ln:
+                return None
+            self._started = True
+        done = None
+        if _CHORDPRO_TITLE_RE.match(ln):
+            self._title_hits += 1
+            if self._title_hits > 1 and self._buf:
+                done = self._take()
+        elif _SEP_RE.match(ln) and self._buf:
+            return self._take()
+        self._buf.append(ln)
+        return done
+
+    def close(self) -> Optional[str]:
+        return self._take()
+
+
+def parse_song(part: str) -> Dict[str, str]:
+    """Title/artist/content dict for one song chunk (as produced by SongSplitter)."""
+    title, artist = _guess_title_artist(part.split("\n"))
+    return {"title": title, "artist": artist, "content": part.strip()}
+
+
+def iter_songs(lines: Iterable[str]) -> Iterator[Dict[str, str]]:
+    """Yield songs from an iterable of lines (a text file, StringIO, ...) one at a time."""
+    splitter = SongSplitter()
+    for line in lines:
+        part = splitter.feed(line)
+        if part:
+            yield parse_song(part)
+    part = splitter.close()
+    if part:
+        yield parse_song(part)
+
+
+def iter_text_lines(raw: str) -> Iterator[str]:
+    """Lines of `raw` with universal newlines (\\r\\n and lone \\r end a line, as in _normalize)."""
+    return iter(io.StringIO(raw, newline=None))
+
+
+async def aiter_body_lines(chunks: AsyncIterator[bytes], encoding: str = "utf-8") -> AsyncIterator[str]:
+    """Decode a byte stream (e.g. Request.stream()) into lines without buffering the whole body."""
+    decoder = codecs.getincrementaldecoder(encoding)(errors="replace")
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        # Hold back a trailing \r: it may be the first half of \r\n
+        cut = len(pending) - 1 if pending.endswith("\r") else len(pending)
+        lines = io.StringIO(pending[:cut], newline=None).readlines()
+        if lines and not lines[-1].endswith("\n"):
+            pending = lines.pop() + pending[cut:]
+        else:
+            pending = pending[cut:]
+        for line in lines:
+            yield line
+    pending += decoder.decode(b"", final=True)
+    for line in io.StringIO(pending, newline=None):
+        yield line
+
+
 def _guess_title_artist(lines: List[str]) -> Tuple[str, str]:
     title = ""
     artist = ""
@@ -74,15 +159,4 @@ def _guess_title_artist(lines: List[str]) -> Tuple[str, str]:
 
 
 def parse_songs(raw: str) -> List[Dict[str, str]]:
-    text = _normalize(raw)
-    parts = _split_songs(text)
-    songs: List[Dict[str, str]] = []
-    for part in parts:
-        lines = part.split("\n")
-        title, artist = _guess_title_artist(lines)
-        songs.append({
-            "title": title,
-            "artist": artist,
-            "content": part.strip(),
-        })
-    return songs
+    return list(iter_songs(iter_text_lines(raw)))
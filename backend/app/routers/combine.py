@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Body, Depends, HTTPException
 import json
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from typing import Any, Dict, Optional
@@ -9,12 +10,25 @@ from typing import Any, Dict, Optional
 from ..database import get_session
 from .. import models, schemas
 from ..utils.align import merge_jcrd_with_lyrics, chords_only_text
-from ..services.lyrics_providers.lrclib import search_timestamped_lyrics
+from ..services.lyrics_providers import LatencyBudget, search_timestamped_lyrics
 from ..config import settings
+from ..services.materialize import materialize_song
+from ..services.song_hashes import digest_owner, existing_hashes
+from ..utils.content_hash import jcrd_sha256
 
 router = APIRouter(prefix="/combine", tags=["combine"])
 
 
+async def _duplicate(session: AsyncSession, song_id: int) -> Dict[str, Any]:
+    song = await session.get(models.SongORM, song_id)
+    return {
+        "title": song.title,
+        "artist": song.artist,
+        "duplicate": True,
+        "song": {"id": song.id, "title": song.title, "artist": song.artist},
+    }
+
+
 @router.post("/jcrd-lyrics")
 async def combine_jcrd_lyrics(
     payload: Dict[str, Any] = Body(...),
@@ -38,6 +52,12 @@ async def combine_jcrd_lyrics(
     lines = lyrics.get("lines") or []
     if not isinstance(lines, list):
         raise HTTPException(status_code=400, detail="Invalid lyrics.lines")
+    digest = jcrd_sha256(jcrd)
+    if save:
+        # Re-imports of a stored JCRD return the existing song before any lyric lookup
+        present = await existing_hashes(session, [digest])
+        if digest in present:
+            return await _duplicate(session, present[digest])
     # Auto-fetch lyrics if requested to include and no lines provided
     if include_lyrics and not lines:
         if settings.LYRICS_PROVIDER_ENABLED:
@@ -45,7 +65,9 @@ async def combine_jcrd_lyrics(
             artist = (payload.get("artist") or jcrd.get("metadata", {}).get("artist") or "").strip()
             if title:
                 try:
-                    fetched = await search_timestamped_lyrics(title=title, artist=artist)
+                    fetched = await search_timestamped_lyrics(
+                        title=title, artist=artist, budget=LatencyBudget(settings.LYRICS_COMBINE_BUDGET_S)
+                    )
                     if fetched and isinstance(fetched.get("lines"), list):
                         lines = fetched["lines"]
                 except Exception:
@@ -74,14 +96,23 @@ async def combine_jcrd_lyrics(
             # Keep the rendered content for reference/debug
             "content_text": merged.get("content", ""),
         }
-        song = models.Song(
+        song = models.SongORM(
             user_id=1,
             title=title,
             artist=artist,
             content=json.dumps(save_payload),  # type: ignore[arg-type]
+            content_sha256=digest,
         )  # type: ignore[index]
         session.add(song)
-        await session.commit()
+        try:
+            await materialize_song(session, song)
+            await session.commit()
+        except IntegrityError as exc:
+            # A concurrent save of the same JCRD won the race past the pre-check
+            owner = await digest_owner(session, exc, digest)
+            if owner is None:
+                raise
+            return await _duplicate(session, owner)
         await session.refresh(song)
         result["song"] = {"id": song.id, "title": song.title, "artist": song.artist}
 
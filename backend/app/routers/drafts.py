@@ -1,9 +1,14 @@
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
 import json
 from ..database import get_session
 from .. import models
+from ..services.materialize import materialize_song
+from ..services.song_hashes import digest_owner
+from ..utils.content_hash import content_sha256
+from ..utils.etag import not_modified, strong_etag
 
 router = APIRouter(tags=["drafts"])
 
@@ -82,7 +87,7 @@ def _infer_sections_with_lengths(raw_sections: list[dict], bpm: float | None) ->
     return sections
 
 @router.get("/drafts/{draft_id}/songdoc")
-async def get_draft_songdoc(draft_id: int, session: AsyncSession = Depends(get_session)):
+async def get_draft_songdoc(draft_id: int, request: Request, response: Response, session: AsyncSession = Depends(get_session)):
     """Return a SongDocDraft (v1) view of the draft, matching the provided JSON Schema shape."""
     sd = await session.get(models.SongDraft, draft_id)
     if not sd:
@@ -91,6 +96,15 @@ async def get_draft_songdoc(draft_id: int, session: AsyncSession = Depends(get_s
     rec = None
     if sd.recording_id:
         rec = await session.get(models.Recording, sd.recording_id)
+    # Validator over every field the view is built from; checked before building it
+    etag = strong_etag(
+        "draftdoc", sd.id, getattr(sd, "status", None), sd.created_at, getattr(sd, "updated_at", None),
+        sd.recording_id, rec.file_path if rec else None, rec.job_id if rec else None,
+        sd.meta, sd.sections, sd.chords, sd.lyrics, sd.bpm, getattr(sd, "notes", None),
+    )
+    unchanged = not_modified(request, response, etag)
+    if unchanged is not None:
+        return unchanged
     meta = json.loads(sd.meta) if sd.meta else {}
     raw_sections = json.loads(sd.sections) if sd.sections else []
     chords = json.loads(sd.chords) if sd.chords else []
@@ -169,9 +183,16 @@ async def create_song_from_draft(
         lines.append("")
         lines.append(sd.lyrics)
     content = "\n".join(lines)
-    song = models.Song(user_id=1, title=title, artist=artist, content=content)
+    song = models.SongORM(user_id=1, title=title, artist=artist, content=content)
     session.add(song)
-    await session.commit()
+    try:
+        await materialize_song(session, song)
+        await session.commit()
+    except IntegrityError as exc:
+        owner = await digest_owner(session, exc, content_sha256(content))
+        if owner is None:
+            raise
+        raise HTTPException(status_code=409, detail={"message": "A song with this content already exists", "song_id": owner})
     await session.refresh(song)
     # Update draft status/link
     sd.status = "promoted"
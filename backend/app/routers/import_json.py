@@ -1,10 +1,12 @@
 from fastapi import APIRouter, UploadFile, File, HTTPException, Query
 from fastapi.responses import JSONResponse
+import io
 import json
 from typing import Optional
 from .combine import combine_jcrd_lyrics
+from ..utils.uploads import LimitedUploadRoute, open_upload, upload_size
 
-router = APIRouter(prefix="/import", tags=["import"])
+router = APIRouter(prefix="/import", tags=["import"], route_class=LimitedUploadRoute)
 
 
 @router.post("/json")
@@ -13,9 +15,9 @@ async def import_json(file: UploadFile = File(...), include_lyrics: Optional[boo
     if not (file.filename or "").lower().endswith(".json"):
         raise HTTPException(status_code=400, detail="Please upload a .json file")
 
+    fp = open_upload(file)
     try:
-        raw = await file.read()
-        data = json.loads(raw.decode("utf-8", errors="ignore"))
+        data = json.load(io.TextIOWrapper(fp, encoding="utf-8", errors="ignore"))
     except Exception as e:  # noqa: BLE001 - return error to client
         raise HTTPException(status_code=400, detail=f"Invalid JSON: {e}")
 
@@ -27,7 +29,7 @@ async def import_json(file: UploadFile = File(...), include_lyrics: Optional[boo
     result = {
         "ok": True,
         "filename": file.filename,
-        "size_bytes": len(raw),
+        "size_bytes": upload_size(file),
         "summary": summary,
         "preview": preview,
     }
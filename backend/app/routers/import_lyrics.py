@@ -2,11 +2,13 @@ from __future__ import annotations
 
 from fastapi import APIRouter, UploadFile, File, HTTPException
 from fastapi.responses import JSONResponse
+from starlette.concurrency import run_in_threadpool
 
-from ..legacy.ingest.lyrics import parse_lyrics_payload
+from ..legacy.ingest.lyrics import parse_lyrics_file
+from ..utils.uploads import LimitedUploadRoute, open_upload, upload_size
 
 
-router = APIRouter(prefix="/import", tags=["import"])
+router = APIRouter(prefix="/import", tags=["import"], route_class=LimitedUploadRoute)
 
 
 @router.post("/lyrics")
@@ -23,14 +25,12 @@ async def import_lyrics(file: UploadFile = File(...)):
     Also includes a "lines" alias for backward-compat preview UIs: [{"text","ts"}].
     """
     fname = file.filename or ""
+    fp = open_upload(file)
     try:
-        raw = await file.read()
-        text = raw.decode("utf-8", errors="ignore")
+        lines = await run_in_threadpool(parse_lyrics_file, fp, fname, errors="ignore")
     except Exception as e:  # noqa: BLE001
         raise HTTPException(status_code=400, detail=f"Failed to read file: {e}")
 
-    lines = parse_lyrics_payload(text, fname)
-
     items = [
         {
             "section": None,
@@ -50,7 +50,7 @@ async def import_lyrics(file: UploadFile = File(...)):
         {
             "ok": True,
             "filename": fname,
-            "size_bytes": len(raw),
+            "size_bytes": upload_size(file),
             "items": items,
             "lines": lines_alias,
         }
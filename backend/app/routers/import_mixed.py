@@ -1,19 +1,27 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, UploadFile, File, Query
-from fastapi.responses import JSONResponse
+from fastapi import APIRouter, Depends, UploadFile, File, Query
+from fastapi.responses import JSONResponse, StreamingResponse
+from dataclasses import dataclass, field
 from typing import Optional
+import asyncio
 import json
 
-from ..parser import parse_songs
-from ..importers import import_json_file, import_midi_file, import_mp3_file, _looks_like_jcrd  # type: ignore[attr-defined]
-from ..legacy.ingest.lyrics import parse_lyrics_payload
-from ..services.lyrics_providers.lrclib import search_timestamped_lyrics
-from ..utils.align import merge_jcrd_with_lyrics, chords_only_text
+from ..importers import import_json_file, import_midi_file, import_mp3_file
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from ..database import get_session
+from ..services import import_pool
+from ..services.bulk_import import persist_songs
+from ..services.import_archive import stream_archive
+from ..services.song_hashes import existing_hashes
+from ..services.lyrics_providers import LatencyBudget, search_timestamped_lyrics
 from ..config import settings
+from ..utils.content_hash import content_sha256, jcrd_sha256
+from ..utils.uploads import LimitedUploadRoute, detach_upload, open_upload
 
 
-router = APIRouter(prefix="/import", tags=["import"])
+router = APIRouter(prefix="/import", tags=["import"], route_class=LimitedUploadRoute)
 
 
 def _dedupe_songs(items: list[dict]) -> list[dict]:
@@ -28,102 +36,229 @@ def _dedupe_songs(items: list[dict]) -> list[dict]:
 	return out
 
 
+@dataclass
+class _PendingJcrd:
+	"""A JCRD file whose lyric lookup waits for the batch duplicate check."""
+	filename: str
+	label: str
+	obj: dict
+	data: bytes
+	content_sha256: str
+
+
+@dataclass
+class _FileResult:
+	label: str = ""
+	songs: list = field(default_factory=list)  # song dicts and _PendingJcrd
+	success: list[str] = field(default_factory=list)
+	skipped: list[str] = field(default_factory=list)
+	errors: list[str] = field(default_factory=list)
+
+
+def _hashed(songs: list[dict], first: Optional[str] = None) -> list[dict]:
+	for n, s in enumerate(songs):
+		s["content_sha256"] = first if n == 0 and first else content_sha256(s.get("content"))
+	return songs
+
+
+def _digest(item) -> Optional[str]:
+	return item.content_sha256 if isinstance(item, _PendingJcrd) else item.get("content_sha256")
+
+
+async def _import_jcrd(
+	obj: dict, fallback_title: str, include_lyrics: Optional[bool], budget: Optional[LatencyBudget] = None
+) -> Optional[dict]:
+	"""Song for a JCRD file (merged with fetched lyrics, or chords only); None to fall back.
+
+	`budget` is the lyric-lookup time shared by the whole request.
+	"""
+	meta = obj.get("metadata") or {}
+	title = (meta.get("title") or obj.get("title") or fallback_title).strip()
+	artist = (meta.get("artist") or obj.get("artist") or "").strip()
+	if include_lyrics and settings.LYRICS_PROVIDER_ENABLED:
+		lines = None
+		if title:
+			try:
+				# Attempt lyrics search even if artist is missing; provider will best-match
+				fetched = await search_timestamped_lyrics(title=title, artist=artist, timeout=3.0, budget=budget)
+				lines = (fetched or {}).get("lines") if isinstance(fetched, dict) else None
+			except Exception:
+				lines = None
+		if lines:
+			content = await import_pool.run(import_pool.merged_content, obj, lines)
+			return {"title": title or "Untitled", "artist": artist, "content": content}
+	if include_lyrics is False:
+		content = await import_pool.run(import_pool.chords_only_content, obj)
+		return {"title": title or "Untitled", "artist": artist, "content": content}
+	return None
+
+
+async def _finish_jcrd(
+	p: _PendingJcrd, include_lyrics: Optional[bool], budget: Optional[LatencyBudget] = None
+) -> tuple[list[dict], list[str]]:
+	try:
+		song = await _import_jcrd(p.obj, p.label.rsplit(".", 1)[0], include_lyrics, budget)
+	except Exception:
+		song = None
+	try:
+		if song is not None:
+			return _hashed([song], p.content_sha256), []
+		s, w = await import_pool.run(import_json_file, p.filename, p.data)
+		return _hashed(s, p.content_sha256), w
+	except Exception as e:  # noqa: BLE001
+		return [], [f"{p.label}: {e}"]
+
+
+async def _import_file(f: UploadFile) -> _FileResult:
+	"""Read and parse one upload. JCRD files stop at _PendingJcrd: lyrics are fetched
+	only after the batch has been checked for songs that already exist."""
+	name = (f.filename or "").lower()
+	label = f.filename or name
+	out = _FileResult(label=label)
+	try:
+		fp = open_upload(f)
+		if name.endswith((".json",)):
+			data = await f.read()
+			try:
+				obj = await import_pool.run(import_pool.load_jcrd, data)
+			except Exception:
+				obj = None
+			if obj is not None:
+				out.songs.append(_PendingJcrd(f.filename or "", label, obj, data, jcrd_sha256(obj)))
+			else:
+				s, w = await import_pool.run(import_json_file, f.filename or "", data)
+				out.songs.extend(_hashed(s))
+				out.errors.extend(w)
+			out.success.append(label)
+		elif name.endswith((".mid", ".midi")):
+			s, w = await import_pool.run_io(import_midi_file, f.filename or "", fp)
+			out.songs.extend(_hashed(s))
+			out.success.append(label)
+			out.errors.extend(w)
+		elif name.endswith((".mp3",)):
+			s, w = await import_pool.run_io(import_mp3_file, f.filename or "", fp)
+			out.songs.extend(_hashed(s))
+			out.success.append(label)
+			out.errors.extend(w)
+		elif name.endswith((".txt", ".lrc", ".vtt", ".csv")):
+			content = await import_pool.run_io(import_pool.lyric_file_content, fp, label)
+			out.songs.extend(_hashed([{"title": label.rsplit(".", 1)[0], "artist": "", "content": content}]))
+			out.success.append(label)
+		else:
+			# Fallback: try general text parser
+			s = await import_pool.run(import_pool.text_songs, await f.read())
+			if s:
+				out.songs.extend(_hashed(s))
+				out.success.append(label)
+			else:
+				out.skipped.append(label)
+	except Exception as e:  # noqa: BLE001
+		out.errors.append(f"{label}: {e}")
+	return out
+
+
 @router.post("/multi")
 async def import_multi(
 	files: list[UploadFile] = File(...),
 	include_lyrics: Optional[bool] = Query(default=True),
+	persist: bool = Query(default=False, description="Also save the deduplicated songs (batched inserts)"),
+	session: AsyncSession = Depends(get_session),
 ):
 	"""Accept a batch of files (.json, .mid, .midi, .mp3, .txt, .lrc, .vtt, .csv)
 	and return a summary + normalized song list.
+
+	Files are processed concurrently (at most settings.IMPORT_CONCURRENCY at a time);
+	results are collected in upload order, so output and dedupe match a serial run.
+	Songs whose content digest is already stored (or repeated earlier in the batch) are
+	left out and listed under "duplicates"; the check is one query for the whole batch,
+	made before any lyric lookup. All lyric lookups of the batch share one
+	settings.LYRICS_IMPORT_BUDGET_S budget; once it is spent, or while LRCLIB's circuit
+	breaker is open, JCRD files get offline lyrics or chords only. With persist=true the
+	songs are also saved, one transaction per settings.IMPORT_PERSIST_CHUNK songs;
+	"song_ids" lists the new ids in song order (null for a song that could not be saved)
+	and "not_saved" says why for each of those, e.g. a concurrent import of the same song.
 	"""
+	gate = asyncio.Semaphore(max(1, int(settings.IMPORT_CONCURRENCY)))
+
+	async def one(f: UploadFile) -> _FileResult:
+		async with gate:
+			return await _import_file(f)
+
+	results = await asyncio.gather(*(one(f) for f in files))
+
+	present = await existing_hashes(session, (_digest(item) for res in results for item in res.songs))
+	seen: set[str] = set()
+	duplicates: list[dict] = []
+	for res in results:
+		kept = []
+		for item in res.songs:
+			digest = _digest(item)
+			if digest and (digest in present or digest in seen):
+				duplicates.append({"file": res.label, "content_sha256": digest, "song_id": present.get(digest)})
+				continue
+			if digest:
+				seen.add(digest)
+			kept.append(item)
+		res.songs = kept
+
+	budget = LatencyBudget(settings.LYRICS_IMPORT_BUDGET_S)
+
+	async def finish(item) -> tuple[list[dict], list[str]]:
+		if not isinstance(item, _PendingJcrd):
+			return [item], []
+		async with gate:
+			return await _finish_jcrd(item, include_lyrics, budget)
+
+	finished = await asyncio.gather(*(asyncio.gather(*(finish(i) for i in res.songs)) for res in results))
 	songs: list[dict] = []
 	success: list[str] = []
 	skipped: list[str] = []
 	errors: list[str] = []
-
-	for f in files:
-		name = (f.filename or "").lower()
-		try:
-			data = await f.read()
-			if name.endswith((".json",)):
-				# Try auto-combine with lyrics for JCRD JSON if enabled
-				did_auto = False
-				try:
-					obj = json.loads(data.decode("utf-8", errors="replace"))
-					if isinstance(obj, dict) and _looks_like_jcrd(obj):
-						if include_lyrics and settings.LYRICS_PROVIDER_ENABLED:
-							meta = obj.get("metadata") or {}
-							title = (meta.get("title") or obj.get("title") or (f.filename or name).rsplit(".", 1)[0]).strip()
-							artist = (meta.get("artist") or obj.get("artist") or "").strip()
-							lines = None
-							if title:
-								try:
-									# Attempt lyrics search even if artist is missing; provider will best-match
-									fetched = await search_timestamped_lyrics(title=title, artist=artist, timeout=3.0)
-									lines = (fetched or {}).get("lines") if isinstance(fetched, dict) else None
-								except Exception:
-									lines = None
-							if lines:
-								merged = merge_jcrd_with_lyrics(obj, lines)
-								songs.append({"title": title or "Untitled", "artist": artist, "content": merged.get("content", "")})
-								did_auto = True
-						if not did_auto and (include_lyrics is False):
-							co = chords_only_text(obj)
-							meta = obj.get("metadata") or {}
-							title = (meta.get("title") or obj.get("title") or (f.filename or name).rsplit(".", 1)[0]).strip()
-							artist = (meta.get("artist") or obj.get("artist") or "").strip()
-							songs.append({"title": title or "Untitled", "artist": artist, "content": co.get("content", "")})
-							did_auto = True
-				except Exception:
-					did_auto = False
-
-				if not did_auto:
-					s, w = import_json_file(f.filename or "", data)
-					songs.extend(s)
-					errors.extend(w)
-				success.append(f.filename or name)
-			elif name.endswith((".mid", ".midi")):
-				s, w = import_midi_file(f.filename or "", data)
-				songs.extend(s)
-				success.append(f.filename or name)
-				errors.extend(w)
-			elif name.endswith((".mp3",)):
-				s, w = import_mp3_file(f.filename or "", data)
-				songs.extend(s)
-				success.append(f.filename or name)
-				errors.extend(w)
-			elif name.endswith((".txt", ".lrc", ".vtt", ".csv")):
-				text = data.decode("utf-8", errors="replace")
-				# Convert lyric lines to one pseudo-song content
-				lines = parse_lyrics_payload(text, f.filename or name)
-				content = "\n".join([l.text for l in lines])
-				title = (f.filename or name).rsplit(".", 1)[0]
-				songs.append({"title": title, "artist": "", "content": content})
-				success.append(f.filename or name)
-			else:
-				# Fallback: try general text parser
-				text = data.decode("utf-8", errors="replace")
-				s = parse_songs(text)
-				if s:
-					songs.extend(s)
-					success.append(f.filename or name)
-				else:
-					skipped.append(f.filename or name)
-		except Exception as e:  # noqa: BLE001
-			errors.append(f"{f.filename or name}: {e}")
+	for res, items in zip(results, finished):
+		for s, w in items:
+			songs.extend(s)
+			res.errors.extend(w)
+		success.extend(res.success)
+		skipped.extend(res.skipped)
+		errors.extend(res.errors)
 
 	deduped = _dedupe_songs(songs)
 
-	return JSONResponse(
-		{
-			"ok": True,
-			"counts": {
-				"input_files": len(files),
-				"songs": len(deduped),
-			},
-			"success": success,
-			"skipped": skipped,
-			"errors": errors or None,
-			"songs": deduped,
-		}
-	)
+	body = {
+		"ok": True,
+		"counts": {
+			"input_files": len(files),
+			"songs": len(deduped),
+			"duplicates": len(duplicates),
+		},
+		"success": success,
+		"skipped": skipped,
+		"errors": errors or None,
+		"songs": deduped,
+		"duplicates": duplicates,
+	}
+	if persist:
+		ids, failed = await persist_songs(session, deduped)
+		body["counts"]["inserted"] = sum(1 for i in ids if i is not None)
+		body["counts"]["not_saved"] = len(failed)
+		body["song_ids"] = ids
+		body["not_saved"] = failed
+	return JSONResponse(body)
+
+
+@router.post("/archive")
+async def import_archive(file: UploadFile = File(...)):
+	"""Import a whole album from one .zip or .tar(.gz) upload.
+
+	Streams NDJSON: one line per song unit ({index, member, lyrics?, songs, errors})
+	as it finishes, then {"done": true, "counts": {...}}. JSON chord files are merged
+	with the lyrics file sharing their basename (.lrc/.txt/.vtt/.csv).
+	"""
+	# The archive itself is bounded by the request limit; members by the per-file limit
+	fp = detach_upload(file, settings.UPLOAD_MAX_REQUEST_BYTES)
+
+	async def lines():
+		async for item in stream_archive(fp):
+			yield json.dumps(item) + "\n"
+
+	return StreamingResponse(lines(), media_type="application/x-ndjson")
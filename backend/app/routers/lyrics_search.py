@@ -2,7 +2,8 @@ from __future__ import annotations
 
 from fastapi import APIRouter, Query, HTTPException
 from typing import Optional
-from ..services.lyrics_providers.lrclib import search_timestamped_lyrics
+from ..services.lyrics_providers import search_timestamped_lyrics, stats as provider_stats
+from ..services.lyrics_providers.lrclib import cache_stats
 from ..config import settings
 
 router = APIRouter(tags=["lyrics"])
@@ -24,3 +25,15 @@ async def lyrics_search(
         return result
     except Exception as e:  # noqa: BLE001
         raise HTTPException(status_code=502, detail=f"Lyrics provider error: {e}")
+
+
+@router.get("/lyrics/cache/stats")
+async def lyrics_cache_stats():
+    """Hit/miss/eviction counters for the lyrics lookup cache (memory and disk tiers)."""
+    return cache_stats()
+
+
+@router.get("/lyrics/stats")
+async def lyrics_provider_stats():
+    """Lookup cache counters, LRCLIB circuit breaker state and degraded lookups by reason."""
+    return provider_stats()
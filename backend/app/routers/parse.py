@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+from typing import Any, AsyncIterator, Dict
+
+import httpx
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from ..config import settings
+from ..parser import SongSplitter, aiter_body_lines, iter_songs, iter_text_lines, parse_song
+from ..schemas import ParseResponse
+from ..services.analysis import analyze_from_content
+
+
+router = APIRouter(tags=["parse"])
+
+NDJSON = "application/x-ndjson"
+
+
+class _DuplexStreamingResponse(StreamingResponse):
+    """StreamingResponse whose body iterator is still reading the request.
+
+    The stock response listens for http.disconnect on `receive` while streaming, which
+    would swallow the remaining body chunks; here the iterator owns `receive` and a
+    disconnect surfaces as ClientDisconnect from request.stream() instead.
+    """
+
+    async def __call__(self, scope, receive, send) -> None:
+        await self.stream_response(send)
+
+
+def _song_line(index: int, part: str, analyze: bool) -> Dict[str, Any]:
+    song: Dict[str, Any] = {"index": index, **parse_song(part)}
+    if analyze:
+        try:
+            song["analysis"] = analyze_from_content(song["title"], song["artist"], song["content"])
+        except Exception as e:  # noqa: BLE001 - one bad song must not end the stream
+            song["error"] = f"analysis failed: {e}"
+    return song
+
+
+async def stream_songs(lines: AsyncIterator[str], *, analyze: bool = True) -> AsyncIterator[str]:
+    """NDJSON line per song, emitted as soon as the boundary after it has been read."""
+    splitter = SongSplitter()
+    index = 0
+
+    async def emit(part: str) -> str:
+        nonlocal index
+        line = await run_in_threadpool(_song_line, index, part, analyze)
+        index += 1
+        return json.dumps(line) + "\n"
+
+    async for raw in lines:
+        part = splitter.feed(raw)
+        if part:
+            yield await emit(part)
+    part = splitter.close()
+    if part:
+        yield await emit(part)
+
+
+@router.post("/parse", response_model=ParseResponse)
+async def parse_text(
+    request: Request,
+    stream: bool = Query(default=False, description="Stream one NDJSON line per song (also via Accept: application/x-ndjson)"),
+    analyze: bool = Query(default=True, description="Include analyze_from_content() output in streamed lines"),
+):
+    """Split a pasted or uploaded songbook (text/plain body) into songs.
+
+    Streaming mode reads the body line by line and never holds the whole songbook; the
+    remote parser fallback is only used by the buffered mode.
+    """
+    if stream or NDJSON in request.headers.get("accept", ""):
+        return _DuplexStreamingResponse(stream_songs(aiter_body_lines(request.stream()), analyze=analyze), media_type=NDJSON)
+    raw = (await request.body()).decode("utf-8", errors="replace")
+    # First, attempt local robust parser to support many common formats quickly
+    local = list(iter_songs(iter_text_lines(raw)))
+    if local:
+        return {"songs": local, "warnings": None}
+    # Fallback to remote parser if local cannot parse
+    async with httpx.AsyncClient(timeout=30) as client:
+        r = await client.post(settings.CLOUD_RUN_PARSE_URL, content=raw)
+        if r.status_code != 200:
+            raise HTTPException(status_code=502, detail=f"Parser error {r.status_code}: {r.text}")
+        return r.json()
@@ -1,72 +1,141 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Body
+from fastapi import APIRouter, Depends, HTTPException, Path, Body, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+import json
 
 from ..database import get_session
 from .. import models
-from ..services.analysis import analyze_songdoc, analyze_from_content
-from ..mappers.timeline import to_timeline
+from ..services.analysis_cache import analysis_cache
+from ..services.materialize import analysis_for, song_etag
+from ..services.timeline_batch import FATAL_CODES, load_batch, stream_timelines
+from ..config import settings
+from ..utils.etag import not_modified, validator_headers
 from ..schemas_timeline import TimelineResponse, TimelineDebugResponse, TimelineWarning
 
 router = APIRouter(prefix="/v1/songs", tags=["songs_v1"])
 
 
+@router.get("/cache/stats")
+async def get_analysis_cache_stats():
+	"""Hit/miss/eviction counters for the doc/timeline analysis cache."""
+	return analysis_cache.stats()
+
+
+@router.post("/timelines")
+async def post_song_timelines(ids: List[int] = Body(..., embed=True), session: AsyncSession = Depends(get_session)):
+	"""Timelines for many songs as NDJSON, one line per id in completion order.
+
+	Each line is {"id", "timeline", "warnings"}; invalid timelines add "error" with status 422
+	and unknown ids get {"id", "error": {"status": 404}}. Rows are loaded up front with one
+	IN (...) query, so streaming does not hold the DB session.
+	"""
+	if not ids:
+		raise HTTPException(status_code=422, detail="ids must not be empty")
+	if len(ids) > settings.TIMELINE_BATCH_MAX:
+		raise HTTPException(status_code=422, detail=f"at most {settings.TIMELINE_BATCH_MAX} ids per request")
+	songs, stored = await load_batch(session, ids)
+
+	async def lines():
+		async for item in stream_timelines(ids, songs, stored):
+			yield json.dumps(item) + "\n"
+
+	return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 @router.get("/{song_id}/doc")
-async def get_song_doc(song_id: int = Path(..., ge=1), session: AsyncSession = Depends(get_session)):
-	result = await session.execute(select(models.Song).where(models.Song.id == song_id))
+async def get_song_doc(request: Request, response: Response, song_id: int = Path(..., ge=1), session: AsyncSession = Depends(get_session)):
+	result = await session.execute(select(models.SongORM).where(models.SongORM.id == song_id))
 	song = result.scalar_one_or_none()
 	if not song:
 		raise HTTPException(status_code=404, detail="Song not found")
-	analyzed = analyze_from_content(song.title, song.artist, song.content or "")
-	return analyzed
+	unchanged = not_modified(request, response, song_etag(song, "doc"))
+	if unchanged is not None:
+		return unchanged
+	return await analysis_for(session, song)
 
 
 @router.get("/{song_id}/timeline", response_model=TimelineResponse)
-async def get_song_timeline(song_id: int = Path(..., ge=1), session: AsyncSession = Depends(get_session)):
-	"""Return canonical timeline. 422 if structurally invalid (missing chords or lyrics)."""
-	result = await session.execute(select(models.Song).where(models.Song.id == song_id))
+async def get_song_timeline(
+	request: Request,
+	response: Response,
+	song_id: int = Path(..., ge=1),
+	fromBeat: Optional[float] = Query(None),
+	toBeat: Optional[float] = Query(None),
+	fromSec: Optional[float] = Query(None),
+	toSec: Optional[float] = Query(None),
+	session: AsyncSession = Depends(get_session),
+):
+	"""Return canonical timeline. 422 if structurally invalid (missing chords or lyrics).
+
+	fromBeat/toBeat (or fromSec/toSec) restrict sections, chords and lyrics to those
+	overlapping the half-open window; either bound may be omitted. Sends a strong ETag
+	(per window); a matching If-None-Match gets 304 before any analysis runs.
+	"""
+	window = _parse_window(fromBeat, toBeat, fromSec, toSec)
+	result = await session.execute(select(models.SongORM).where(models.SongORM.id == song_id))
 	song = result.scalar_one_or_none()
 	if not song:
 		raise HTTPException(status_code=404, detail="Song not found")
-	analyzed = analyze_from_content(song.title, song.artist, song.content or "")
-	timeline, warnings, validation = to_timeline({**analyzed, "id": song.id})
-	# If structural validation contains empty chords/lyrics, bubble as 422
-	fatal_codes = {"chords.empty", "bpm.missing", "timesig.missing"}  # allow chord-only (no lyrics)
-	if any(v.code in fatal_codes for v in validation):
+	etag = song_etag(song, "timeline" if window is None else f"timeline{window}")
+	unchanged = not_modified(request, response, etag)
+	if unchanged is not None:
+		return unchanged
+	timeline, warnings, validation = await analysis_for(session, song, timeline=True)
+	# If structural validation contains empty chords/lyrics, bubble as 422 (chord-only is allowed)
+	if any(v.code in FATAL_CODES for v in validation):
 		raise HTTPException(status_code=422, detail={
 			"message": "Timeline invalid",
 			"validation": [v.dict() for v in validation],
 			"warnings": [w.dict() for w in warnings],
 		})
-	return {"timeline": timeline, "warnings": warnings}
+	body: Dict[str, Any] = {"warnings": [w.model_dump() for w in warnings]}
+	if window is None:
+		body["timeline"] = timeline.to_dict()
+	else:
+		unit, lo, hi = window
+		if unit == "sec":
+			lo = None if lo is None else timeline.sec_to_beats(lo)
+			hi = None if hi is None else timeline.sec_to_beats(hi)
+		body["timeline"] = timeline.window(lo, hi)
+		body["window"] = {"fromBeat": lo, "toBeat": hi}
+	# Serialized straight from the frame; response_model only documents the shape
+	return JSONResponse(body, headers=validator_headers(etag))
+
+
+def _parse_window(from_beat: Optional[float], to_beat: Optional[float], from_sec: Optional[float], to_sec: Optional[float]):
+	"""("beat"|"sec", lo, hi) for a windowed request, None for the full timeline."""
+	beats = from_beat is not None or to_beat is not None
+	secs = from_sec is not None or to_sec is not None
+	if beats and secs:
+		raise HTTPException(status_code=422, detail="Use either fromBeat/toBeat or fromSec/toSec, not both")
+	if not beats and not secs:
+		return None
+	unit, lo, hi = ("beat", from_beat, to_beat) if beats else ("sec", from_sec, to_sec)
+	if lo is not None and hi is not None and hi <= lo:
+		raise HTTPException(status_code=422, detail="Window end must be greater than its start")
+	return unit, lo, hi
 
 
 @router.get("/{song_id}/timeline/debug", response_model=TimelineDebugResponse)
 async def get_song_timeline_debug(song_id: int = Path(..., ge=1), session: AsyncSession = Depends(get_session)):
-	result = await session.execute(select(models.Song).where(models.Song.id == song_id))
+	result = await session.execute(select(models.SongORM).where(models.SongORM.id == song_id))
 	song = result.scalar_one_or_none()
 	if not song:
 		raise HTTPException(status_code=404, detail="Song not found")
-	analyzed = analyze_from_content(song.title, song.artist, song.content or "")
-	timeline, warnings, validation = to_timeline({**analyzed, "id": song.id})
-	# lastBeat = max lyric or chord atBeat
-	last_beat = 0.0
-	if timeline.chords:
-		last_beat = max(last_beat, max(ch.atBeat for ch in timeline.chords))
-	if timeline.lyrics:
-		last_beat = max(last_beat, max(l.atBeat for l in timeline.lyrics))
+	timeline, warnings, validation = await analysis_for(session, song, timeline=True)
 	sample = {
-		"chords": [c.dict() for c in timeline.chords[:5]],
-		"lyrics": [l.dict() for l in timeline.lyrics[:5]],
-		"sections": [s.dict() for s in timeline.sections[:3]],
+		"chords": [timeline.chord_dict(i) for i in range(min(5, timeline.n_chords))],
+		"lyrics": [timeline.lyric_dict(i) for i in range(min(5, timeline.n_lyrics))],
+		"sections": [dict(s) for s in timeline.sections[:3]],
 	}
 	return {
 		"songId": song.id,
-		"counts": {"chords": len(timeline.chords), "lyrics": len(timeline.lyrics), "sections": len(timeline.sections)},
-		"lastBeat": round(last_beat, 4),
+		"counts": {"chords": timeline.n_chords, "lyrics": timeline.n_lyrics, "sections": len(timeline.sections)},
+		"lastBeat": round(timeline.last_beat(), 4),  # max lyric or chord atBeat
 		"sample": sample,
 		"warnings": warnings,
 		"validation": validation,
@@ -14,6 +14,8 @@ class SongIn(BaseModel):
     artist: Optional[str] = ""
     content: str
     sections: Optional[List[SectionIn]] = None
+    # Import digest from /import/multi (JCRD songs); otherwise derived from content
+    content_sha256: Optional[str] = None
 
 class SongOut(BaseModel):
     id: int
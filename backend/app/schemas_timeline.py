@@ -61,6 +61,7 @@ class TimelineWarning(BaseModel):
 class TimelineResponse(BaseModel):
     timeline: SongTimeline
     warnings: List[TimelineWarning]
+    window: Optional[dict] = None  # {fromBeat, toBeat} when the request was windowed
 
 
 class TimelineDebugResponse(BaseModel):
@@ -3,13 +3,17 @@ from __future__ import annotations
 from typing import Any, Dict, List, Tuple
 import re
 
-from ..utils.timeline import seconds_to_beats, beats_to_bars, quantize_beats, align_chords_to_grid
+from ..utils.chords import is_chord_token
+from ..utils.timeline import beats_to_bars, quantize_beats, align_chords_to_grid
+from ..utils.tempo_map import TempoMap, _parse_sig
 
 
 def analyze_songdoc(jcrd_like: Dict[str, Any]) -> Dict[str, Any]:
     meta = jcrd_like.get("metadata") or {}
     bpm = float(meta.get("tempo") or meta.get("bpm") or jcrd_like.get("bpm") or 120.0)
     time_sig = str(meta.get("time_signature") or jcrd_like.get("timeSignature") or "4/4")
+    # Beats here count the tempo's own beat; multi-mark maps come from tempoMap/timeSigMap
+    tm = TempoMap.from_doc(jcrd_like, bpm=bpm, time_sig=_parse_sig(time_sig), quarter_beats=False)
 
     # Collect chords from chord_progression or sections
     chords: List[Dict[str, Any]] = []
@@ -38,7 +42,7 @@ def analyze_songdoc(jcrd_like: Dict[str, Any]) -> Dict[str, Any]:
         if "startBeat" in c:
             chords_q_in.append({"symbol": c.get("symbol"), "startBeat": c.get("startBeat")})
         else:
-            chords_q_in.append({"symbol": c.get("symbol"), "start_sec": c.get("start_sec")})
+            chords_q_in.append({"symbol": c.get("symbol"), "startBeat": tm.sec_to_beats(float(c.get("start_sec") or 0.0))})
     chords_q = align_chords_to_grid(chords_q_in, bpm=bpm, time_sig=time_sig, grid="1/4")
     chords_q = [{"symbol": c.get("symbol"), "startBeat": c.get("startBeat")} for c in chords_q]
 
@@ -77,7 +81,7 @@ def analyze_songdoc(jcrd_like: Dict[str, Any]) -> Dict[str, Any]:
         # Find the start beat of the first non-silence section
         for sec in input_sections:
             if isinstance(sec, dict) and sec.get("name") != "silence":
-                first_musical_section_start_beat = seconds_to_beats(float(sec.get("start_time", 0.0)), bpm)
+                first_musical_section_start_beat = tm.sec_to_beats(float(sec.get("start_time", 0.0)))
                 break
 
         for sec in input_sections:
@@ -86,8 +90,8 @@ def analyze_songdoc(jcrd_like: Dict[str, Any]) -> Dict[str, Any]:
             end_time = float(sec.get("end_time", 0.0))
             sections.append({
                 "name": sec.get("name", "section"),
-                "startBeat": seconds_to_beats(start_time, bpm) - first_musical_section_start_beat,
-                "lengthBeats": seconds_to_beats(end_time - start_time, bpm),
+                "startBeat": tm.sec_to_beats(start_time) - first_musical_section_start_beat,
+                "lengthBeats": tm.span_beats(start_time, end_time - start_time),
                 "color": "#5B8DEF",  # TODO: color map for section names
             })
     elif chords_q:
@@ -128,6 +132,9 @@ def analyze_songdoc(jcrd_like: Dict[str, Any]) -> Dict[str, Any]:
         "chords": chords_q,
         "lyrics": lyrics,
     }
+    if not tm.is_constant:
+        doc["tempoMap"] = tm.tempo_rows()
+        doc["timeSigMap"] = tm.meter_rows()
     return {**doc, "issues": issues}
 
 
@@ -152,8 +159,6 @@ def analyze_from_content(title: str, artist: str, content: str, *, bpm: float =
     beats_per_bar = 4 if time_sig.startswith("4/") else 3
     beat_stride = beats_per_bar  # place each chord on new bar by default
     next_start_beat = 0.0
-    # Chord token matcher (e.g., C, F#m7, Bbmaj7/G)
-    chord_re = re.compile(r"^(?:N|[A-G](?:#|b)?(?:(?:maj|min|m|dim|aug|sus(?:2|4)?|add\d+|M7|maj7|m7|dim7|\+|°)?\d*(?:sus\d+)?)?(?:/[A-G](?:#|b)?)?)$")
 
     def parse_chord_line(s: str) -> List[str]:
         # Remove barlines and extra punctuation used for grids
@@ -163,13 +168,13 @@ def analyze_from_content(title: str, artist: str, content: str, *, bpm: float =
             return []
         parts = [p for p in s_clean.split(" ") if p]
         # Consider it a chord line if all tokens look like chords and at least 1-2 tokens exist
-        chord_like = [p for p in parts if chord_re.match(p)]
+        chord_like = [p for p in parts if is_chord_token(p)]
         if chord_like and len(chord_like) == len(parts):
             return chord_like
         # Fallback to double-space heuristic (legacy No Reply-style)
         if "  " in s and not s.startswith("["):
             parts2 = [p for p in s.split("  ") if p.strip()]
-            chord_like2 = [p.strip() for p in parts2 if chord_re.match(p.strip())]
+            chord_like2 = [p.strip() for p in parts2 if is_chord_token(p.strip())]
             if chord_like2 and len(chord_like2) == len(parts2):
                 return chord_like2
         return []
@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .analysis import analyze_from_content
+from ..mappers.timeline import to_frame
+from ..mappers.timeline_frame import TimelineFrame
+from ..schemas_timeline import TimelineWarning
+
+TimelineResult = Tuple[TimelineFrame, List[TimelineWarning], List[TimelineWarning]]
+
+
+def content_key(title: Optional[str], artist: Optional[str], content: Optional[str]) -> str:
+    """Digest of everything analyze_from_content reads from a song row."""
+    h = hashlib.sha256()
+    for part in (title or "", artist or "", content or ""):
+        h.update(part.encode("utf-8", errors="replace"))
+        h.update(b"\x00")
+    return h.hexdigest()
+
+
+class _Entry:
+    __slots__ = ("analyzed", "timeline")
+
+    def __init__(self, analyzed: Dict[str, Any]):
+        self.analyzed = analyzed
+        self.timeline: Optional[TimelineResult] = None
+
+
+class AnalysisCache:
+    """Bounded LRU of analyzed docs and mapped timelines keyed by (song id, content digest).
+
+    A changed row gets a new digest, so stale entries are never served. invalidate() on
+    write frees the old entry right away instead of waiting for LRU eviction.
+    Cached values are shared between requests and must be treated as read-only.
+    """
+
+    def __init__(self, maxsize: int = 256):
+        self.maxsize = max(0, int(maxsize))
+        self._entries: "OrderedDict[Tuple[int, str], _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _lookup(self, key: Tuple[int, str]) -> Optional[_Entry]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def _store(self, key: Tuple[int, str], entry: _Entry) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            # Older versions of the same song can never be hit again
+            for old in [k for k in self._entries if k[0] == key[0] and k != key]:
+                del self._entries[old]
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def _entry_for(self, song: Any) -> Tuple[_Entry, bool]:
+        key = (int(song.id), content_key(song.title, song.artist, song.content))
+        entry = self._lookup(key)
+        if entry is not None:
+            return entry, True
+        entry = _Entry(analyze_from_content(song.title, song.artist, song.content or ""))
+        self._store(key, entry)
+        return entry, False
+
+    def peek(self, song: Any, *, timeline: bool = False) -> bool:
+        """True when a request for this song version would be served from memory (not counted)."""
+        key = (int(song.id), content_key(song.title, song.artist, song.content))
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and (not timeline or entry.timeline is not None)
+
+    def put(self, song: Any, analyzed: Dict[str, Any], timeline: Optional[TimelineResult] = None) -> None:
+        """Seed an entry computed elsewhere (e.g. loaded from the materialized table)."""
+        entry = _Entry(analyzed)
+        entry.timeline = timeline
+        self._store((int(song.id), content_key(song.title, song.artist, song.content)), entry)
+
+    def analyzed(self, song: Any) -> Dict[str, Any]:
+        entry, hit = self._entry_for(song)
+        self._count(hit)
+        return entry.analyzed
+
+    def timeline(self, song: Any) -> TimelineResult:
+        entry, hit = self._entry_for(song)
+        if entry.timeline is None:
+            hit = False
+            entry.timeline = to_frame({**entry.analyzed, "id": song.id})
+        self._count(hit)
+        return entry.timeline
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def invalidate(self, song_id: int) -> int:
+        """Drop every cached version of a song; returns how many entries were removed."""
+        with self._lock:
+            stale = [k for k in self._entries if k[0] == int(song_id)]
+            for k in stale:
+                del self._entries[k]
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
+
+
+analysis_cache = AnalysisCache(settings.ANALYSIS_CACHE_SIZE)
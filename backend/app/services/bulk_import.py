@@ -0,0 +1,131 @@
+"""Persist normalized import results (POST /import/multi?persist=true).
+
+Songs are written in chunks of settings.IMPORT_PERSIST_CHUNK: one multi-row INSERT
+... RETURNING for the songs, one for their materialized timelines (analysis runs on
+the import pool while the previous chunk is being written), and one commit per chunk. A chunk that fails
+(e.g. a content digest stored meanwhile by a concurrent import) is rolled back and
+retried one song per transaction, so only the offending songs are left out and the
+caller learns exactly which songs were saved.
+"""
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import settings
+from . import import_pool
+from ..utils.content_hash import content_sha256
+from .materialize import compute, row_values
+from .song_hashes import existing_hashes, is_digest_conflict
+
+DEFAULT_USER_ID = 1
+
+
+def _analyze(title: str, artist: str, content: str) -> Dict[str, Any]:
+    # Module-level with plain arguments so it pickles into worker processes
+    song = SimpleNamespace(id=None, title=title, artist=artist, content=content)
+    return row_values(song, *compute(song))
+
+
+async def _insert_songs(session: AsyncSession, values: List[Dict[str, Any]]) -> List[int]:
+    Song = models.SongORM
+    keys = [(v["title"], v["artist"]) for v in values]
+    if len(set(keys)) == len(keys):
+        # Deduplicated imports: match ids back by (title, artist), which keeps the INSERT
+        # batched on backends that cannot order RETURNING rows (SQLite)
+        result = await session.execute(insert(Song).returning(Song.id, Song.title, Song.artist), values)
+        by_key = {(title, artist): song_id for song_id, title, artist in result.all()}
+        return [by_key[k] for k in keys]
+    result = await session.execute(insert(Song).returning(Song.id, sort_by_parameter_order=True), values)
+    return list(result.scalars().all())
+
+
+async def _write(session: AsyncSession, values: List[Dict[str, Any]], rows: List[Dict[str, Any]]) -> List[int]:
+    new_ids = await _insert_songs(session, values)
+    await session.execute(
+        insert(models.MaterializedTimeline),
+        [{"song_id": song_id, **row} for song_id, row in zip(new_ids, rows)],
+    )
+    await session.commit()
+    return new_ids
+
+
+async def _write_each(
+    session: AsyncSession, values: List[Dict[str, Any]], rows: List[Dict[str, Any]], offset: int
+) -> Tuple[List[Optional[int]], List[Dict[str, Any]]]:
+    """Fallback for a failed chunk: one transaction per song."""
+    ids: List[Optional[int]] = []
+    failed: List[Dict[str, Any]] = []
+    for k, (value, row) in enumerate(zip(values, rows)):
+        try:
+            ids.extend(await _write(session, [value], [row]))
+        except SQLAlchemyError as exc:
+            await session.rollback()
+            digest = value["content_sha256"]
+            owner = None
+            if isinstance(exc, IntegrityError) and is_digest_conflict(exc) and digest:
+                owner = (await existing_hashes(session, [digest])).get(digest)
+            ids.append(None)
+            failed.append({
+                "index": offset + k,
+                "title": value["title"],
+                "error": "duplicate content" if owner is not None else str(getattr(exc, "orig", exc)),
+                "song_id": owner,
+            })
+    return ids, failed
+
+
+async def persist_songs(
+    session: AsyncSession, songs: List[Dict[str, Any]], *, chunk_size: int = 0
+) -> Tuple[List[Optional[int]], List[Dict[str, Any]]]:
+    """Insert `songs` (title/artist/content dicts) with their materialized rows. Each
+    chunk is its own transaction.
+
+    Returns (ids, failed): ids[i] is the new id of songs[i], or None when it could not be
+    saved; failed has one {"index", "title", "error", "song_id"} entry per such song
+    (song_id is the existing song for a content-digest conflict).
+    """
+    size = max(1, int(chunk_size or settings.IMPORT_PERSIST_CHUNK))
+    chunks = [songs[i:i + size] for i in range(0, len(songs), size)]
+    ids: List[Optional[int]] = []
+    failed: List[Dict[str, Any]] = []
+
+    def analyze_all(chunk: List[Dict[str, Any]]) -> "asyncio.Future[List[Dict[str, Any]]]":
+        return asyncio.gather(*(
+            import_pool.run(_analyze, s.get("title") or "Untitled", s.get("artist") or "", s.get("content") or "")
+            for s in chunk
+        ))
+
+    upcoming = analyze_all(chunks[0]) if chunks else None
+    try:
+        for n, chunk in enumerate(chunks):
+            rows = await upcoming  # type: ignore[misc]
+            upcoming = analyze_all(chunks[n + 1]) if n + 1 < len(chunks) else None
+            values = [
+                {
+                    "user_id": DEFAULT_USER_ID,
+                    "title": s.get("title") or "Untitled",
+                    "artist": s.get("artist") or "",
+                    "content": s.get("content") or "",
+                    "content_sha256": s.get("content_sha256") or content_sha256(s.get("content")),
+                }
+                for s in chunk
+            ]
+            try:
+                ids.extend(await _write(session, values, rows))
+            except SQLAlchemyError:
+                await session.rollback()
+                chunk_ids, chunk_failed = await _write_each(session, values, rows, n * size)
+                ids.extend(chunk_ids)
+                failed.extend(chunk_failed)
+    except BaseException:
+        if upcoming is not None:
+            upcoming.cancel()
+        raise
+    return ids, failed
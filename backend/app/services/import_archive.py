@@ -0,0 +1,270 @@
+"""Album import from one zip or tar(.gz) upload for POST /import/archive.
+
+Members are read one at a time straight from the (spooled) archive, never extracted
+to disk, and grouped by basename so a JCRD chord file and a lyrics file of the same
+song (``07_Michelle.jcrd.json`` + ``07_Michelle.lrc``) are merged into one song.
+Parsing runs on the import pool while the next members are read; one result line is
+yielded per song unit as it finishes.
+"""
+from __future__ import annotations
+
+import asyncio
+import io
+import posixpath
+import tarfile
+import zipfile
+from dataclasses import dataclass, field
+from typing import IO, Any, AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from ..config import settings
+from ..importers import import_json_file, import_midi_file, import_mp3_file
+from ..legacy.ingest.lyrics import parse_lyrics_file
+from ..utils.align import merge_jcrd_with_lyrics
+from . import import_pool
+
+LYRIC_EXTS = (".lrc", ".txt", ".vtt", ".csv")
+_KNOWN_EXTS = (".json", ".jcrd") + LYRIC_EXTS + (".mid", ".midi", ".mp3")
+
+
+def member_key(name: str) -> Tuple[str, str]:
+    """(basename without known extensions, kind) for an archive member path."""
+    base = posixpath.basename(name.replace("\\", "/"))
+    low = base.lower()
+    kind = "other"
+    if low.endswith(".json"):
+        kind = "json"
+    elif low.endswith(LYRIC_EXTS):
+        kind = "lyrics"
+    elif low.endswith((".mid", ".midi")):
+        kind = "midi"
+    elif low.endswith(".mp3"):
+        kind = "mp3"
+    stem = True
+    while stem:
+        stem = False
+        for ext in _KNOWN_EXTS:
+            if low.endswith(ext) and len(low) > len(ext):
+                low = low[: -len(ext)]
+                stem = True
+    return low, kind
+
+
+@dataclass
+class Unit:
+    """Members imported together: one main member and an optional lyrics mate."""
+
+    index: int
+    name: str
+    kind: str
+    lyrics: Optional[str] = None
+    data: Dict[str, bytes] = field(default_factory=dict)
+
+
+def plan(names: List[str]) -> List[Unit]:
+    """Group members into units in archive order. A JSON file claims the first unclaimed
+    lyrics file with its basename; everything else stands alone."""
+    lyric_by_key: Dict[str, List[str]] = {}
+    for name in names:
+        key, kind = member_key(name)
+        if kind == "lyrics":
+            lyric_by_key.setdefault(key, []).append(name)
+    mates: Dict[str, str] = {}
+    for name in names:
+        key, kind = member_key(name)
+        if kind == "json" and lyric_by_key.get(key):
+            mates[name] = lyric_by_key[key].pop(0)
+    claimed = set(mates.values())
+    units: List[Unit] = []
+    for name in names:
+        if name not in claimed:
+            units.append(Unit(len(units), name, member_key(name)[1], lyrics=mates.get(name)))
+    return units
+
+
+class Archive:
+    """Read-only view over a zip or tar(.gz/.bz2/.xz) file object."""
+
+    def __init__(self, fp: IO[bytes]) -> None:
+        self._zip: Optional[zipfile.ZipFile] = None
+        self._tar: Optional[tarfile.TarFile] = None
+        if zipfile.is_zipfile(fp):
+            fp.seek(0)
+            self._zip = zipfile.ZipFile(fp)
+            self._members = {i.filename: i for i in self._zip.infolist() if not i.is_dir()}
+        else:
+            fp.seek(0)
+            try:
+                self._tar = tarfile.open(fileobj=fp, mode="r:*")
+            except tarfile.TarError as e:
+                raise ValueError(f"not a zip or tar archive: {e}") from None
+            self._members = {m.name: m for m in self._tar.getmembers() if m.isfile()}
+
+    def names(self) -> List[str]:
+        return list(self._members)
+
+    def size(self, name: str) -> int:
+        m = self._members[name]
+        return m.file_size if self._zip is not None else m.size
+
+    def read(self, name: str) -> bytes:
+        limit = int(settings.UPLOAD_MAX_FILE_BYTES)
+        if self.size(name) > limit:
+            raise ValueError(f"member exceeds the {limit} byte upload limit")
+        if self._zip is not None:
+            f = self._zip.open(self._members[name])
+        else:
+            f = self._tar.extractfile(self._members[name])  # type: ignore[union-attr]
+        if f is None:
+            return b""
+        with f:
+            # Headers can understate sizes; never read past the limit
+            data = f.read(limit + 1)
+        if len(data) > limit:
+            raise ValueError(f"member exceeds the {limit} byte upload limit")
+        return data
+
+    def close(self) -> None:
+        if self._zip is not None:
+            self._zip.close()
+        if self._tar is not None:
+            self._tar.close()
+
+
+# -- pool steps (module level so they pickle) ------------------------------------------------
+
+def paired_song(data: bytes, lyric_data: bytes, lyric_name: str, fallback_title: str) -> Optional[Dict[str, str]]:
+    """JCRD merged with its lyrics file, or None when `data` is not JCRD."""
+    obj = import_pool.load_jcrd(data)
+    if obj is None:
+        return None
+    lines = [{"ts_sec": l.ts, "text": l.text} for l in parse_lyrics_file(io.BytesIO(lyric_data), lyric_name)]
+    meta = obj.get("metadata") or {}
+    title = str(meta.get("title") or obj.get("title") or fallback_title).strip()
+    artist = str(meta.get("artist") or obj.get("artist") or "").strip()
+    content = merge_jcrd_with_lyrics(obj, lines).get("content", "")
+    return {"title": title or "Untitled", "artist": artist, "content": content}
+
+
+def lyric_song(data: bytes, name: str) -> Dict[str, str]:
+    title = posixpath.basename(name).rsplit(".", 1)[0]
+    return {"title": title, "artist": "", "content": import_pool.lyric_file_content(io.BytesIO(data), name)}
+
+
+# -- driver ----------------------------------------------------------------------------------
+
+async def _run_unit(unit: Unit) -> Dict[str, Any]:
+    line: Dict[str, Any] = {"index": unit.index, "member": unit.name, "songs": [], "errors": []}
+    if unit.lyrics:
+        line["lyrics"] = unit.lyrics
+    data = unit.data.get(unit.name, b"")
+    base = posixpath.basename(unit.name)
+    try:
+        if unit.kind == "json":
+            song = None
+            if unit.lyrics:
+                song = await import_pool.run(paired_song, data, unit.data[unit.lyrics], unit.lyrics, member_key(unit.name)[0])
+            if song is not None:
+                line["songs"].append(song)
+            else:
+                songs, warnings = await import_pool.run(import_json_file, base, data)
+                line["songs"].extend(songs)
+                line["errors"].extend(warnings)
+                if unit.lyrics:
+                    # Not JCRD after all: the lyrics file is its own song
+                    line["songs"].append(await import_pool.run(lyric_song, unit.data[unit.lyrics], unit.lyrics))
+        elif unit.kind == "lyrics":
+            line["songs"].append(await import_pool.run(lyric_song, data, unit.name))
+        elif unit.kind == "midi":
+            songs, warnings = await import_pool.run(import_midi_file, base, data)
+            line["songs"].extend(songs)
+            line["errors"].extend(warnings)
+        elif unit.kind == "mp3":
+            songs, warnings = await import_pool.run(import_mp3_file, base, data)
+            line["songs"].extend(songs)
+            line["errors"].extend(warnings)
+        else:
+            line["skipped"] = True
+    except Exception as e:  # noqa: BLE001 - report per member, keep going
+        line["errors"].append(f"{unit.name}: {e}")
+    unit.data.clear()
+    return line
+
+
+def _iter_reads(archive: Archive, units: List[Unit]) -> Iterator[Tuple[Unit, Optional[str]]]:
+    for unit in units:
+        if unit.kind == "other":
+            yield unit, None
+            continue
+        try:
+            for name in filter(None, (unit.name, unit.lyrics)):
+                unit.data[name] = archive.read(name)
+            yield unit, None
+        except Exception as e:  # noqa: BLE001
+            yield unit, f"{unit.name}: {e}"
+
+
+async def stream_archive(fp: IO[bytes]) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one result line per unit (completion order) and a final summary line.
+
+    Members are read sequentially on a thread (archive readers are not thread-safe);
+    at most settings.IMPORT_CONCURRENCY units are parsed at once, so memory holds a
+    bounded number of members regardless of album size.
+    """
+    try:
+        archive = await import_pool.run_io(Archive, fp)
+    except Exception as e:  # noqa: BLE001 - corrupt or unknown archive
+
+        yield {"done": True, "ok": False, "error": str(e)}
+        fp.close()
+        return
+    counts = {"members": 0, "units": 0, "songs": 0, "errors": 0}
+    gate = asyncio.Semaphore(max(1, int(settings.IMPORT_CONCURRENCY)))
+    done: asyncio.Queue = asyncio.Queue()
+    pending = 0
+
+    async def work(unit: Unit) -> None:
+        try:
+            await done.put(await _run_unit(unit))
+        finally:
+            gate.release()
+
+    tasks = []
+    try:
+        names = archive.names()
+        counts["members"] = len(names)
+        units = plan(names)
+        counts["units"] = len(units)
+        reads = _iter_reads(archive, units)
+        sentinel = object()
+        while True:
+            await gate.acquire()
+            item = await import_pool.run_io(next, reads, sentinel)
+            if item is sentinel:
+                gate.release()
+                break
+            unit, error = item
+            if error is not None:
+                gate.release()
+                pending += 1
+                await done.put({"index": unit.index, "member": unit.name, "songs": [], "errors": [error]})
+            else:
+                pending += 1
+                tasks.append(asyncio.ensure_future(work(unit)))
+            while not done.empty():
+                line = done.get_nowait()
+                pending -= 1
+                counts["songs"] += len(line["songs"])
+                counts["errors"] += len(line["errors"])
+                yield line
+        while pending:
+            line = await done.get()
+            pending -= 1
+            counts["songs"] += len(line["songs"])
+            counts["errors"] += len(line["errors"])
+            yield line
+    finally:
+        for task in tasks:
+            task.cancel()
+        archive.close()
+        fp.close()
+    yield {"done": True, "ok": True, "counts": counts}
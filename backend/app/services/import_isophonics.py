@@ -1,5 +1,6 @@
 from typing import Dict, Any, List, Optional
 from ..models.song import Song, SongMetadata, Section, Lane, ChordItem, LyricItem
+from ..utils.chords import normalize_symbol
 import uuid
 
 def from_isophonics(data: Dict[str, Any]) -> Song:
@@ -66,7 +67,7 @@ def from_isophonics(data: Dict[str, Any]) -> Song:
             chord_items.append({
                 "id": str(uuid.uuid4()),
                 "beat": float(chord_data.get("beat", 0)),
-                "symbol": chord_data.get("chord", "C"),
+                "symbol": _chord_symbol(chord_data.get("chord", "C")),
                 "duration": float(chord_data.get("duration", 4))
             })
 
@@ -105,6 +106,10 @@ def from_isophonics(data: Dict[str, Any]) -> Song:
         lanes=lanes
     )
 
+def _chord_symbol(raw: Any) -> str:
+    """Canonical lead-sheet spelling of an Isophonics/Harte chord label (C:min7 -> Cm7)"""
+    return normalize_symbol(str(raw)) or str(raw)
+
 def _get_section_color(index: int) -> str:
     """Get a color for a section based on its index"""
     colors = [
@@ -0,0 +1,72 @@
+"""Worker pool and per-file steps for POST /import/multi.
+
+Files are handled concurrently (bounded by settings.IMPORT_CONCURRENCY); the CPU-bound
+steps below run on a process pool so parsing one file overlaps with lyric lookups and
+parsing of the others. Every step is a module-level function over plain data so it
+pickles into worker processes. Steps that read an upload's spooled file (MIDI, MP3,
+lyric files) go through run_io() on a thread instead, since file objects do not pickle.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import IO, Any, Callable, Dict, List, Optional
+
+from ..config import settings
+from ..importers import _looks_like_jcrd
+from ..legacy.ingest.lyrics import parse_lyrics_file
+from ..parser import parse_songs
+from ..utils.align import chords_only_text, merge_jcrd_with_lyrics
+
+_executor: Optional[Executor] = None
+
+
+def executor() -> Executor:
+    """Pool shared by import requests (created on first use)."""
+    global _executor
+    if _executor is None:
+        workers = int(settings.IMPORT_WORKERS)
+        _executor = ProcessPoolExecutor(workers) if workers > 0 else ThreadPoolExecutor(4)
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+async def run(fn: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.get_running_loop().run_in_executor(executor(), fn, *args)
+
+
+async def run_io(fn: Callable[..., Any], *args: Any) -> Any:
+    return await asyncio.to_thread(fn, *args)
+
+
+def load_jcrd(data: bytes) -> Optional[Dict[str, Any]]:
+    """The decoded object when `data` is JCRD JSON, else None."""
+    try:
+        obj = json.loads(data.decode("utf-8", errors="replace"))
+    except Exception:
+        return None
+    return obj if isinstance(obj, dict) and _looks_like_jcrd(obj) else None
+
+
+def merged_content(obj: Dict[str, Any], lines: List[Dict[str, Any]]) -> str:
+    return merge_jcrd_with_lyrics(obj, lines).get("content", "")
+
+
+def chords_only_content(obj: Dict[str, Any]) -> str:
+    return chords_only_text(obj).get("content", "")
+
+
+def lyric_file_content(fp: IO[bytes], name: str) -> str:
+    # Lyric files become one pseudo-song of their plain lines
+    return "\n".join([l.text for l in parse_lyrics_file(fp, name)])
+
+
+def text_songs(data: bytes) -> List[Dict[str, str]]:
+    return parse_songs(data.decode("utf-8", errors="replace"))
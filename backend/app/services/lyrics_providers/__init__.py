@@ -0,0 +1,76 @@
+"""Lyrics lookup used by the import and combine paths.
+
+search_timestamped_lyrics() asks LRCLIB (lrclib.py, cached and coalesced), whose
+synced lines give merged songs their timestamps. The offline corpus index (local.py)
+has untimed lines only; it answers first only when settings.LYRICS_LOCAL_FIRST is set
+(off by default) and otherwise serves as a fallback. Both tiers return the same shape.
+
+A LatencyBudget passed by the caller is shared by all of its lookups: each LRCLIB call
+gets at most the time left in it. When the budget is spent, the LRCLIB circuit breaker
+is open or the call times out with the budget spent, the lookup degrades instead of
+waiting or raising: a cached LRCLIB answer, then the offline corpus, else an unmatched
+result (callers fall back to chords only). Such results carry "fallback": <reason>.
+"""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import Any, Dict, Optional
+
+import httpx
+
+from ...config import settings
+from . import local, lrclib
+from .resilience import CircuitOpenError, LatencyBudget
+
+__all__ = ["LatencyBudget", "search_timestamped_lyrics", "stats"]
+
+_fallbacks: Counter = Counter()
+
+
+async def _fallback(title: str, artist: str, album: Optional[str], duration_sec: Optional[int], reason: str) -> Dict[str, Any]:
+    _fallbacks[reason] += 1
+    found = await lrclib.cached(title, artist, album=album, duration_sec=duration_sec)
+    if found is None or not found.get("matched"):
+        found = local.get_index().search(title, artist)
+    if not found.get("matched"):
+        found = {"source": "none", "matched": False, "synced": False, "lines": []}
+    return {**found, "fallback": reason}
+
+
+async def search_timestamped_lyrics(
+    title: str,
+    artist: str,
+    *,
+    album: Optional[str] = None,
+    duration_sec: Optional[int] = None,
+    timeout: float = 8.0,
+    budget: Optional[LatencyBudget] = None,
+) -> Dict[str, Any]:
+    if settings.LYRICS_LOCAL_FIRST:
+        found = local.get_index().search(title, artist)
+        if found["matched"]:
+            return found
+    if budget is not None:
+        timeout = budget.clamp(timeout)
+        if timeout <= 0:
+            return await _fallback(title, artist, album, duration_sec, "budget_exhausted")
+    try:
+        # wait_for also bounds callers joining a lookup another request started
+        return await asyncio.wait_for(
+            lrclib.search_timestamped_lyrics(
+                title=title, artist=artist, album=album, duration_sec=duration_sec, timeout=timeout
+            ),
+            timeout,
+        )
+    except CircuitOpenError:
+        return await _fallback(title, artist, album, duration_sec, "breaker_open")
+    except (asyncio.TimeoutError, httpx.TimeoutException):
+        if budget is None or budget.remaining() > 0:
+            raise
+        return await _fallback(title, artist, album, duration_sec, "budget_exhausted")
+
+
+def stats() -> Dict[str, Any]:
+    """Cache counters, LRCLIB breaker state and degraded lookups by reason."""
+    return {"cache": lrclib.cache_stats(), "breaker": lrclib.breaker.stats(), "fallbacks": dict(_fallbacks)}
@@ -0,0 +1,171 @@
+"""Two-tier cache for lyric lookups: a bounded in-process LRU in front of a SQLite file.
+
+The memory tier holds at most `maxsize` results and evicts the least recently used;
+the disk tier survives restarts and is shared by every worker process on the node
+(SQLite in WAL mode, one short connection per call). Misses (matched=False) expire
+after `negative_ttl`, found lyrics after `ttl`, in both tiers.
+Cached values are shared between requests and must be treated as read-only.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from ...config import settings
+
+# Expired disk rows are pruned every this many writes
+_PRUNE_EVERY = 256
+
+
+class LyricsCache:
+    def __init__(self, maxsize: int = 2048, ttl: float = 7 * 86400, negative_ttl: float = 3600, path: Optional[str] = None):
+        self.maxsize = max(0, int(maxsize))
+        self.ttl = float(ttl)
+        self.negative_ttl = float(negative_ttl)
+        self.path = path or None
+        self._entries: "OrderedDict[str, tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._schema_ready = False
+        self._writes = 0
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.disk_errors = 0
+
+    def _fresh(self, stored_at: float, data: Dict[str, Any], now: float) -> bool:
+        ttl = self.ttl if data.get("matched") else self.negative_ttl
+        return now - stored_at < ttl
+
+    # -- memory tier -----------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Memory-tier lookup (counted); None on a miss or an expired entry."""
+        now = time.time()
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None and not self._fresh(item[0], item[1], now):
+                del self._entries[key]
+                self.expirations += 1
+                item = None
+            if item is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return item[1]
+
+    def _remember(self, key: str, stored_at: float, data: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (stored_at, data)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    # -- disk tier (blocking; call from a thread) ------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=5)  # type: ignore[arg-type]
+        if not self._schema_ready:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS lyrics_cache ("
+                "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, matched INTEGER NOT NULL, data TEXT NOT NULL)"
+            )
+            conn.commit()
+            self._schema_ready = True
+        return conn
+
+    def load(self, key: str) -> Optional[Dict[str, Any]]:
+        """Disk-tier lookup; a fresh row is promoted into memory."""
+        if not self.path:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute("SELECT stored_at, data FROM lyrics_cache WHERE key = ?", (key,)).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            with self._lock:
+                self.disk_errors += 1
+            return None
+        data = json.loads(row[1]) if row is not None else None
+        if data is None or not self._fresh(row[0], data, time.time()):
+            with self._lock:
+                self.disk_misses += 1
+            return None
+        with self._lock:
+            self.disk_hits += 1
+        self._remember(key, row[0], data)
+        return data
+
+    def put(self, key: str, data: Dict[str, Any]) -> None:
+        """Store in memory and on disk."""
+        now = time.time()
+        self._remember(key, now, data)
+        if not self.path:
+            return
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO lyrics_cache (key, stored_at, matched, data) VALUES (?, ?, ?, ?)",
+                    (key, now, 1 if data.get("matched") else 0, json.dumps(data)),
+                )
+                with self._lock:
+                    self._writes += 1
+                    prune = self._writes % _PRUNE_EVERY == 0
+                if prune:
+                    conn.execute(
+                        "DELETE FROM lyrics_cache WHERE (matched = 1 AND stored_at < ?) OR (matched = 0 AND stored_at < ?)",
+                        (now - self.ttl, now - self.negative_ttl),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            with self._lock:
+                self.disk_errors += 1
+
+    def clear(self) -> None:
+        """Empty the memory tier and reset counters (the disk tier is kept)."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.disk_hits = self.disk_misses = 0
+            self.evictions = self.expirations = self.disk_errors = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "disk_hits": self.disk_hits,
+                "disk_misses": self.disk_misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "disk_errors": self.disk_errors,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "disk": bool(self.path),
+            }
+
+
+def from_settings() -> LyricsCache:
+    return LyricsCache(
+        maxsize=settings.LYRICS_CACHE_SIZE,
+        ttl=settings.LYRICS_CACHE_TTL,
+        negative_ttl=settings.LYRICS_CACHE_NEGATIVE_TTL,
+        path=settings.LYRICS_CACHE_PATH,
+    )
@@ -0,0 +1,167 @@
+"""Offline lyrics from a directory of plain-text files (`<dir>/<Album>/<Song_Title>.txt`).
+
+The directory is indexed once: each file's title is reduced to a compact key
+(`12 - You_Can't_Do_That` and `You_Cant_Do_That.txt` both become "youcantdothat") and
+its character trigrams go into an inverted index, so near misses such as typos or
+punctuation differences are still found. Lookups are in-memory and never touch the
+network; results have the same shape as lrclib.search_timestamped_lyrics() with
+source "local" and unsynced lines.
+"""
+from __future__ import annotations
+
+import os
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from ...config import settings
+
+_TRACK_PREFIX = re.compile(r"^\s*\d+\s*[-_.]+\s*")
+_DROP = re.compile(r"['’`.]")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+_DIGITS = re.compile(r"\d+")
+
+
+def title_key(title: str) -> str:
+    """Compact matching key: track number, punctuation, spacing and case removed."""
+    s = _TRACK_PREFIX.sub("", title or "")
+    return _NON_ALNUM.sub("", _DROP.sub("", s.replace("&", "and").lower()))
+
+
+def _artist_key(artist: str) -> str:
+    key = _NON_ALNUM.sub("", (artist or "").lower())
+    return key[3:] if key.startswith("the") else key
+
+
+def _trigrams(key: str) -> List[str]:
+    padded = f"$${key}$"
+    return [padded[i:i + 3] for i in range(len(padded) - 2)]
+
+
+@dataclass(frozen=True)
+class _Entry:
+    key: str
+    title: str
+    album: str
+    path: str
+    lines: tuple
+
+
+class LocalLyricsIndex:
+    """Title index over a lyrics directory; `artist` (optional) is the corpus' artist."""
+
+    def __init__(self, root: str, artist: str = "", min_score: float = 0.75) -> None:
+        self.root = root
+        self.artist = artist
+        self.min_score = float(min_score)
+        self._entries: List[_Entry] = []
+        self._by_key: Dict[str, int] = {}
+        self._grams: Dict[str, List[int]] = {}
+        self._sizes: List[int] = []  # distinct trigrams per entry
+        if root and os.path.isdir(root):
+            self._build(root)
+
+    def _build(self, root: str) -> None:
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for name in sorted(filenames):
+                if not name.lower().endswith(".txt"):
+                    continue
+                path = os.path.join(dirpath, name)
+                title = name[:-4].replace("_", " ")
+                key = title_key(title)
+                if not key or key in self._by_key:
+                    continue
+                with open(path, encoding="utf-8", errors="replace") as fh:
+                    lines = tuple(line.strip() for line in fh if line.strip())
+                album = os.path.relpath(dirpath, root)
+                self._by_key[key] = len(self._entries)
+                grams = set(_trigrams(key))
+                for gram in grams:
+                    self._grams.setdefault(gram, []).append(len(self._entries))
+                self._sizes.append(len(grams))
+                self._entries.append(_Entry(key, title, "" if album == "." else album, path, lines))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def find(self, title: str, artist: str = "") -> Optional[tuple]:
+        """(entry, score) for the best match of `title`, or None below min_score."""
+        if self.artist and artist and _artist_key(artist) != _artist_key(self.artist):
+            return None
+        key = title_key(title)
+        if not key:
+            return None
+        exact = self._by_key.get(key)
+        if exact is not None:
+            return self._entries[exact], 1.0
+        grams = set(_trigrams(key))
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._grams.get(gram, ()))
+        digits = _DIGITS.findall(key)
+        best = None
+        for idx, n in shared.most_common():
+            entry = self._entries[idx]
+            # Numbers tell songs apart ("Revolution 1" vs "Revolution 9")
+            if _DIGITS.findall(entry.key) != digits:
+                continue
+            score = 2.0 * n / (len(grams) + self._sizes[idx])
+            if best is None or score > best[1]:
+                best = (entry, score)
+        if best is None or best[1] < self.min_score:
+            return None
+        return best
+
+    def search(self, title: str, artist: str = "") -> Dict[str, Any]:
+        found = self.find(title, artist)
+        if found is None:
+            return {"source": "local", "matched": False, "synced": False, "lines": []}
+        entry, score = found
+        return {
+            "source": "local",
+            "matched": True,
+            "synced": False,
+            "lines": [{"ts_sec": None, "text": line} for line in entry.lines],
+            "title": entry.title,
+            "album": entry.album,
+            "score": round(score, 3),
+        }
+
+    async def search_timestamped_lyrics(
+        self,
+        title: str,
+        artist: str,
+        *,
+        album: Optional[str] = None,
+        duration_sec: Optional[int] = None,
+        timeout: float = 8.0,
+        **_: Any,
+    ) -> Dict[str, Any]:
+        """Drop-in for lrclib.search_timestamped_lyrics (e.g. as a test stand-in)."""
+        return self.search(title, artist)
+
+
+_index: Optional[LocalLyricsIndex] = None
+_lock = threading.Lock()
+
+
+def get_index() -> LocalLyricsIndex:
+    """Index of settings.LYRICS_LOCAL_DIR, built on first use (the app warms it at startup)."""
+    global _index
+    if _index is None:
+        with _lock:
+            if _index is None:
+                _index = LocalLyricsIndex(
+                    settings.LYRICS_LOCAL_DIR,
+                    artist=settings.LYRICS_LOCAL_ARTIST,
+                    min_score=settings.LYRICS_LOCAL_MIN_SCORE,
+                )
+    return _index
+
+
+def reset() -> None:
+    global _index
+    _index = None
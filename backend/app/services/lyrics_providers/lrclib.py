@@ -1,15 +1,74 @@
+"""LRCLIB lookups for timestamped lyrics.
+
+All lookups share one pooled httpx.AsyncClient (keep-alive, HTTP/2 when the optional
+`h2` package is installed) created on first use and closed by the app's shutdown hook
+via aclose(). The endpoint is settings.LYRICS_LRCLIB_URL, so a local stand-in
+(bench/lrclib_standin.py) can replace the real service; tests swap the network for a
+transport with configure(transport=...).
+
+Upstream calls go through a circuit breaker (resilience.py): transport errors, 5xx/429
+answers and timeouts count as failures, and while it is open _fetch raises
+CircuitOpenError without touching the network. `timeout` bounds the whole call.
+"""
 from __future__ import annotations
 
+import asyncio
+import functools
+import importlib.util
 import re
-import time
 from typing import List, Dict, Optional
 import httpx
 
-LRCLIB_URL = "https://lrclib.net/api/get"
+from ...config import settings
+from .cache import LyricsCache, from_settings as cache_from_settings
+from .resilience import CircuitBreaker
+
+# Memory LRU + shared SQLite tier (settings.LYRICS_CACHE_*); see cache.py
+_cache: LyricsCache = cache_from_settings()
+breaker: CircuitBreaker = CircuitBreaker.from_settings()
+
+_client: Optional[httpx.AsyncClient] = None
+_client_loop: Optional[asyncio.AbstractEventLoop] = None
+_transport: Optional[httpx.AsyncBaseTransport] = None
+# Lookups in flight by _mk_cache_key, awaited by every concurrent caller of that key
+_inflight: dict[str, "asyncio.Task[Dict]"] = {}
+
+
+def _new_client() -> httpx.AsyncClient:
+    limits = httpx.Limits(
+        max_connections=int(settings.LYRICS_HTTP_MAX_CONNECTIONS),
+        max_keepalive_connections=int(settings.LYRICS_HTTP_MAX_KEEPALIVE),
+        keepalive_expiry=float(settings.LYRICS_HTTP_KEEPALIVE_EXPIRY),
+    )
+    http2 = bool(settings.LYRICS_HTTP2) and importlib.util.find_spec("h2") is not None
+    return httpx.AsyncClient(limits=limits, http2=http2, transport=_transport, timeout=8.0)
+
 
-# super-light cache (dev convenience)
-_cache: dict[str, tuple[float, dict]] = {}
-_CACHE_TTL = 60 * 10  # 10 min
+def get_client() -> httpx.AsyncClient:
+    """The shared client, created on first use in the running event loop."""
+    global _client, _client_loop
+    loop = asyncio.get_running_loop()
+    if _client is None or _client.is_closed or _client_loop is not loop:
+        # Pooled connections belong to one loop; a new loop (tests, reloads) gets a new client
+        _client = _new_client()
+        _client_loop = loop
+    return _client
+
+
+def configure(transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+    """Route lookups through `transport` (None restores the network); the client is rebuilt on next use."""
+    global _client, _transport
+    _transport = transport
+    _client = None
+
+
+async def aclose() -> None:
+    """Close the shared client (app shutdown)."""
+    global _client
+    if _client is not None:
+        client, _client = _client, None
+        if _client_loop is asyncio.get_running_loop():
+            await client.aclose()
 
 
 def _mk_cache_key(title: str, artist: str, album: Optional[str], duration_sec: Optional[int]) -> str:
@@ -23,6 +82,7 @@ async def search_timestamped_lyrics(
     album: Optional[str] = None,
     duration_sec: Optional[int] = None,
     timeout: float = 8.0,
+    client: Optional[httpx.AsyncClient] = None,
 ) -> Dict:
     """
     Returns:
@@ -33,11 +93,44 @@ async def search_timestamped_lyrics(
         "lines": [{"ts_sec": float|None, "text": str}, ...],
         # "raw": {...raw lrclib doc...}
       }
+
+    Concurrent calls for the same key share one upstream request (the first caller's
+    timeout applies); its error is raised in every waiter and nothing is cached.
     """
     key = _mk_cache_key(title, artist, album, duration_sec)
-    now = time.time()
-    if key in _cache and (now - _cache[key][0]) < _CACHE_TTL:
-        return _cache[key][1]
+    cached = _cache.get(key)
+    if cached is not None:
+        return cached
+
+    task = _inflight.get(key)
+    if task is None or task.get_loop() is not asyncio.get_running_loop():
+        task = asyncio.ensure_future(_fetch(key, title, artist, album, duration_sec, timeout, client))
+        _inflight[key] = task
+        task.add_done_callback(functools.partial(_settle, key))
+    # shield: one waiter giving up must not cancel the lookup the others are awaiting
+    return await asyncio.shield(task)
+
+
+def _settle(key: str, task: "asyncio.Task[Dict]") -> None:
+    if _inflight.get(key) is task:
+        del _inflight[key]
+    if not task.cancelled():
+        task.exception()  # retrieved here, so a failure nobody awaited is not logged
+
+
+async def _fetch(
+    key: str,
+    title: str,
+    artist: str,
+    album: Optional[str],
+    duration_sec: Optional[int],
+    timeout: float,
+    client: Optional[httpx.AsyncClient],
+) -> Dict:
+    if _cache.path:
+        cached = await asyncio.to_thread(_cache.load, key)
+        if cached is not None:
+            return cached
 
     params: dict[str, str] = {
         "track_name": title,
@@ -48,14 +141,26 @@ async def search_timestamped_lyrics(
     if duration_sec:
         params["duration"] = str(duration_sec)
 
-    async with httpx.AsyncClient(timeout=timeout) as client:
-        r = await client.get(LRCLIB_URL, params=params)
-        if r.status_code == 404:
-            data = {"source": "lrclib", "matched": False, "synced": False, "lines": []}
-            _cache[key] = (now, data)
-            return data
-        r.raise_for_status()
-        doc = r.json()
+    breaker.check()
+    try:
+        # httpx timeouts are per phase; wait_for caps the call as a whole
+        r = await asyncio.wait_for(
+            (client or get_client()).get(settings.LYRICS_LRCLIB_URL, params=params, timeout=timeout), timeout
+        )
+    except Exception:
+        breaker.record(False)
+        raise
+    except BaseException:
+        # Cancelled (shutdown, loop teardown): says nothing about the upstream
+        breaker.release()
+        raise
+    breaker.record(r.status_code < 500 and r.status_code != 429)
+    if r.status_code == 404:
+        data = {"source": "lrclib", "matched": False, "synced": False, "lines": []}
+        await _store(key, data)
+        return data
+    r.raise_for_status()
+    doc = r.json()
 
     # LRCLIB fields typically include: "syncedLyrics", "plainLyrics"
     synced = bool(doc.get("syncedLyrics"))
@@ -77,10 +182,32 @@ async def search_timestamped_lyrics(
         # keep raw optional, comment in if needed
         # "raw": doc,
     }
-    _cache[key] = (now, data)
+    await _store(key, data)
     return data
 
 
+async def _store(key: str, data: Dict) -> None:
+    if _cache.path:
+        await asyncio.to_thread(_cache.put, key, data)
+    else:
+        _cache.put(key, data)
+
+
+async def cached(
+    title: str, artist: str, *, album: Optional[str] = None, duration_sec: Optional[int] = None
+) -> Optional[Dict]:
+    """The cached result for this lookup (memory, then disk tier), never going upstream."""
+    key = _mk_cache_key(title, artist, album, duration_sec)
+    hit = _cache.get(key)
+    if hit is None and _cache.path:
+        hit = await asyncio.to_thread(_cache.load, key)
+    return hit
+
+
+def cache_stats() -> Dict:
+    return {**_cache.stats(), "in_flight": len(_inflight)}
+
+
 _TS = re.compile(r"\[(\d{1,2}):(\d{2})(?:\.(\d{1,3}))?\]")
 
 
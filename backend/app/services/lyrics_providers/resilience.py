@@ -0,0 +1,148 @@
+"""Failure isolation for upstream lyric lookups: a circuit breaker and a latency budget.
+
+CircuitBreaker keeps the outcomes of the last `window` seconds of upstream calls. Once
+at least `min_calls` were made and the failing share reaches `failure_ratio`, it opens:
+calls are refused (CircuitOpenError) for `open_seconds`, then one probe call is let
+through (half-open) and its outcome closes or re-opens the breaker.
+
+LatencyBudget is a deadline shared by every lookup of one request (e.g. all JCRD files
+of an import), so a slow upstream costs that request at most the budget in total.
+"""
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+from ...config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """The upstream is considered down; the call was not attempted."""
+
+
+class CircuitBreaker:
+    def __init__(self, window: float = 30.0, min_calls: int = 5, failure_ratio: float = 0.5, open_seconds: float = 30.0):
+        self.window = float(window)
+        self.min_calls = max(1, int(min_calls))
+        self.failure_ratio = float(failure_ratio)
+        self.open_seconds = float(open_seconds)
+        self.state = CLOSED
+        self._calls: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+        self.opened = 0
+        self.rejected = 0
+        self.successes = 0
+        self.failures = 0
+
+    def _trim(self, now: float) -> None:
+        while self._calls and now - self._calls[0][0] > self.window:
+            self._calls.popleft()
+
+    def allow(self) -> bool:
+        """True when a call may go upstream now (counts a rejection otherwise)."""
+        now = time.monotonic()
+        with self._lock:
+            if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+                self.state = HALF_OPEN
+                self._probing = False
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def check(self) -> None:
+        if not self.allow():
+            raise CircuitOpenError("lyrics provider circuit is open")
+
+    def record(self, ok: bool) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if ok:
+                self.successes += 1
+            else:
+                self.failures += 1
+            if self.state == HALF_OPEN:
+                self._probing = False
+                if ok:
+                    self.state = CLOSED
+                    self._calls.clear()
+                else:
+                    self._open(now)
+                return
+            if self.state == OPEN:
+                return  # a call that was in flight when the breaker opened
+            self._calls.append((now, ok))
+            self._trim(now)
+            failed = sum(1 for _, good in self._calls if not good)
+            if self.state == CLOSED and len(self._calls) >= self.min_calls and failed / len(self._calls) >= self.failure_ratio:
+                self._open(now)
+
+    def release(self) -> None:
+        """A call allowed through ended without an outcome (cancelled): free the probe slot."""
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probing = False
+
+    def _open(self, now: float) -> None:
+        self.state = OPEN
+        self._opened_at = now
+        self._calls.clear()
+        self.opened += 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self._calls.clear()
+            self._probing = False
+            self.opened = self.rejected = self.successes = self.failures = 0
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        with self._lock:
+            self._trim(now)
+            failed = sum(1 for _, good in self._calls if not good)
+            return {
+                "state": self.state,
+                "window_calls": len(self._calls),
+                "window_failure_ratio": round(failed / len(self._calls), 4) if self._calls else 0.0,
+                "opened": self.opened,
+                "rejected": self.rejected,
+                "successes": self.successes,
+                "failures": self.failures,
+                "retry_in_s": round(max(0.0, self._opened_at + self.open_seconds - now), 2) if self.state == OPEN else 0.0,
+            }
+
+    @classmethod
+    def from_settings(cls) -> "CircuitBreaker":
+        return cls(
+            window=settings.LYRICS_BREAKER_WINDOW_S,
+            min_calls=settings.LYRICS_BREAKER_MIN_CALLS,
+            failure_ratio=settings.LYRICS_BREAKER_FAILURE_RATIO,
+            open_seconds=settings.LYRICS_BREAKER_OPEN_S,
+        )
+
+
+class LatencyBudget:
+    """Deadline `seconds` from now, shared by every lookup that is handed this object."""
+
+    def __init__(self, seconds: float) -> None:
+        self.seconds = float(seconds)
+        self.deadline = time.monotonic() + self.seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.deadline - time.monotonic())
+
+    def clamp(self, timeout: Optional[float]) -> float:
+        remaining = self.remaining()
+        return remaining if timeout is None else min(float(timeout), remaining)
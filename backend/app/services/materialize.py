@@ -0,0 +1,164 @@
+"""Write-time materialization of the analyzed doc + SongTimeline (table song_timelines).
+
+Writers call materialize_song() before committing a new/updated song; readers use
+analysis_for(), which serves (in order) the in-memory LRU, a fresh stored row, or a
+recomputation. A row is fresh when its version matches MATERIALIZE_VERSION and its
+content_hash matches the song, so bumping the version (or editing a song outside the
+API) makes readers fall back to recomputing until the backfill catches up:
+
+    python -m app.services.materialize --batch-size 200 [--force]
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..mappers.timeline import to_frame
+from ..mappers.timeline_frame import TimelineFrame
+from ..schemas_timeline import TimelineWarning
+from ..utils.etag import strong_etag
+from .analysis import analyze_from_content
+from .analysis_cache import TimelineResult, analysis_cache, content_key
+
+# Bump when analysis/timeline output changes shape or values; older rows become stale
+MATERIALIZE_VERSION = 1
+
+
+def compute(song: Any) -> Tuple[Dict[str, Any], TimelineResult]:
+    analyzed = analyze_from_content(song.title, song.artist, song.content or "")
+    return analyzed, to_frame({**analyzed, "id": song.id})
+
+
+def song_etag(song: Any, kind: str) -> str:
+    """Strong ETag for a song's `kind` ("doc"/"timeline") representation; no analysis needed."""
+    return strong_etag(kind, MATERIALIZE_VERSION, song.id, content_key(song.title, song.artist, song.content))
+
+
+def _is_fresh(row: Any, song: Any) -> bool:
+    return (
+        row is not None
+        and row.version == MATERIALIZE_VERSION
+        and row.content_hash == content_key(song.title, song.artist, song.content)
+    )
+
+
+def row_values(song: Any, analyzed: Dict[str, Any], result: TimelineResult) -> Dict[str, Any]:
+    """Column values of the materialized row (less song_id) for `song`."""
+    timeline, warnings, validation = result
+    return {
+        "version": MATERIALIZE_VERSION,
+        "content_hash": content_key(song.title, song.artist, song.content),
+        "analyzed_json": json.dumps(analyzed),
+        "timeline_json": json.dumps(timeline.to_dict()),
+        "warnings_json": json.dumps([w.model_dump() for w in warnings]),
+        "validation_json": json.dumps([v.model_dump() for v in validation]),
+    }
+
+
+def _fill_row(row: Any, song: Any, analyzed: Dict[str, Any], result: TimelineResult) -> None:
+    for key, value in row_values(song, analyzed, result).items():
+        setattr(row, key, value)
+
+
+def _decode_row(row: Any) -> Tuple[Dict[str, Any], TimelineResult]:
+    analyzed = json.loads(row.analyzed_json)
+    timeline = TimelineFrame.from_dict(json.loads(row.timeline_json))
+    warnings = [TimelineWarning(**w) for w in json.loads(row.warnings_json or "[]")]
+    validation = [TimelineWarning(**v) for v in json.loads(row.validation_json or "[]")]
+    return analyzed, (timeline, warnings, validation)
+
+
+async def materialize_song(session: AsyncSession, song: Any) -> None:
+    """Compute and stage the materialized row for `song`; the caller commits.
+
+    The process cache is left alone: callers invalidate it after a successful commit,
+    and the next read seeds it from the stored row via analysis_for().
+    """
+    if song.id is None:
+        await session.flush()  # new song: need its primary key
+    analyzed, result = compute(song)
+    row = await session.get(models.MaterializedTimeline, song.id)
+    if row is None:
+        row = models.MaterializedTimeline(song_id=song.id)
+        session.add(row)
+    _fill_row(row, song, analyzed, result)
+
+
+async def drop_materialized(session: AsyncSession, song_id: int) -> None:
+    """Stage deletion of the stored row (for backends without ON DELETE CASCADE)."""
+    await session.execute(delete(models.MaterializedTimeline).where(models.MaterializedTimeline.song_id == song_id))
+
+
+async def load_materialized(session: AsyncSession, song: Any) -> Optional[Tuple[Dict[str, Any], TimelineResult]]:
+    """Stored analysis for `song` if the row exists and is fresh, else None."""
+    row = await session.get(models.MaterializedTimeline, song.id)
+    if not _is_fresh(row, song):
+        return None
+    return _decode_row(row)
+
+
+async def analysis_for(session: AsyncSession, song: Any, *, timeline: bool = False) -> Any:
+    """Analyzed doc (or (timeline, warnings, validation) when timeline=True) for a song row."""
+    if not analysis_cache.peek(song, timeline=timeline):
+        stored = await load_materialized(session, song)
+        if stored is not None:
+            analysis_cache.put(song, *stored)
+    return analysis_cache.timeline(song) if timeline else analysis_cache.analyzed(song)
+
+
+async def backfill(session: AsyncSession, *, batch_size: int = 200, force: bool = False) -> Dict[str, int]:
+    """Materialize every song whose row is missing or stale, committing once per batch."""
+    counts = {"scanned": 0, "written": 0, "skipped": 0}
+    last_id = 0
+    Song = models.SongORM
+    while True:
+        rs = await session.execute(select(Song).where(Song.id > last_id).order_by(Song.id).limit(batch_size))
+        songs: List[Any] = list(rs.scalars().all())
+        if not songs:
+            break
+        ids = [s.id for s in songs]
+        existing = await session.execute(
+            select(models.MaterializedTimeline).where(models.MaterializedTimeline.song_id.in_(ids))
+        )
+        rows = {r.song_id: r for r in existing.scalars().all()}
+        written: List[int] = []
+        for song in songs:
+            row = rows.get(song.id)
+            if not force and _is_fresh(row, song):
+                continue
+            if row is None:
+                row = models.MaterializedTimeline(song_id=song.id)
+                session.add(row)
+            _fill_row(row, song, *compute(song))
+            written.append(song.id)
+        counts["scanned"] += len(songs)
+        counts["written"] += len(written)
+        counts["skipped"] += len(songs) - len(written)
+        await session.commit()
+        for song_id in written:
+            analysis_cache.invalidate(song_id)
+        session.expunge_all()  # keep the identity map at one batch
+        last_id = ids[-1]
+    return counts
+
+
+async def _main(batch_size: int, force: bool) -> None:
+    from ..database import SessionLocal
+
+    async with SessionLocal() as session:
+        counts = await backfill(session, batch_size=batch_size, force=force)
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Backfill materialized song timelines")
+    ap.add_argument("--batch-size", type=int, default=200)
+    ap.add_argument("--force", action="store_true", help="rewrite fresh rows too")
+    args = ap.parse_args()
+    asyncio.run(_main(args.batch_size, args.force))
@@ -0,0 +1,39 @@
+"""Bulk lookup of songs.content_sha256 so importers can skip songs that already exist.
+
+The column is unique, so a write can still collide with a song stored after the
+pre-check (concurrent imports) or with an edit that reproduces another song's content;
+writers catch IntegrityError and use digest_owner() to report the existing song.
+"""
+from __future__ import annotations
+
+from typing import Dict, Iterable, Optional
+
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+
+
+async def existing_hashes(session: AsyncSession, hashes: Iterable[str]) -> Dict[str, int]:
+    """{digest: song id} for the digests already stored, in one WHERE ... IN query."""
+    wanted = sorted({h for h in hashes if h})
+    if not wanted:
+        return {}
+    Song = models.SongORM
+    result = await session.execute(select(Song.content_sha256, Song.id).where(Song.content_sha256.in_(wanted)))
+    return {digest: song_id for digest, song_id in result.all()}
+
+
+def is_digest_conflict(exc: IntegrityError) -> bool:
+    """True when `exc` is the songs.content_sha256 unique index rejecting a write."""
+    return "content_sha256" in str(getattr(exc, "orig", exc))
+
+
+async def digest_owner(session: AsyncSession, exc: IntegrityError, digest: Optional[str]) -> Optional[int]:
+    """After a failed flush/commit: roll back and return the id of the song holding
+    `digest`, or None when `exc` is some other integrity error (re-raise it then)."""
+    if not digest or not is_digest_conflict(exc):
+        return None
+    await session.rollback()
+    return (await existing_hashes(session, [digest])).get(digest)
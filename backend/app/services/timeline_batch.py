@@ -0,0 +1,109 @@
+"""Batch timeline computation for POST /v1/songs/timelines.
+
+Songs are loaded with one IN (...) query together with their materialized rows; fresh
+rows and process-cache entries are served directly, the rest are analyzed on a worker
+pool and yielded as each one finishes (completion order, not request order).
+"""
+from __future__ import annotations
+
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from .. import models
+from ..config import settings
+from .analysis_cache import TimelineResult, analysis_cache
+from .materialize import _decode_row, _is_fresh, compute
+
+# Validation codes that make GET /v1/songs/{id}/timeline answer 422
+FATAL_CODES = {"chords.empty", "bpm.missing", "timesig.missing"}
+
+_executor: Optional[Executor] = None
+
+
+def executor() -> Executor:
+    """Process pool shared by batch requests (created on first use)."""
+    global _executor
+    if _executor is None:
+        workers = int(settings.TIMELINE_WORKERS)
+        _executor = ProcessPoolExecutor(workers) if workers > 0 else ThreadPoolExecutor(4)
+    return _executor
+
+
+def shutdown() -> None:
+    global _executor
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+        _executor = None
+
+
+def _compute_plain(song_id: int, title: str, artist: str, content: str) -> Tuple[Dict[str, Any], TimelineResult]:
+    # Module-level with plain arguments so it pickles into worker processes
+    return compute(SimpleNamespace(id=song_id, title=title, artist=artist, content=content))
+
+
+def result_line(song_id: int, result: TimelineResult) -> Dict[str, Any]:
+    timeline, warnings, validation = result
+    line: Dict[str, Any] = {
+        "id": song_id,
+        "timeline": timeline.to_dict(),
+        "warnings": [w.model_dump() for w in warnings],
+    }
+    if any(v.code in FATAL_CODES for v in validation):
+        line["error"] = {"status": 422, "message": "Timeline invalid", "validation": [v.model_dump() for v in validation]}
+    return line
+
+
+async def load_batch(session: AsyncSession, ids: Iterable[int]) -> Tuple[List[Any], Dict[int, TimelineResult]]:
+    """Songs for `ids` (one query) and the stored timelines that are still fresh (one query)."""
+    wanted = list(dict.fromkeys(int(i) for i in ids))
+    Song = models.SongORM
+    rs = await session.execute(select(Song).where(Song.id.in_(wanted)))
+    songs = list(rs.scalars().all())
+    rows = await session.execute(
+        select(models.MaterializedTimeline).where(models.MaterializedTimeline.song_id.in_([s.id for s in songs]))
+    )
+    by_id = {r.song_id: r for r in rows.scalars().all()}
+    stored: Dict[int, TimelineResult] = {}
+    for song in songs:
+        row = by_id.get(song.id)
+        if _is_fresh(row, song):
+            stored[song.id] = _decode_row(row)[1]
+    return songs, stored
+
+
+async def stream_timelines(ids: List[int], songs: List[Any], stored: Dict[int, TimelineResult]) -> AsyncIterator[Dict[str, Any]]:
+    """Yield one result line per requested id; misses are computed concurrently on the pool."""
+    found = {s.id: s for s in songs}
+    for song_id in dict.fromkeys(ids):
+        if song_id not in found:
+            yield {"id": song_id, "error": {"status": 404, "message": "Song not found"}}
+    loop = asyncio.get_running_loop()
+
+    async def run(song: Any) -> Tuple[Any, Dict[str, Any], TimelineResult]:
+        analyzed, result = await loop.run_in_executor(
+            executor(), _compute_plain, song.id, song.title, song.artist, song.content or ""
+        )
+        return song, analyzed, result
+
+    tasks = []
+    for song in found.values():
+        if song.id in stored:
+            yield result_line(song.id, stored[song.id])
+        elif analysis_cache.peek(song, timeline=True):
+            yield result_line(song.id, analysis_cache.timeline(song))
+        else:
+            tasks.append(asyncio.ensure_future(run(song)))
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            song, analyzed, result = await next_done
+            analysis_cache.put(song, analyzed, result)
+            yield result_line(song.id, result)
+    finally:
+        # Client went away: drop work that has not started yet
+        for task in tasks:
+            task.cancel()
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 import re
 
-from .tempo import _parse_time_signature, _qbpm_from_tempo_and_ts, _sec_to_qbeats, _quarter_beats_per_bar, _format_pos
+from .tempo import (
+    _parse_time_signature,
+    _qbpm_from_tempo_and_ts,
+    _sec_to_qbeats,
+    _quarter_beats_per_bar,
+    _use_arrays,
+    _round_array,
+    _tempo_map_for,
+    _map_metadata,
+    np,
+)
+from .tempo_map import TempoMap
+from .segments import SegmentIndex
 
 
 def _make_group_grid_line(group_start: int, num_beats: int, bars_in_group: int, beat_cells: int = 3) -> str:
@@ -106,11 +118,43 @@ def _snap_beat_one_decimal(beat_in_bar: float, num: int) -> float:
     # one decimal place
     return round(v05, 1)
 
+def _snap_beat_array(beat_in_bar: "np.ndarray", num: "np.ndarray | int") -> "np.ndarray":
+    """Array form of _snap_beat_one_decimal (num may be per-element).
+    Values are halves after the first rounding, so only whole beats take the near-integer snap.
+    """
+    v = np.maximum(1.0, np.minimum(beat_in_bar, np.asarray(num, dtype=float)))
+    v05 = np.rint(v * 2.0) / 2.0
+    return np.where((np.asarray(num) == 4) & (v05 == 3.0), 4.0, v05)
+
+
+def _positions(
+    times: List[float], tm: TempoMap, qoffset: float
+) -> Tuple[List[float], List[int], List[float]]:
+    """Offset-adjusted qbeats (3 dp), bar and snapped beat_in_bar for each time in seconds."""
+    if _use_arrays(len(times)):
+        q = np.fmax(0.0, tm.sec_to_beats_array(times) - qoffset)
+        bars, beats, nums = tm.position_array(q, origin=qoffset)
+        snapped = _snap_beat_array(_round_array(beats, 3), nums)
+        return _round_array(q, 3).tolist(), bars.tolist(), snapped.tolist()
+    qs: List[float] = []
+    bars_out: List[int] = []
+    beats_out: List[float] = []
+    for t in times:
+        q_adj = max(0.0, tm.sec_to_beats(t) - qoffset)
+        bar, beat_in_bar, num = tm.position(q_adj, origin=qoffset)
+        qs.append(round(q_adj, 3))
+        bars_out.append(bar)
+        beats_out.append(_snap_beat_one_decimal(round(beat_in_bar, 3), num))
+    return qs, bars_out, beats_out
+
+
 def _detect_qoffset_for_downbeat(
     segs: List[Dict[str, Any]],
     lyrics_lines: List[Dict[str, Any]],
     qbpm: float,
     qpb: float,
+    *,
+    tempo_map: Optional[TempoMap] = None,
 ) -> float:
     """Estimate a qbeats offset so that bar 1 starts at the first musical event.
     Heuristic:
@@ -136,11 +180,13 @@ def _detect_qoffset_for_downbeat(
     # If very near zero, don't offset
     if t0 <= 0.25:
         return 0.0
-    start_q = _sec_to_qbeats(t0, qbpm)
+    if tempo_map is not None:
+        rem, qpb = tempo_map.bar_remainder(tempo_map.sec_to_beats(t0))
+    else:
+        rem = _sec_to_qbeats(t0, qbpm) % qpb if qpb > 0 else 0.0
     # Compute beat-in-bar for t0
     if qpb <= 0:
         return 0.0
-    rem = start_q % qpb
     beat_in_bar = (rem % qpb) + 1.0
     # If already close to downbeat, skip
     if abs(beat_in_bar - 1.0) <= 0.3:
@@ -162,42 +208,49 @@ def merge_jcrd_with_lyrics(
     num, den = _parse_time_signature(str(time_sig) if time_sig else None)
     qbpm = _qbpm_from_tempo_and_ts(tempo, den)
     qpb = _quarter_beats_per_bar(num, den)
+    tm = _tempo_map_for(jcrd, tempo, num, den)
 
     segs = _collect_chord_segments(jcrd)
-    last_end = max([s["end_sec"] for s in segs], default=0.0)
+    index = SegmentIndex(segs)
+    last_end = index.max_end
 
     qoffset = 0.0
     if bar_start != "zero":
-        qoffset = _detect_qoffset_for_downbeat(segs, lyrics_lines, qbpm, qpb)
+        qoffset = _detect_qoffset_for_downbeat(segs, lyrics_lines, qbpm, qpb, tempo_map=tm)
 
     def find_chord(ts: float) -> Optional[str]:
-        # Binary search could be used; linear is fine for dev scale
-        for s in segs:
-            if s["start_sec"] <= ts < s["end_sec"]:
-                return s.get("chord")
-        # if after last segment, take last chord
-        if segs and ts >= segs[-1]["start_sec"]:
-            return segs[-1].get("chord")
-        return None
+        return index.chord_at(ts)
 
-    combined_lines: List[Dict[str, Any]] = []
-    # Precompute next lyric times
+    # Every chord start is positioned once up front; lines then just pick their rows
+    _, seg_bars, seg_beats = _positions([s["start_sec"] for s in segs], tm, qoffset)
+
+    def chord_rows(seg_ids: List[int]) -> List[Dict[str, Any]]:
+        return [
+            {"chord": segs[i].get("chord"), "bar": seg_bars[i], "beat_in_bar": seg_beats[i]}
+            for i in seg_ids
+        ]
+
+    # Lines are collected as (ts, text, chords) and positioned together once all are known.
+    # chords=None means "chord sounding at the line timestamp", which shares the line's position.
+    pending: List[Tuple[Optional[float], str, Optional[List[Dict[str, Any]]]]] = []
+    # Precompute lyric times and, for each line, the next timed lyric (window end)
     lyric_ts: List[Optional[float]] = [
         (float(ln.get("ts_sec")) if isinstance(ln.get("ts_sec"), (int, float)) else None)
         for ln in (lyrics_lines or [])
     ]
+    next_timed: List[Optional[float]] = [None] * len(lyric_ts)
+    upcoming: Optional[float] = None
+    for j in range(len(lyric_ts) - 1, -1, -1):
+        next_timed[j] = upcoming
+        if isinstance(lyric_ts[j], float):
+            upcoming = lyric_ts[j]
     n_lyrics = len(lyrics_lines or [])
     for idx, ln in enumerate(lyrics_lines or []):
         text = str(ln.get("text") or "").strip()
         if not text:
             continue
         tsf = lyric_ts[idx]
-        next_ts = None
-        # find next timed lyric as window end
-        for j in range(idx + 1, len(lyric_ts)):
-            if isinstance(lyric_ts[j], float):
-                next_ts = lyric_ts[j]
-                break
+        next_ts = next_timed[idx]
         # If untimed lyrics, distribute pseudo timestamps across song duration
         pseudo_used = False
         if tsf is None:
@@ -221,53 +274,12 @@ def merge_jcrd_with_lyrics(
         if tsf is not None:
             window_start = tsf
             window_end = float(next_ts) if isinstance(next_ts, float) else last_end
-            # collect chords overlapping window
-            chords_for_line: List[Dict[str, Any]] = []
-            for s in segs:
-                if s["end_sec"] <= window_start or s["start_sec"] >= window_end:
-                    continue
-                q = _sec_to_qbeats(s["start_sec"], qbpm)
-                q_adj = max(0.0, q - qoffset)
-                pos = _format_pos(q_adj, qpb)
-                beat_snapped = _snap_beat_one_decimal(float(pos["beat_in_bar"]), num)
-                chords_for_line.append({
-                    "chord": s.get("chord"),
-                    "bar": pos["bar"],
-                    "beat_in_bar": beat_snapped,
-                })
-            # Also include a chord right at the lyric timestamp if nothing matched
-            if not chords_for_line:
-                q = _sec_to_qbeats(tsf, qbpm)
-                q_adj = max(0.0, q - qoffset)
-                pos = _format_pos(q_adj, qpb)
-                beat_snapped = _snap_beat_one_decimal(float(pos["beat_in_bar"]), num)
-                chords_for_line.append({
-                    "chord": find_chord(tsf),
-                    "bar": pos["bar"],
-                    "beat_in_bar": beat_snapped,
-                })
-            # Lyric position info
-            ql = _sec_to_qbeats(tsf, qbpm)
-            ql_adj = max(0.0, ql - qoffset)
-            posl = _format_pos(ql_adj, qpb)
-            combined_lines.append({
-                "ts_sec": round(tsf, 3),
-                "bar": posl["bar"],
-                "beat_in_bar": _snap_beat_one_decimal(float(posl["beat_in_bar"]), num),
-                "qbeats": round(ql_adj, 3),
-                "text": text,
-                "chords": chords_for_line,
-            })
+            # collect chords overlapping window; if nothing matched, use the chord at the lyric timestamp
+            chords_for_line = chord_rows(index.overlapping_ids(window_start, window_end))
+            pending.append((tsf, text, chords_for_line or None))
         else:
             # should not happen post pseudo placement; keep safe fallback
-            combined_lines.append({
-                "ts_sec": None,
-                "bar": None,
-                "beat_in_bar": None,
-                "qbeats": None,
-                "text": text,
-                "chords": [],
-            })
+            pending.append((None, text, []))
 
     # Insert instrumental lines for music-only segments (no words)
     try:
@@ -290,40 +302,12 @@ def merge_jcrd_with_lyrics(
             if seg_end <= seg_start:
                 return
             # collect overlapping chords
-            chords_for_line: List[Dict[str, Any]] = []
-            for s in segs:
-                if s["end_sec"] <= seg_start or s["start_sec"] >= seg_end:
-                    continue
-                q = _sec_to_qbeats(s["start_sec"], qbpm)
-                q_adj = max(0.0, q - qoffset)
-                pos = _format_pos(q_adj, qpb)
-                beat_snapped = _snap_beat_one_decimal(float(pos["beat_in_bar"]), num)
-                chords_for_line.append({
-                    "chord": s.get("chord"),
-                    "bar": pos["bar"],
-                    "beat_in_bar": beat_snapped,
-                })
-            if not chords_for_line:
+            seg_ids = index.overlapping_ids(seg_start, seg_end)
+            if not seg_ids:
                 return
             # choose line timestamp at first chord inside segment
-            first_chord_time = None
-            for s in segs:
-                if s["end_sec"] <= seg_start or s["start_sec"] >= seg_end:
-                    continue
-                first_chord_time = max(seg_start, s["start_sec"])
-                break
-            tsf = first_chord_time if first_chord_time is not None else seg_start
-            ql = _sec_to_qbeats(tsf, qbpm)
-            ql_adj = max(0.0, ql - qoffset)
-            posl = _format_pos(ql_adj, qpb)
-            combined_lines.append({
-                "ts_sec": round(tsf, 3),
-                "bar": posl["bar"],
-                "beat_in_bar": _snap_beat_one_decimal(float(posl["beat_in_bar"]), num),
-                "qbeats": round(ql_adj, 3),
-                "text": "(instrumental)",
-                "chords": chords_for_line,
-            })
+            tsf = max(seg_start, segs[seg_ids[0]]["start_sec"])
+            pending.append((tsf, "(instrumental)", chord_rows(seg_ids)))
 
         if segs:
             # lead-in before first lyric
@@ -341,6 +325,36 @@ def merge_jcrd_with_lyrics(
     except Exception:
         pass
 
+    # Position all line timestamps in one pass
+    line_q, line_bars, line_beats = _positions(
+        [p[0] for p in pending if p[0] is not None], tm, qoffset
+    )
+    combined_lines: List[Dict[str, Any]] = []
+    k = 0
+    for tsf, text, chords_for_line in pending:
+        if tsf is None:
+            combined_lines.append({
+                "ts_sec": None,
+                "bar": None,
+                "beat_in_bar": None,
+                "qbeats": None,
+                "text": text,
+                "chords": [],
+            })
+            continue
+        bar, beat = line_bars[k], line_beats[k]
+        if chords_for_line is None:
+            chords_for_line = [{"chord": find_chord(tsf), "bar": bar, "beat_in_bar": beat}]
+        combined_lines.append({
+            "ts_sec": round(tsf, 3),
+            "bar": bar,
+            "beat_in_bar": beat,
+            "qbeats": line_q[k],
+            "text": text,
+            "chords": chords_for_line,
+        })
+        k += 1
+
     # Sort combined lines by time/bar for stable output
     try:
         combined_lines.sort(key=lambda cl: (
@@ -394,6 +408,7 @@ def merge_jcrd_with_lyrics(
             "quarter_beats_per_bar": round(qpb, 4),
             "bar_start": bar_start,
             "qoffset": round(qoffset, 4),
+            **_map_metadata(tm),
         },
         "lines": combined_lines,
         "content": "\n".join(content_lines),
@@ -410,29 +425,27 @@ def chords_only_text(jcrd: Dict[str, Any], *, bar_start: str = "auto") -> Dict[s
     num, den = _parse_time_signature(str(time_sig) if time_sig else None)
     qbpm = _qbpm_from_tempo_and_ts(tempo, den)
     qpb = _quarter_beats_per_bar(num, den)
+    tm = _tempo_map_for(jcrd, tempo, num, den)
 
     segs = _collect_chord_segments(jcrd)
     qoffset = 0.0
     if bar_start != "zero":
-        qoffset = _detect_qoffset_for_downbeat(segs, [], qbpm, qpb)
+        qoffset = _detect_qoffset_for_downbeat(segs, [], qbpm, qpb, tempo_map=tm)
     chord_rows: List[Dict[str, Any]] = []
     content_lines: List[str] = []
     # Simple group markers and chord lines (No Reply-style)
     last_group_start: Optional[int] = None
-    for s in segs:
-        q = _sec_to_qbeats(float(s.get("start_sec", 0.0)), qbpm)
-        q_adj = max(0.0, q - qoffset)
-        pos = _format_pos(q_adj, qpb)
-        beat_snapped = _snap_beat_one_decimal(float(pos["beat_in_bar"]), num)
+    _, bars, beats = _positions([float(s.get("start_sec", 0.0)) for s in segs], tm, qoffset)
+    for s, bar, beat_snapped in zip(segs, bars, beats):
         row = {
             "chord": s.get("chord"),
-            "bar": pos["bar"],
+            "bar": bar,
             "beat_in_bar": beat_snapped,
         }
         chord_rows.append(row)
         if s.get("chord"):
             # Group marker
-            b = int(pos["bar"])
+            b = int(bar)
             group_start = ((b - 1) // max(1, num)) * max(1, num) + 1
             if group_start != last_group_start:
                 if last_group_start is not None:
@@ -453,6 +466,7 @@ def chords_only_text(jcrd: Dict[str, Any], *, bar_start: str = "auto") -> Dict[s
             "quarter_beats_per_bar": round(qpb, 4),
             "bar_start": bar_start,
             "qoffset": round(qoffset, 4),
+            **_map_metadata(tm),
         },
         "chords": chord_rows,
         "content": "\n".join(content_lines),
@@ -0,0 +1,180 @@
+"""Chord-symbol parsing shared by analysis, the key-hint router and the importers.
+
+Corpora repeat the same few hundred symbols, so both entry points are memoized:
+parse_chord() interns one immutable ParsedChord per distinct symbol, and
+is_chord_token() caches the strict chord-line check used by content analysis.
+"""
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# Strict token check for chord lines in plain-text content (e.g., C, F#m7, Bbmaj7/G)
+CHORD_TOKEN_RE = re.compile(
+    r"^(?:N|[A-G](?:#|b)?(?:(?:maj|min|m|dim|aug|sus(?:2|4)?|add\d+|M7|maj7|m7|dim7|\+|°)?\d*(?:sus\d+)?)?(?:/[A-G](?:#|b)?)?)$"
+)
+
+# Lenient structural parse: root, free-form suffix, optional slash bass
+_PARSE_RE = re.compile(
+    r"^([A-G])(#|b)?((?:maj|min|mi|m|M|dim|aug|sus|add|alt|o|°|ø|\+|-|#|b|\d|\(|\)|,)*)(?:/([A-G])(#|b)?)?$"
+)
+_QUALITY_RE = re.compile(r"^(maj|min|mi|m(?!aj)|-|dim|°|o|ø|aug|\+)?(.*)$")
+_SUS_RE = re.compile(r"sus([24]?)")
+_EXT_RE = re.compile(r"(?:add|maj|M|b|#)?\d+")
+
+_NATURAL_PC = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+# Harte shorthands ("C:min7") mapped onto lead-sheet suffixes; unknown shorthands pass through
+_HARTE = {
+    "1": "", "5": "5", "maj": "", "min": "m", "dim": "dim", "aug": "aug", "sus2": "sus2", "sus4": "sus4",
+    "maj6": "6", "min6": "m6", "7": "7", "maj7": "maj7", "min7": "m7", "dim7": "dim7", "hdim7": "m7b5",
+    "minmaj7": "mM7", "9": "9", "maj9": "maj9", "min9": "m9", "11": "11", "maj11": "maj11", "min11": "m11",
+    "13": "13", "maj13": "maj13", "min13": "m13",
+}
+_HARTE_RE = re.compile(r"^([^(/]*)(?:\(([^)]*)\))?(?:/(.+))?$")
+_DEGREE_RE = re.compile(r"^([#b]*)(\d+)$")
+_LETTERS = "CDEFGAB"
+_MAJOR_SCALE = (0, 2, 4, 5, 7, 9, 11)
+
+CACHE_SIZE = 4096
+
+
+@dataclass(frozen=True)
+class ParsedChord:
+    """One chord symbol split into its parts. `root` is None for the no-chord symbol N."""
+
+    symbol: str
+    root: Optional[str]
+    root_pc: Optional[int]
+    quality: str
+    extensions: Tuple[str, ...] = ()
+    bass: Optional[str] = None
+    bass_pc: Optional[int] = None
+
+    @property
+    def is_minor(self) -> bool:
+        return self.quality in ("min", "dim")
+
+
+_NO_CHORD = ParsedChord(symbol="N", root=None, root_pc=None, quality="N")
+
+
+def pitch_class(note: str) -> int:
+    """Pitch class 0-11 of a note name such as C, F# or Bb."""
+    pc = _NATURAL_PC[note[0]]
+    for acc in note[1:]:
+        pc += 1 if acc == "#" else -1 if acc == "b" else 0
+    return pc % 12
+
+
+def _interval_note(root: str, interval: str) -> Optional[str]:
+    """Note `interval` (Harte degree such as 5, b3, #4) above `root`, spelled on its scale letter."""
+    m = _DEGREE_RE.match(interval)
+    if not m or int(m.group(2)) < 1:
+        return None
+    step = int(m.group(2)) - 1
+    shift = sum(1 if acc == "#" else -1 for acc in m.group(1))
+    target = (pitch_class(root) + _MAJOR_SCALE[step % 7] + shift) % 12
+    letter = _LETTERS[(_LETTERS.index(root[0]) + step) % 7]
+    accidental = {0: "", 1: "#", 11: "b"}.get((target - _NATURAL_PC[letter]) % 12)
+    if accidental is None:  # double accidentals: fall back to the sharp spelling
+        return ("C", "C#", "D", "D#", "E", "F", "F#", "G", "G#", "A", "A#", "B")[target]
+    return letter + accidental
+
+
+def _from_harte(symbol: str) -> Optional[str]:
+    """Lead-sheet spelling of a Harte label (E:min/b3 -> Em/G, A:7/5 -> A7/E)."""
+    root, _, label = symbol.partition(":")
+    m = _HARTE_RE.match(label)
+    if not m or not root:
+        return None
+    shorthand, degrees, bass = m.groups()
+    degrees = [d.strip() for d in (degrees or "").split(",") if d.strip() and not d.strip().startswith("*")]
+    # A bare degree list ("C:(b3,5)") spells its own triad
+    if not shorthand and "b3" in degrees:
+        shorthand = "min"
+    out = root + _HARTE.get(shorthand, shorthand)
+    # Added natural degrees read as add9 etc.; altered ones stay listed, e.g. sus4(b7)
+    out += "".join("add" + d for d in degrees if d.isdigit() and d not in ("1", "3", "5"))
+    altered = [d for d in degrees if not d.isdigit() and d != "b3"]
+    if altered:
+        out += "(" + ",".join(altered) + ")"
+    if bass:
+        note = bass if bass[:1] in _LETTERS else _interval_note(root, bass) if root[:1] in _LETTERS else None
+        if note is None:
+            return None
+        out += "/" + note
+    return out
+
+
+def _quality(suffix: str) -> Tuple[str, Tuple[str, ...]]:
+    head, rest = _QUALITY_RE.match(suffix).groups()
+    head = head or ""
+    if head in ("m", "mi", "min", "-"):
+        quality = "min"
+    elif head in ("dim", "°", "o", "ø"):
+        quality = "dim"
+        if head == "ø":
+            rest = "7b5" + rest
+    elif head in ("aug", "+"):
+        quality = "aug"
+    else:
+        quality = "maj"
+        if head == "maj":
+            rest = "maj" + rest
+    sus = _SUS_RE.search(rest)
+    if sus is not None:
+        rest = rest[: sus.start()] + rest[sus.end():]
+        if quality == "maj":
+            quality = "sus2" if sus.group(1) == "2" else "sus4"
+    exts = tuple(_EXT_RE.findall(rest))
+    # A bare 7/9/11/13 on a major triad makes it a dominant chord (6 keeps it major)
+    if quality == "maj" and exts and exts[0] in ("7", "9", "11", "13"):
+        quality = "dom"
+    return quality, exts
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def parse_chord(symbol: str) -> Optional[ParsedChord]:
+    """Parse a lead-sheet (F#m7/C#) or Harte (F#:min7/C#) symbol; None if it is not a chord."""
+    s = (symbol or "").strip()
+    if not s:
+        return None
+    if s in ("N", "NC", "N.C.", "N/C"):
+        return _NO_CHORD
+    if ":" in s:
+        s = _from_harte(s)
+        if s is None:
+            return None
+    m = _PARSE_RE.match(s)
+    if not m:
+        return None
+    root = m.group(1) + (m.group(2) or "")
+    quality, exts = _quality(m.group(3))
+    bass = (m.group(4) + (m.group(5) or "")) if m.group(4) else None
+    return ParsedChord(
+        symbol=s,
+        root=root,
+        root_pc=pitch_class(root),
+        quality=quality,
+        extensions=exts,
+        bass=bass,
+        bass_pc=pitch_class(bass) if bass else None,
+    )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def is_chord_token(token: str) -> bool:
+    """True when `token` is a chord in the strict chord-line grammar of analyze_from_content."""
+    return CHORD_TOKEN_RE.match(token) is not None
+
+
+def normalize_symbol(symbol: str) -> Optional[str]:
+    """Canonical lead-sheet spelling for importers (Harte C:min7 -> Cm7); None if not a chord."""
+    parsed = parse_chord(symbol)
+    return parsed.symbol if parsed is not None else None
+
+
+def cache_info() -> dict:
+    return {"parse": parse_chord.cache_info()._asdict(), "token": is_chord_token.cache_info()._asdict()}
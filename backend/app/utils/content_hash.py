@@ -0,0 +1,33 @@
+"""Normalized SHA-256 digests identifying a song's imported content (songs.content_sha256).
+
+Text content is hashed after normalizing what varies between exports of the same song
+(Unicode form, line endings, trailing spaces, surrounding blank lines). Songs built from
+a JCRD chord file are identified by the canonical JSON of that file instead, so a repeat
+import is recognised before lyrics are fetched and merged into the stored content.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import unicodedata
+from typing import Any, Mapping, Optional
+
+
+def normalize_content(text: Optional[str]) -> str:
+    text = unicodedata.normalize("NFC", text or "")
+    lines = [line.rstrip() for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    return "\n".join(lines).strip("\n")
+
+
+def content_sha256(text: Optional[str]) -> Optional[str]:
+    """Digest of normalized song text; None for blank content, which is never deduplicated."""
+    normalized = normalize_content(text)
+    if not normalized.strip():
+        return None
+    return hashlib.sha256(normalized.encode("utf-8", errors="replace")).hexdigest()
+
+
+def jcrd_sha256(obj: Mapping[str, Any]) -> str:
+    """Digest of a JCRD document (key order and whitespace do not matter)."""
+    canonical = json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha256(b"jcrd\x00" + canonical.encode("utf-8", errors="replace")).hexdigest()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response
+
+# Clients may keep a copy but must revalidate it (cheap 304) before reuse
+CACHE_CONTROL = "private, no-cache"
+
+
+def strong_etag(*parts: Any) -> str:
+    """Quoted strong ETag over the given parts (each str()-ed, NUL separated)."""
+    h = hashlib.sha256()
+    for part in parts:
+        h.update(str(part).encode("utf-8", errors="replace"))
+        h.update(b"\x00")
+    return '"' + h.hexdigest()[:32] + '"'
+
+
+def _opaque(tag: str) -> str:
+    tag = tag.strip()
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for this header)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    want = _opaque(etag)
+    return any(_opaque(t) == want for t in if_none_match.split(","))
+
+
+def validator_headers(etag: str) -> Dict[str, str]:
+    """Headers for a response built by hand (a returned Response skips the injected one)."""
+    return {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+
+
+def not_modified(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """Set validator headers on `response`; return a bare 304 when the client copy is current."""
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=validator_headers(etag))
+    response.headers.update(validator_headers(etag))
+    return None
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+
+class SegmentIndex:
+    """Sorted index over chord segments ({start_sec, end_sec, chord}) for overlap lookups.
+
+    Segments are sorted by start time alongside a running max of end times, so
+    overlap and point queries cost O(log C + k) instead of a scan over every segment.
+    Results are returned in the original list order, matching a linear scan.
+    """
+
+    __slots__ = ("segments", "_order", "_starts", "_max_ends")
+
+    def __init__(self, segments: List[Dict[str, Any]]):
+        self.segments = segments
+        self._order = sorted(range(len(segments)), key=lambda i: segments[i]["start_sec"])
+        self._starts = [segments[i]["start_sec"] for i in self._order]
+        self._max_ends: List[float] = []
+        running = float("-inf")
+        for i in self._order:
+            running = max(running, segments[i]["end_sec"])
+            self._max_ends.append(running)
+
+    def __len__(self) -> int:
+        return len(self.segments)
+
+    @property
+    def max_end(self) -> float:
+        return self._max_ends[-1] if self._max_ends else 0.0
+
+    def _candidates(self, lo: float, hi_pos: int) -> List[int]:
+        # First sorted position whose running max end exceeds lo; nothing earlier can overlap
+        first = bisect_right(self._max_ends, lo, 0, hi_pos)
+        return [self._order[p] for p in range(first, hi_pos) if self.segments[self._order[p]]["end_sec"] > lo]
+
+    def overlapping_ids(self, start: float, end: float) -> List[int]:
+        """Indices of segments with end_sec > start and start_sec < end, in original order."""
+        hits = self._candidates(start, bisect_left(self._starts, end))
+        hits.sort()
+        return hits
+
+    def overlapping(self, start: float, end: float) -> List[Dict[str, Any]]:
+        return [self.segments[i] for i in self.overlapping_ids(start, end)]
+
+    def chord_at(self, ts: float) -> Optional[str]:
+        """Chord sounding at ts (start_sec <= ts < end_sec); after the last segment, the last chord."""
+        hits = self._candidates(ts, bisect_right(self._starts, ts))
+        if hits:
+            return self.segments[min(hits)].get("chord")
+        if self.segments and ts >= self.segments[-1]["start_sec"]:
+            return self.segments[-1].get("chord")
+        return None
@@ -2,6 +2,16 @@ from __future__ import annotations
 
 from typing import Any, Dict, List, Tuple
 
+from .tempo_map import TempoMap
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy is optional; scalar path is always available
+    np = None  # type: ignore
+
+# Songs with more events than this are positioned in one vectorized pass (when numpy is available)
+VECTORIZE_MIN_EVENTS = 32
+
 
 def _parse_time_signature(ts: str | None) -> Tuple[int, int]:
     if not ts or "/" not in ts:
@@ -31,19 +41,95 @@ def _sec_to_qbeats(seconds: float, qbpm: float) -> float:
     return seconds * (qbpm / 60.0)
 
 
-def _format_pos(qbeats: float, qbeats_per_bar: float) -> Dict[str, float | int]:
-    if qbeats < 0:
-        qbeats = 0.0
-    bar_float = qbeats / qbeats_per_bar if qbeats_per_bar > 0 else 0.0
-    bar_index0 = int(bar_float)
-    start_bar = bar_index0 + 1
-    beat_in_bar = (qbeats - bar_index0 * qbeats_per_bar) + 1.0
+def _use_arrays(n_events: int) -> bool:
+    return np is not None and n_events > VECTORIZE_MIN_EVENTS
+
+
+def _round_array(values: "np.ndarray", ndigits: int) -> "np.ndarray":
+    """Round like builtin round(v, ndigits) for every element.
+    np.round scales in binary and can disagree with round() on near-ties; those few are redone in Python.
+    """
+    scale = 10.0 ** ndigits
+    scaled = values * scale
+    out = np.rint(scaled) / scale
+    near_tie = np.abs(np.abs(scaled - np.floor(scaled)) - 0.5) < 1e-6
+    for i in np.flatnonzero(near_tie):
+        out[i] = round(float(values[i]), ndigits)
+    return out
+
+
+def _tempo_map_for(obj: Dict[str, Any], tempo: float | int | None, num: int, den: int) -> TempoMap:
+    """Quarter-beat TempoMap for a JCRD; a single mark unless metadata carries tempo/meter maps."""
+    bpm = float(tempo) if tempo and tempo > 0 else 120.0  # same default as _qbpm_from_tempo_and_ts
+    return TempoMap.from_doc(obj, bpm=bpm, time_sig=(num, den))
+
+
+def _map_metadata(tm: TempoMap) -> Dict[str, Any]:
+    """Normalized multi-mark maps for output metadata (empty for a constant map)."""
+    if tm.is_constant:
+        return {}
     return {
-        "bar": start_bar,
-        "beat_in_bar": round(beat_in_bar, 3),
+        "tempo_map": [{"time": t, "bpm": bpm} for t, bpm in tm.tempo_marks],
+        "time_signature_map": [{"time": t, "time_signature": f"{n}/{d}"} for t, n, d in tm.meter_marks],
     }
 
 
+def _qbeat_rows(
+    starts: List[float],
+    ends: List[float],
+    tm: TempoMap,
+    *,
+    ends_are_durations: bool = False,
+) -> List[Dict[str, Any]]:
+    """Qbeat columns for a list of events, rounded for output.
+    ends are absolute end times, or durations when ends_are_durations is set.
+    """
+    if not _use_arrays(len(starts)):
+        rows: List[Dict[str, Any]] = []
+        for st, et in zip(starts, ends):
+            start_q = tm.sec_to_beats(st)
+            if ends_are_durations:
+                end_q = None
+                dur_q = tm.span_beats(st, et)
+            else:
+                end_q = tm.sec_to_beats(et)
+                dur_q = end_q - start_q
+            bar, beat_in_bar, _ = tm.position(start_q)
+            qpb = tm.meter_at_beats(start_q)[1]
+            dur_bars = dur_q / qpb if qpb > 0 else 0.0
+            rows.append({
+                "start_q": round(start_q, 6),
+                "end_q": round(end_q, 6) if end_q is not None else None,
+                "dur_q": round(dur_q, 6),
+                "dur_bars": round(dur_bars, 6),
+                "bar": bar,
+                "beat_in_bar": round(beat_in_bar, 3),
+            })
+        return rows
+    start_q = tm.sec_to_beats_array(starts)
+    if ends_are_durations:
+        end_q = None
+        dur_q = tm.span_beats_array(starts, ends)
+    else:
+        end_q = tm.sec_to_beats_array(ends)
+        dur_q = end_q - start_q
+    bars, beats, _ = tm.position_array(start_q)
+    qpb = tm.beats_per_bar_array(start_q)
+    dur_bars = np.where(qpb > 0, dur_q / np.where(qpb > 0, qpb, 1.0), 0.0)
+    end_col = _round_array(end_q, 6).tolist() if end_q is not None else [None] * len(starts)
+    return [
+        {"start_q": sq, "end_q": eq, "dur_q": dq, "dur_bars": db, "bar": b, "beat_in_bar": bi}
+        for sq, eq, dq, db, b, bi in zip(
+            _round_array(start_q, 6).tolist(),
+            end_col,
+            _round_array(dur_q, 6).tolist(),
+            _round_array(dur_bars, 6).tolist(),
+            bars.tolist(),
+            _round_array(beats, 3).tolist(),
+        )
+    ]
+
+
 def convert_jcrd(obj: Dict[str, Any]) -> Dict[str, Any]:
     meta = obj.get("metadata") or {}
     tempo = meta.get("tempo") or meta.get("bpm")
@@ -51,13 +137,11 @@ def convert_jcrd(obj: Dict[str, Any]) -> Dict[str, Any]:
     num, den = _parse_time_signature(str(time_sig) if time_sig else None)
     qbpm = _qbpm_from_tempo_and_ts(tempo, den)
     qpb = _quarter_beats_per_bar(num, den)
+    tm = _tempo_map_for(obj, tempo, num, den)
 
     def conv_sec(v: float) -> float:
         return round(float(v), 6)
 
-    def conv_q(v: float) -> float:
-        return round(_sec_to_qbeats(float(v), qbpm), 6)
-
     out: Dict[str, Any] = {
         "metadata": {
             **meta,
@@ -65,30 +149,39 @@ def convert_jcrd(obj: Dict[str, Any]) -> Dict[str, Any]:
             "qbpm": round(qbpm, 6),
             "time_signature": f"{num}/{den}",
             "quarter_beats_per_bar": round(qpb, 6),
+            **_map_metadata(tm),
         }
     }
 
+    # Position every section chord in one pass, then split back per section
+    sections_in = obj.get("sections", []) or []
+    sec_chords = [sec.get("chords", []) or [] for sec in sections_in]
+    starts: List[float] = []
+    ends: List[float] = []
+    for chords_in in sec_chords:
+        for ch in chords_in:
+            st = float(ch.get("start_time", 0.0))
+            starts.append(st)
+            ends.append(float(ch.get("end_time", st)))
+    rows = iter(_qbeat_rows(starts, ends, tm))
+    times = iter(zip(starts, ends))
+
     sections: List[Dict[str, Any]] = []
-    for sec in obj.get("sections", []) or []:
+    for sec, chords_in in zip(sections_in, sec_chords):
         chords_out: List[Dict[str, Any]] = []
-        for ch in sec.get("chords", []) or []:
-            st = float(ch.get("start_time", 0.0))
-            et = float(ch.get("end_time", st))
-            start_q = _sec_to_qbeats(st, qbpm)
-            end_q = _sec_to_qbeats(et, qbpm)
-            dur_q = end_q - start_q
-            dur_bars = dur_q / qpb if qpb > 0 else 0.0
-            pos = _format_pos(start_q, qpb)
+        for ch in chords_in:
+            st, et = next(times)
+            row = next(rows)
             chords_out.append({
                 "chord": ch.get("chord"),
                 "start_sec": conv_sec(st),
                 "end_sec": conv_sec(et),
-                "start_qbeats": round(start_q, 6),
-                "end_qbeats": round(end_q, 6),
-                "duration_qbeats": round(dur_q, 6),
-                "duration_bars": round(dur_bars, 6),
-                "start_bar": pos["bar"],
-                "start_beat_in_bar": pos["beat_in_bar"],
+                "start_qbeats": row["start_q"],
+                "end_qbeats": row["end_q"],
+                "duration_qbeats": row["dur_q"],
+                "duration_bars": row["dur_bars"],
+                "start_bar": row["bar"],
+                "start_beat_in_bar": row["beat_in_bar"],
             })
         sections.append({
             "name": sec.get("name"),
@@ -99,23 +192,21 @@ def convert_jcrd(obj: Dict[str, Any]) -> Dict[str, Any]:
     if sections:
         out["sections"] = sections
 
+    progression_in = obj.get("chord_progression", []) or []
+    prog_starts = [float(it.get("time", 0.0)) for it in progression_in]
+    prog_durs = [float(it.get("duration", 0.0)) for it in progression_in]
+    prog_rows = _qbeat_rows(prog_starts, prog_durs, tm, ends_are_durations=True)
     progression_out: List[Dict[str, Any]] = []
-    for it in obj.get("chord_progression", []) or []:
-        st = float(it.get("time", 0.0))
-        dur = float(it.get("duration", 0.0))
-        start_q = _sec_to_qbeats(st, qbpm)
-        dur_q = _sec_to_qbeats(dur, qbpm)
-        dur_bars = dur_q / qpb if qpb > 0 else 0.0
-        pos = _format_pos(start_q, qpb)
+    for it, st, dur, row in zip(progression_in, prog_starts, prog_durs, prog_rows):
         progression_out.append({
             "chord": it.get("chord"),
             "start_sec": conv_sec(st),
-            "start_qbeats": round(start_q, 6),
-            "start_bar": pos["bar"],
-            "start_beat_in_bar": pos["beat_in_bar"],
+            "start_qbeats": row["start_q"],
+            "start_bar": row["bar"],
+            "start_beat_in_bar": row["beat_in_bar"],
             "duration_sec": conv_sec(dur),
-            "duration_qbeats": round(dur_q, 6),
-            "duration_bars": round(dur_bars, 6),
+            "duration_qbeats": row["dur_q"],
+            "duration_bars": row["dur_bars"],
         })
     if progression_out:
         out["chord_progression"] = progression_out
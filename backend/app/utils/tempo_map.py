@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from bisect import bisect_right
+from math import ceil
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np  # type: ignore
+except Exception:  # pragma: no cover - numpy is optional; scalar lookups are always available
+    np = None  # type: ignore
+
+DEFAULT_BPM = 120.0
+DEFAULT_SIG = (4, 4)
+
+# A meter change always starts a new bar; this absorbs float error right at the boundary
+_BAR_EPS = 1e-6
+
+
+class TempoMap:
+    """Piecewise tempo + meter map with O(log n) seconds<->beats and beats->bar|beat lookups.
+
+    tempo_marks: [(at_sec, bpm)], bpm counted in the meter's denominator note.
+    meter_marks: [(at_sec, num, den)].
+    quarter_beats=True counts beats in quarter notes (qbeats, as tempo.py/align.py do);
+    False counts beats of the tempo itself (as the timeline mapper does).
+
+    Cumulative beats are precomputed at every tempo/meter change, and cumulative bars at
+    every meter change, so each lookup is a bisect plus one linear step.
+    """
+
+    def __init__(
+        self,
+        tempo_marks: Sequence[Tuple[float, float]],
+        meter_marks: Optional[Sequence[Tuple[float, int, int]]] = None,
+        *,
+        quarter_beats: bool = True,
+    ):
+        self.quarter_beats = quarter_beats
+        self.tempo_marks = _normalize_marks(
+            [(t, float(bpm)) for t, bpm in tempo_marks if bpm and bpm > 0], (DEFAULT_BPM,)
+        )
+        self.meter_marks = _normalize_marks(
+            [(t, int(n), int(d)) for t, n, d in (meter_marks or []) if n > 0 and d > 0], DEFAULT_SIG
+        )
+
+        # Tempo segments: one per distinct change point (tempo or meter, since den scales qbeats)
+        points = sorted({t for t, *_ in self.tempo_marks} | {t for t, *_ in self.meter_marks})
+        tempo_times = [t for t, *_ in self.tempo_marks]
+        meter_times = [t for t, *_ in self.meter_marks]
+        self._sec_starts: List[float] = []
+        self._beat_starts: List[float] = []
+        self._rates: List[float] = []  # beats per second
+        for p in points:
+            bpm = self.tempo_marks[bisect_right(tempo_times, p) - 1][1]
+            den = self.meter_marks[bisect_right(meter_times, p) - 1][2]
+            beat_bpm = bpm * (4.0 / den) if quarter_beats else bpm
+            rate = beat_bpm / 60.0
+            if self._sec_starts:
+                prev = len(self._sec_starts) - 1
+                beat = self._beat_starts[prev] + (p - self._sec_starts[prev]) * self._rates[prev]
+            else:
+                beat = 0.0
+            self._sec_starts.append(p)
+            self._beat_starts.append(beat)
+            self._rates.append(rate)
+
+        # Meter segments keyed by beat position
+        self._meter_beats: List[float] = []
+        self._meter_nums: List[int] = []
+        self._beats_per_bar: List[float] = []
+        for t, num, den in self.meter_marks:
+            self._meter_beats.append(self.sec_to_beats(t))
+            self._meter_nums.append(num)
+            self._beats_per_bar.append(num * (4.0 / den) if quarter_beats else float(num))
+        self._bar_starts_cache: Dict[float, List[int]] = {}
+
+    @classmethod
+    def from_doc(
+        cls,
+        doc: Dict[str, Any],
+        *,
+        bpm: Optional[float] = None,
+        time_sig: Optional[Tuple[int, int]] = None,
+        quarter_beats: bool = True,
+    ) -> "TempoMap":
+        """Build from a JCRD/analyzed doc. Multi-mark maps are read from
+        tempoMap/timeSigMap (SongTimeline shape) or metadata.tempo_map/time_signature_map;
+        otherwise bpm/time_sig (or the doc's own tempo and time_signature) give a single mark.
+        """
+        meta = doc.get("metadata") or {}
+        tempo_rows = doc.get("tempoMap") or meta.get("tempo_map") or []
+        meter_rows = doc.get("timeSigMap") or meta.get("time_signature_map") or []
+        tempo_marks = [m for m in (_tempo_mark(r) for r in tempo_rows) if m]
+        meter_marks = [m for m in (_meter_mark(r) for r in meter_rows) if m]
+        if not tempo_marks:
+            if bpm is None:
+                try:
+                    bpm = float(meta.get("tempo") or meta.get("bpm") or doc.get("bpm") or DEFAULT_BPM)
+                except Exception:
+                    bpm = DEFAULT_BPM
+            tempo_marks = [(0.0, bpm)]
+        if not meter_marks:
+            if time_sig is None:
+                time_sig = _parse_sig(meta.get("time_signature") or doc.get("timeSignature"))
+            meter_marks = [(0.0, time_sig[0], time_sig[1])]
+        return cls(tempo_marks, meter_marks, quarter_beats=quarter_beats)
+
+    @property
+    def is_constant(self) -> bool:
+        return len(self._rates) == 1
+
+    def tempo_rows(self) -> List[Dict[str, float]]:
+        """Tempo marks in SongTimeline tempoMap shape."""
+        return [{"atSec": t, "bpm": bpm} for t, bpm in self.tempo_marks]
+
+    def meter_rows(self) -> List[Dict[str, Any]]:
+        """Meter marks in SongTimeline timeSigMap shape."""
+        return [{"atSec": t, "num": num, "den": den} for t, num, den in self.meter_marks]
+
+    # --- seconds <-> beats -------------------------------------------------
+
+    def sec_to_beats(self, sec: float) -> float:
+        if self.is_constant:
+            return sec * self._rates[0]
+        i = max(0, bisect_right(self._sec_starts, sec) - 1)
+        return self._beat_starts[i] + (sec - self._sec_starts[i]) * self._rates[i]
+
+    def beats_to_sec(self, beats: float) -> float:
+        i = max(0, bisect_right(self._beat_starts, beats) - 1)
+        return self._sec_starts[i] + (beats - self._beat_starts[i]) / self._rates[i]
+
+    def span_beats(self, start_sec: float, dur_sec: float) -> float:
+        """Beats covered by dur_sec seconds starting at start_sec."""
+        if self.is_constant:
+            return dur_sec * self._rates[0]
+        return self.sec_to_beats(start_sec + dur_sec) - self.sec_to_beats(start_sec)
+
+    def sec_to_beats_array(self, secs: Sequence[float] | "np.ndarray") -> "np.ndarray":
+        secs = np.asarray(secs, dtype=float)
+        if self.is_constant:
+            return secs * self._rates[0]
+        i = np.maximum(np.searchsorted(self._sec_starts, secs, side="right") - 1, 0)
+        return np.asarray(self._beat_starts)[i] + (secs - np.asarray(self._sec_starts)[i]) * np.asarray(self._rates)[i]
+
+    def span_beats_array(self, starts: Sequence[float], durs: Sequence[float]) -> "np.ndarray":
+        starts_a = np.asarray(starts, dtype=float)
+        durs_a = np.asarray(durs, dtype=float)
+        if self.is_constant:
+            return durs_a * self._rates[0]
+        return self.sec_to_beats_array(starts_a + durs_a) - self.sec_to_beats_array(starts_a)
+
+    # --- beats -> bar | beat -----------------------------------------------
+
+    def _bar_starts(self, origin: float) -> List[int]:
+        """Bar index (0-based) at each meter change when bars are counted from `origin` beats."""
+        cached = self._bar_starts_cache.get(origin)
+        if cached is not None:
+            return cached
+        starts = [0]
+        for j in range(1, len(self._meter_beats)):
+            anchor = origin if j == 1 else self._meter_beats[j - 1]
+            bars = starts[-1] + (self._meter_beats[j] - anchor) / self._beats_per_bar[j - 1]
+            starts.append(max(starts[-1], int(ceil(bars - _BAR_EPS))))
+        self._bar_starts_cache[origin] = starts
+        return starts
+
+    def _meter_index(self, beats_abs: float) -> int:
+        return max(0, bisect_right(self._meter_beats, beats_abs) - 1)
+
+    def meter_at_beats(self, beats: float) -> Tuple[int, float]:
+        """(num, beats_per_bar) active at an absolute beat position."""
+        j = self._meter_index(beats)
+        return self._meter_nums[j], self._beats_per_bar[j]
+
+    def beats_per_bar_array(self, beats: "np.ndarray") -> "np.ndarray":
+        if len(self._meter_beats) == 1:
+            return np.full(np.shape(beats), self._beats_per_bar[0])
+        j = np.maximum(np.searchsorted(self._meter_beats, beats, side="right") - 1, 0)
+        return np.asarray(self._beats_per_bar)[j]
+
+    def bar_remainder(self, beats: float) -> Tuple[float, float]:
+        """(beats past the last bar line, beats_per_bar) at an absolute beat position."""
+        j = self._meter_index(beats)
+        bpb = self._beats_per_bar[j]
+        if bpb <= 0:
+            return 0.0, bpb
+        return (beats - self._meter_beats[j] if j else beats) % bpb, bpb
+
+    def position(self, beats: float, origin: float = 0.0) -> Tuple[int, float, int]:
+        """(bar, beat_in_bar, num) for `beats` counted from `origin`; beat_in_bar is 1-based, unrounded."""
+        if beats < 0:
+            beats = 0.0
+        j = self._meter_index(beats + origin) if len(self._meter_beats) > 1 else 0
+        bpb = self._beats_per_bar[j]
+        local = beats - (self._meter_beats[j] - origin) if j else beats
+        bar_index0 = int(local / bpb) if bpb > 0 else 0
+        bar0 = self._bar_starts(origin)[j] if j else 0
+        return bar0 + bar_index0 + 1, (local - bar_index0 * bpb) + 1.0, self._meter_nums[j]
+
+    def position_array(self, beats: "np.ndarray", origin: float = 0.0) -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        """Array form of position()."""
+        q = np.where(beats < 0, 0.0, beats)
+        if len(self._meter_beats) > 1:
+            j = np.maximum(np.searchsorted(self._meter_beats, q + origin, side="right") - 1, 0)
+            anchor = np.where(j > 0, np.asarray(self._meter_beats)[j] - origin, 0.0)
+            local = np.where(j > 0, q - anchor, q)
+            bar0 = np.asarray(self._bar_starts(origin))[j]
+        else:
+            j = np.zeros(q.shape, dtype=np.int64)
+            local = q
+            bar0 = 0
+        bpb = np.asarray(self._beats_per_bar)[j]
+        safe_bpb = np.where(bpb > 0, bpb, 1.0)
+        bar_index0 = np.where(bpb > 0, np.trunc(local / safe_bpb), 0.0)
+        beat_in_bar = (local - bar_index0 * bpb) + 1.0
+        bars = bar0 + bar_index0.astype(np.int64) + 1
+        return bars, beat_in_bar, np.asarray(self._meter_nums)[j]
+
+
+def _normalize_marks(marks: List[Tuple], default: Tuple) -> List[Tuple]:
+    """Sort by time, clamp the first mark to 0s and keep the last mark at any repeated time."""
+    if not marks:
+        return [(0.0, *default)]
+    out: Dict[float, Tuple] = {}
+    for t, *rest in sorted(marks, key=lambda m: float(m[0] or 0.0)):
+        out[max(0.0, float(t or 0.0))] = tuple(rest)
+    ordered = sorted(out.items())
+    first_t, first_v = ordered[0]
+    if first_t > 0.0:
+        # The earliest mark also covers everything before it
+        ordered.insert(0, (0.0, first_v))
+    return [(t, *v) for t, v in ordered]
+
+
+def _parse_sig(ts: Any) -> Tuple[int, int]:
+    try:
+        num_s, den_s = str(ts).split("/", 1)
+        num, den = int(num_s.strip()), int(den_s.strip())
+        if num > 0 and den > 0:
+            return num, den
+    except Exception:
+        pass
+    return DEFAULT_SIG
+
+
+def _mark_time(row: Dict[str, Any]) -> Optional[float]:
+    for k in ("atSec", "time", "start_time", "sec"):
+        if row.get(k) is not None:
+            try:
+                return float(row[k])
+            except Exception:
+                return None
+    return 0.0
+
+
+def _tempo_mark(row: Any) -> Optional[Tuple[float, float]]:
+    if not isinstance(row, dict):
+        return None
+    t = _mark_time(row)
+    try:
+        bpm = float(row.get("bpm") or row.get("tempo") or 0.0)
+    except Exception:
+        return None
+    if t is None or bpm <= 0:
+        return None
+    return t, bpm
+
+
+def _meter_mark(row: Any) -> Optional[Tuple[float, int, int]]:
+    if not isinstance(row, dict):
+        return None
+    t = _mark_time(row)
+    if t is None:
+        return None
+    if row.get("num") is not None and row.get("den") is not None:
+        try:
+            num, den = int(row["num"]), int(row["den"])
+        except Exception:
+            return None
+        if num <= 0 or den <= 0:
+            return None
+    else:
+        num, den = _parse_sig(row.get("time_signature") or row.get("ts"))
+    return t, num, den
@@ -0,0 +1,110 @@
+"""Size-limited, spooled upload handling for the import endpoints.
+
+Request bodies are counted as they arrive (LimitedUploadRoute), so an oversized
+request fails with 413 before the multipart parser has buffered it. Uploaded files
+stay in the spooled temp files Starlette writes them to; handlers check each file's
+size and hand parsers the file object instead of one bytes copy of the payload.
+"""
+from __future__ import annotations
+
+import io
+import tempfile
+from typing import IO, Any, BinaryIO, Callable, Coroutine, Iterator, Optional
+
+from fastapi import HTTPException, Request, Response, UploadFile
+from fastapi.routing import APIRoute
+from starlette.types import Message, Receive
+
+from ..config import settings
+
+_CHUNK = 64 * 1024
+
+
+class UploadTooLarge(HTTPException):
+    def __init__(self, what: str, limit: int) -> None:
+        super().__init__(status_code=413, detail=f"{what} exceeds the {limit} byte upload limit")
+
+
+def _counting(receive: Receive, limit: int) -> Receive:
+    seen = 0
+
+    async def counted() -> Message:
+        nonlocal seen
+        message = await receive()
+        if message["type"] == "http.request":
+            seen += len(message.get("body", b""))
+            if seen > limit:
+                raise UploadTooLarge("request body", limit)
+        return message
+
+    return counted
+
+
+class LimitedUploadRoute(APIRoute):
+    """Route class enforcing settings.UPLOAD_MAX_REQUEST_BYTES while the body is read."""
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def limited(request: Request) -> Response:
+            limit = int(settings.UPLOAD_MAX_REQUEST_BYTES)
+            declared = request.headers.get("content-length", "")
+            if declared.isdigit() and int(declared) > limit:
+                raise UploadTooLarge("request body", limit)
+            return await handler(Request(request.scope, _counting(request.receive, limit)))
+
+        return limited
+
+
+def upload_size(f: UploadFile) -> int:
+    if f.size is not None:
+        return int(f.size)
+    pos = f.file.tell()
+    f.file.seek(0, io.SEEK_END)
+    size = f.file.tell()
+    f.file.seek(pos)
+    return size
+
+
+def open_upload(f: UploadFile, limit: Optional[int] = None) -> BinaryIO:
+    """The upload's spooled file, rewound, after checking its size (default UPLOAD_MAX_FILE_BYTES)."""
+    limit = int(settings.UPLOAD_MAX_FILE_BYTES if limit is None else limit)
+    if upload_size(f) > limit:
+        raise UploadTooLarge(f.filename or "file", limit)
+    f.file.seek(0)
+    return f.file  # type: ignore[return-value]
+
+
+def detach_upload(f: UploadFile, limit: Optional[int] = None) -> BinaryIO:
+    """Take ownership of an upload's spooled file (size-checked, rewound).
+
+    FastAPI closes form files when the endpoint returns, before a StreamingResponse
+    body runs; a streaming endpoint detaches the file and closes it itself.
+    """
+    fp = open_upload(f, limit)
+    f.file = io.BytesIO()
+    return fp
+
+
+async def spool_body(request: Request) -> IO[bytes]:
+    """Stream a raw request body into a spooled temp file (rewound), enforcing the file limit."""
+    limit = int(settings.UPLOAD_MAX_FILE_BYTES)
+    out = tempfile.SpooledTemporaryFile(max_size=int(settings.UPLOAD_SPOOL_BYTES))
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            out.close()
+            raise UploadTooLarge("request body", limit)
+        out.write(chunk)
+    out.seek(0)
+    return out
+
+
+def text_lines(fp: IO[bytes], errors: str = "replace") -> Iterator[str]:
+    """Decoded lines of a binary file (universal newlines), leaving `fp` open."""
+    text = io.TextIOWrapper(fp, encoding="utf-8", errors=errors, newline=None)
+    try:
+        yield from text
+    finally:
+        text.detach()
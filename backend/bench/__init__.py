@@ -0,0 +1 @@
+"""Performance benchmarks (run as modules from backend/, e.g. python -m bench.corpus)."""
@@ -0,0 +1,282 @@
+"""Corpus benchmark over References/Beatles-Chords (+ matching lyrics).
+
+Run from backend/:
+    python -m bench.corpus --out bench/baseline.json
+    python -m bench.corpus --compare bench/baseline.json --threshold 0.15
+
+Every stage gets prepared inputs (JCRD, lyric lines, merged content, analyzed doc),
+so each timing covers only that stage. Peak memory comes from a separate tracemalloc
+pass, so tracing overhead does not affect the latencies.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.tempo import convert_jcrd
+from app.utils.align import chords_only_text, merge_jcrd_with_lyrics
+from app.services.analysis import analyze_songdoc, analyze_from_content
+from app.mappers.timeline import to_timeline
+
+REFERENCES = Path(__file__).resolve().parents[2] / "References"
+CHORDS_DIR = REFERENCES / "Beatles-Chords"
+LYRICS_DIR = REFERENCES / "The Beatles Lyrics" / "lyrics"
+
+# Metrics compared in --compare mode (lower is better for all of them)
+COMPARED_METRICS = ("p50_ms", "p95_ms", "peak_kib")
+
+
+@dataclass
+class CorpusSong:
+    name: str
+    jcrd: Dict[str, Any]
+    lyrics_lines: List[Dict[str, Any]] = field(default_factory=list)
+    content: str = ""
+    analyzed: Dict[str, Any] = field(default_factory=dict)
+
+
+def _title_key(s: str) -> str:
+    return re.sub(r"[^a-z0-9]", "", s.lower())
+
+
+def _song_title(path: Path) -> str:
+    # 01_-_Please_Please_Me_02_-_Misery.jcrd.json -> Misery
+    stem = path.name.split(".jcrd", 1)[0]
+    return stem.rsplit("_-_", 1)[-1]
+
+
+def _lyrics_index(lyrics_dir: Path) -> Dict[str, Path]:
+    index: Dict[str, Path] = {}
+    if lyrics_dir.is_dir():
+        for p in sorted(lyrics_dir.glob("*/*.txt")):
+            index.setdefault(_title_key(p.stem), p)
+    return index
+
+
+def load_corpus(
+    chords_dir: Path = CHORDS_DIR,
+    lyrics_dir: Path = LYRICS_DIR,
+    *,
+    limit: Optional[int] = None,
+) -> List[CorpusSong]:
+    """Load every .jcrd.json once and pair it with lyrics by normalized title."""
+    lyrics = _lyrics_index(lyrics_dir)
+    songs: List[CorpusSong] = []
+    for path in sorted(chords_dir.glob("*.jcrd.json*")):
+        try:
+            jcrd = json.loads(path.read_text(encoding="utf-8"))
+        except Exception:
+            continue
+        if not isinstance(jcrd, dict):
+            continue
+        song = CorpusSong(name=path.name, jcrd=jcrd)
+        lyr_path = lyrics.get(_title_key(_song_title(path)))
+        if lyr_path is not None:
+            text = lyr_path.read_text(encoding="utf-8", errors="replace")
+            song.lyrics_lines = [{"ts_sec": None, "text": ln} for ln in text.splitlines() if ln.strip()]
+        # Inputs for the downstream stages are prepared once, outside the timed region
+        song.content = merge_jcrd_with_lyrics(jcrd, song.lyrics_lines)["content"]
+        song.analyzed = analyze_songdoc(jcrd)
+        songs.append(song)
+        if limit is not None and len(songs) >= limit:
+            break
+    return songs
+
+
+def _analyze_content(song: CorpusSong) -> Any:
+    meta = song.jcrd.get("metadata") or {}
+    return analyze_from_content(
+        str(meta.get("title") or song.name),
+        str(meta.get("artist") or ""),
+        song.content,
+        bpm=float(meta.get("tempo") or 120.0),
+        time_sig=str(meta.get("time_signature") or "4/4"),
+    )
+
+
+STAGES: Dict[str, Callable[[CorpusSong], Any]] = {
+    "convert_jcrd": lambda s: convert_jcrd(s.jcrd),
+    "chords_only_text": lambda s: chords_only_text(s.jcrd),
+    "merge_jcrd_with_lyrics": lambda s: merge_jcrd_with_lyrics(s.jcrd, s.lyrics_lines),
+    "analyze_songdoc": lambda s: analyze_songdoc(s.jcrd),
+    "analyze_from_content": _analyze_content,
+    "to_timeline": lambda s: to_timeline(s.analyzed),
+}
+
+
+def _percentile(sorted_vals: List[float], pct: float) -> float:
+    """Nearest-rank percentile over an already sorted list."""
+    if not sorted_vals:
+        return 0.0
+    k = max(0, min(len(sorted_vals) - 1, math.ceil(pct / 100.0 * len(sorted_vals)) - 1))
+    return sorted_vals[k]
+
+
+def _peak_kib(fn: Callable[[CorpusSong], Any], songs: List[CorpusSong]) -> float:
+    """Largest tracemalloc peak over single calls of one stage."""
+    peak = 0
+    tracemalloc.start()
+    try:
+        for s in songs:
+            tracemalloc.reset_peak()
+            fn(s)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return round(peak / 1024.0, 1)
+
+
+def run_stage(
+    name: str,
+    songs: List[CorpusSong],
+    *,
+    iterations: int = 3,
+    warmup: int = 1,
+    per_song: bool = False,
+) -> Dict[str, Any]:
+    fn = STAGES[name]
+    for _ in range(warmup):
+        for s in songs:
+            fn(s)
+    samples: List[float] = []
+    by_song: Dict[str, List[float]] = {}
+    total = 0.0
+    for _ in range(max(1, iterations)):
+        for s in songs:
+            t0 = time.perf_counter()
+            fn(s)
+            dt = time.perf_counter() - t0
+            total += dt
+            samples.append(dt * 1000.0)
+            if per_song:
+                by_song.setdefault(s.name, []).append(dt * 1000.0)
+    samples.sort()
+    calls = len(samples)
+    out: Dict[str, Any] = {
+        "calls": calls,
+        "total_s": round(total, 4),
+        "songs_per_s": round(calls / total, 1) if total > 0 else 0.0,
+        "mean_ms": round(statistics.fmean(samples), 4) if samples else 0.0,
+        "p50_ms": round(_percentile(samples, 50), 4),
+        "p95_ms": round(_percentile(samples, 95), 4),
+        "p99_ms": round(_percentile(samples, 99), 4),
+        "max_ms": round(samples[-1], 4) if samples else 0.0,
+        "peak_kib": _peak_kib(fn, songs),
+    }
+    if per_song:
+        out["per_song_ms"] = {k: round(statistics.median(v), 4) for k, v in by_song.items()}
+    return out
+
+
+def run(
+    songs: List[CorpusSong],
+    *,
+    stages: Optional[List[str]] = None,
+    iterations: int = 3,
+    warmup: int = 1,
+    per_song: bool = False,
+) -> Dict[str, Any]:
+    try:
+        import numpy  # noqa: F401
+        has_numpy = True
+    except Exception:
+        has_numpy = False
+    results = {
+        name: run_stage(name, songs, iterations=iterations, warmup=warmup, per_song=per_song)
+        for name in (stages or list(STAGES))
+    }
+    return {
+        "env": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "numpy": has_numpy,
+            "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "songs": len(songs),
+        "songs_with_lyrics": sum(1 for s in songs if s.lyrics_lines),
+        "iterations": iterations,
+        "stages": results,
+    }
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], *, threshold: float = 0.10) -> List[Dict[str, Any]]:
+    """Metrics that got worse than baseline by more than `threshold` (0.10 = 10%)."""
+    regressions: List[Dict[str, Any]] = []
+    base_stages = baseline.get("stages") or {}
+    for name, cur in (current.get("stages") or {}).items():
+        base = base_stages.get(name)
+        if not base:
+            continue
+        for metric in COMPARED_METRICS:
+            b, c = base.get(metric), cur.get(metric)
+            if not isinstance(b, (int, float)) or not isinstance(c, (int, float)) or b <= 0:
+                continue
+            change = (c - b) / b
+            if change > threshold:
+                regressions.append({
+                    "stage": name,
+                    "metric": metric,
+                    "baseline": b,
+                    "current": c,
+                    "change": round(change, 3),
+                })
+    return regressions
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"{report['songs']} songs ({report['songs_with_lyrics']} with lyrics), {report['iterations']} iterations")
+    print(f"{'stage':<24}{'songs/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'peak KiB':>11}")
+    for name, r in report["stages"].items():
+        print(
+            f"{name:<24}{r['songs_per_s']:>10}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+            f"{r['p99_ms']:>10.3f}{r['peak_kib']:>11}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--chords-dir", type=Path, default=CHORDS_DIR)
+    ap.add_argument("--lyrics-dir", type=Path, default=LYRICS_DIR)
+    ap.add_argument("--limit", type=int, default=None, help="only the first N songs")
+    ap.add_argument("--stage", action="append", choices=list(STAGES), help="repeatable; default all")
+    ap.add_argument("--iterations", type=int, default=3)
+    ap.add_argument("--warmup", type=int, default=1)
+    ap.add_argument("--per-song", action="store_true", help="include per-song median latency")
+    ap.add_argument("--out", type=Path, help="write the JSON report here")
+    ap.add_argument("--compare", type=Path, help="baseline JSON to compare against")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging (0.10 = 10%%)")
+    args = ap.parse_args(argv)
+
+    songs = load_corpus(args.chords_dir, args.lyrics_dir, limit=args.limit)
+    if not songs:
+        print(f"no .jcrd.json files under {args.chords_dir}", file=sys.stderr)
+        return 2
+    report = run(songs, stages=args.stage, iterations=args.iterations, warmup=args.warmup, per_song=args.per_song)
+    _print_table(report)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"wrote {args.out}")
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        regressions = compare(baseline, report, threshold=args.threshold)
+        for r in regressions:
+            print(f"REGRESSION {r['stage']} {r['metric']}: {r['baseline']} -> {r['current']} (+{r['change']:.0%})")
+        if regressions:
+            return 1
+        print(f"no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
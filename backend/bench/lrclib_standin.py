@@ -0,0 +1,127 @@
+"""Local stand-in for the LRCLIB API (GET /api/get), fed from the reference lyrics corpus.
+
+Run from backend/ and point the app at it:
+    python -m bench.lrclib_standin --port 8765 --latency-ms 120 --jitter-ms 40 --error-rate 0.02
+    LYRICS_LRCLIB_URL=http://127.0.0.1:8765/api/get uvicorn app.main_backup:app
+
+or use it in-process (tests, bench.lyrics_paths):
+    lrclib.configure(transport=httpx.ASGITransport(app=create_app(latency_ms=50)))
+
+Tracks are looked up with the offline corpus index, so JCRD titles such as
+"12 - You_Can't_Do_That" resolve as they would upstream. Found tracks answer with
+plainLyrics and syncedLyrics (lines spread evenly over the track duration). Latency,
+jitter, the share of 5xx answers and the share of forced 404s are configurable;
+GET /stats reports what was served.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import zlib
+from typing import Any, Dict, List, Optional
+
+from fastapi import FastAPI, Query
+from fastapi.responses import JSONResponse
+
+from app.config import settings
+from app.services.lyrics_providers.local import LocalLyricsIndex
+
+NOT_FOUND = {"code": 404, "name": "TrackNotFound", "message": "Failed to find specified track"}
+DEFAULT_DURATION = 180
+
+
+def _lrc(lines: List[str], duration: float) -> str:
+    step = duration / max(1, len(lines) + 1)
+    out = []
+    for n, line in enumerate(lines, start=1):
+        ts = n * step
+        out.append(f"[{int(ts // 60):02d}:{ts % 60:05.2f}] {line}")
+    return "\n".join(out)
+
+
+def create_app(
+    lyrics_dir: Optional[str] = None,
+    *,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    not_found_rate: float = 0.0,
+    seed: Optional[int] = 0,
+    index: Optional[LocalLyricsIndex] = None,
+) -> FastAPI:
+    index = index or LocalLyricsIndex(lyrics_dir or settings.LYRICS_LOCAL_DIR, artist=settings.LYRICS_LOCAL_ARTIST)
+    rng = random.Random(seed)
+    stats: Dict[str, Any] = {"requests": 0, "found": 0, "not_found": 0, "errors": 0, "tracks": len(index)}
+    app = FastAPI(title="LRCLIB stand-in")
+
+    @app.get("/api/get")
+    async def get_track(
+        track_name: str = Query(...),
+        artist_name: str = Query(...),
+        album_name: Optional[str] = None,
+        duration: Optional[int] = None,
+    ):
+        stats["requests"] += 1
+        delay = latency_ms + (rng.uniform(-jitter_ms, jitter_ms) if jitter_ms else 0.0)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000.0)
+        if error_rate and rng.random() < error_rate:
+            stats["errors"] += 1
+            return JSONResponse({"code": 503, "name": "ServiceUnavailable", "message": "stand-in error"}, status_code=503)
+        found = index.find(track_name, artist_name)
+        if found is None or (not_found_rate and rng.random() < not_found_rate):
+            stats["not_found"] += 1
+            return JSONResponse(NOT_FOUND, status_code=404)
+        entry, _ = found
+        stats["found"] += 1
+        length = float(duration or DEFAULT_DURATION)
+        return {
+            "id": zlib.crc32(entry.key.encode()),
+            "trackName": entry.title,
+            "artistName": index.artist or artist_name,
+            "albumName": album_name or entry.album,
+            "duration": length,
+            "instrumental": not entry.lines,
+            "plainLyrics": "\n".join(entry.lines),
+            "syncedLyrics": _lrc(list(entry.lines), length),
+        }
+
+    @app.get("/stats")
+    async def get_stats():
+        return dict(stats)
+
+    app.state.stats = stats
+    return app
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--lyrics-dir", default=settings.LYRICS_LOCAL_DIR)
+    ap.add_argument("--latency-ms", type=float, default=0.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 503")
+    ap.add_argument("--not-found-rate", type=float, default=0.0, help="share of known tracks answered with 404")
+    ap.add_argument("--seed", type=int, default=None)
+    args = ap.parse_args(argv)
+
+    import uvicorn
+
+    app = create_app(
+        args.lyrics_dir,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        not_found_rate=args.not_found_rate,
+        seed=args.seed,
+    )
+    print(f"{app.state.stats['tracks']} tracks; LYRICS_LRCLIB_URL=http://{args.host}:{args.port}/api/get")
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Combine and import scenarios against a local LRCLIB stand-in (no network needed).
+
+Run from backend/:
+    python -m bench.lyrics_paths --latency-ms 120 --jitter-ms 40 --concurrency 8
+    python -m bench.lyrics_paths --scenario import --batch 14 --error-rate 0.05
+    python -m bench.lyrics_paths --upstream http://127.0.0.1:8765/api/get   # bench.lrclib_standin
+
+Each scenario sends every corpus JCRD through the real routers in-process:
+- "combine" posts one /combine/jcrd-lyrics request per song;
+- "import" posts album-sized /import/multi batches.
+By default the stand-in runs in-process too (bench/lrclib_standin.py).
+
+Every scenario runs --passes times against one fresh memory-only lyrics cache. Pass 1
+is cold and shows concurrency; later passes show caching. "upstream" counts the
+requests the stand-in received during the pass; with --error-rate, or a latency above
+the request budgets (settings.LYRICS_*_BUDGET_S), the report's "breaker" section shows
+how often LRCLIB's circuit breaker opened and refused calls. The offline corpus tier is off unless
+--local-first is given, so lookups reach the stand-in.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base, get_session
+from app.routers import combine, import_mixed
+from app.services import import_pool
+from app.services.lyrics_providers import lrclib
+from app.services.lyrics_providers.cache import LyricsCache
+
+from .corpus import CHORDS_DIR, _percentile
+from .lrclib_standin import create_app as create_standin
+
+SCENARIOS = ("combine", "import")
+
+
+def load_jcrd_files(chords_dir: Path = CHORDS_DIR, *, limit: Optional[int] = None) -> List[Tuple[str, bytes]]:
+    files = []
+    for path in sorted(chords_dir.glob("*.jcrd.json*")):
+        files.append((path.name, path.read_bytes()))
+        if limit is not None and len(files) >= limit:
+            break
+    return files
+
+
+def _bench_app(engine: AsyncEngine) -> FastAPI:
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    ready: List[bool] = []
+
+    async def session_override():
+        if not ready:
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            ready.append(True)
+        async with Session() as s:
+            yield s
+
+    app = FastAPI()
+    app.include_router(import_mixed.router)
+    app.include_router(combine.router)
+    app.dependency_overrides[get_session] = session_override
+    return app
+
+
+async def _timed(gate: asyncio.Semaphore, send) -> Tuple[float, bool]:
+    async with gate:
+        t0 = time.perf_counter()
+        r = await send()
+        return (time.perf_counter() - t0) * 1000.0, r.status_code == 200
+
+
+async def _combine_pass(client: httpx.AsyncClient, files, gate) -> List[Tuple[float, bool]]:
+    def send(data: bytes):
+        payload = {"jcrd": json.loads(data), "lyrics": {"lines": []}}
+        return lambda: client.post("/combine/jcrd-lyrics", json=payload)
+
+    return await asyncio.gather(*(_timed(gate, send(data)) for _, data in files))
+
+
+async def _import_pass(client: httpx.AsyncClient, files, gate, batch: int) -> List[Tuple[float, bool]]:
+    def send(chunk):
+        parts = [("files", (name, data, "application/json")) for name, data in chunk]
+        return lambda: client.post("/import/multi", files=parts)
+
+    chunks = [files[i:i + batch] for i in range(0, len(files), batch)]
+    return await asyncio.gather(*(_timed(gate, send(c)) for c in chunks))
+
+
+async def _upstream_requests(standin: Optional[FastAPI], upstream: Optional[str]) -> Optional[int]:
+    if standin is not None:
+        return int(standin.state.stats["requests"])
+    try:
+        async with httpx.AsyncClient(timeout=2.0) as c:
+            r = await c.get(upstream.rsplit("/api/", 1)[0] + "/stats")  # type: ignore[union-attr]
+            return int(r.json()["requests"])
+    except Exception:
+        return None
+
+
+async def run_scenario(
+    scenario: str,
+    files: List[Tuple[str, bytes]],
+    *,
+    passes: int = 2,
+    concurrency: int = 8,
+    batch: int = 14,
+    upstream: Optional[str] = None,
+    standin_opts: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    standin = None if upstream else create_standin(**(standin_opts or {}))
+    lrclib.configure(transport=httpx.ASGITransport(app=standin) if standin is not None else None)
+    lrclib._cache = LyricsCache(maxsize=settings.LYRICS_CACHE_SIZE)
+    lrclib.breaker.reset()
+    gate = asyncio.Semaphore(max(1, concurrency))
+    rows = []
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    try:
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=_bench_app(engine)), base_url="http://bench", timeout=120) as client:
+            for n in range(max(1, passes)):
+                before = await _upstream_requests(standin, upstream)
+                t0 = time.perf_counter()
+                if scenario == "combine":
+                    results = await _combine_pass(client, files, gate)
+                else:
+                    results = await _import_pass(client, files, gate, batch)
+                wall = time.perf_counter() - t0
+                after = await _upstream_requests(standin, upstream)
+                samples = sorted(ms for ms, _ in results)
+                rows.append({
+                    "pass": n + 1,
+                    "requests": len(results),
+                    "failed": sum(1 for _, ok in results if not ok),
+                    "wall_s": round(wall, 3),
+                    "songs_per_s": round(len(files) / wall, 1) if wall > 0 else 0.0,
+                    "mean_ms": round(statistics.fmean(samples), 2) if samples else 0.0,
+                    "p50_ms": round(_percentile(samples, 50), 2),
+                    "p95_ms": round(_percentile(samples, 95), 2),
+                    "upstream": (after - before) if before is not None and after is not None else None,
+                })
+    finally:
+        await lrclib.aclose()
+        lrclib.configure(None)
+        await engine.dispose()
+    return {"scenario": scenario, "songs": len(files), "passes": rows, "cache": lrclib.cache_stats(), "breaker": lrclib.breaker.stats()}
+
+
+def run(
+    files: List[Tuple[str, bytes]],
+    *,
+    scenarios: Optional[List[str]] = None,
+    local_first: bool = False,
+    **kwargs: Any,
+) -> Dict[str, Any]:
+    saved = (settings.LYRICS_PROVIDER_ENABLED, settings.LYRICS_LOCAL_FIRST, settings.LYRICS_LRCLIB_URL, lrclib._cache)
+    settings.LYRICS_PROVIDER_ENABLED = True
+    settings.LYRICS_LOCAL_FIRST = local_first
+    if kwargs.get("upstream"):
+        settings.LYRICS_LRCLIB_URL = kwargs["upstream"]
+    try:
+        reports = [asyncio.run(run_scenario(name, files, **kwargs)) for name in (scenarios or list(SCENARIOS))]
+    finally:
+        settings.LYRICS_PROVIDER_ENABLED, settings.LYRICS_LOCAL_FIRST, settings.LYRICS_LRCLIB_URL, lrclib._cache = saved
+    return {"local_first": local_first, "scenarios": reports}
+
+
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"{'scenario':<10}{'pass':>5}{'reqs':>6}{'failed':>7}{'wall s':>9}{'songs/s':>9}{'p50 ms':>10}{'p95 ms':>10}{'upstream':>10}")
+    for sc in report["scenarios"]:
+        for row in sc["passes"]:
+            print(
+                f"{sc['scenario']:<10}{row['pass']:>5}{row['requests']:>6}{row['failed']:>7}{row['wall_s']:>9.3f}"
+                f"{row['songs_per_s']:>9}{row['p50_ms']:>10.2f}{row['p95_ms']:>10.2f}{str(row['upstream']):>10}"
+            )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--chords-dir", type=Path, default=CHORDS_DIR)
+    ap.add_argument("--limit", type=int, default=None, help="only the first N songs")
+    ap.add_argument("--scenario", action="append", choices=SCENARIOS, help="repeatable; default all")
+    ap.add_argument("--passes", type=int, default=2)
+    ap.add_argument("--concurrency", type=int, default=8, help="requests in flight at once")
+    ap.add_argument("--batch", type=int, default=14, help="files per /import/multi request")
+    ap.add_argument("--workers", type=int, default=0, help="IMPORT_WORKERS for the run (0 = threads)")
+    ap.add_argument("--local-first", action="store_true", help="answer from the offline corpus tier first")
+    ap.add_argument("--upstream", help="LRCLIB URL to use instead of the in-process stand-in")
+    ap.add_argument("--latency-ms", type=float, default=100.0)
+    ap.add_argument("--jitter-ms", type=float, default=0.0)
+    ap.add_argument("--error-rate", type=float, default=0.0)
+    ap.add_argument("--not-found-rate", type=float, default=0.0)
+    ap.add_argument("--out", type=Path, help="write the JSON report here")
+    args = ap.parse_args(argv)
+
+    files = load_jcrd_files(args.chords_dir, limit=args.limit)
+    if not files:
+        print(f"no .jcrd.json files under {args.chords_dir}", file=sys.stderr)
+        return 2
+    settings.IMPORT_WORKERS = args.workers
+    import_pool.shutdown()
+    report = run(
+        files,
+        scenarios=args.scenario,
+        local_first=args.local_first,
+        passes=args.passes,
+        concurrency=args.concurrency,
+        batch=args.batch,
+        upstream=args.upstream,
+        standin_opts={
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "not_found_rate": args.not_found_rate,
+        },
+    )
+    import_pool.shutdown()
+    _print_table(report)
+    if args.out:
+        args.out.parent.mkdir(parents=True, exist_ok=True)
+        args.out.write_text(json.dumps(report, indent=2), encoding="utf-8")
+        print(f"wrote {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+"""Scaling benchmark over synthetic long songs (medleys, live sets).
+
+Run from backend/:
+    python -m bench.scaling --events 10000 20000 40000
+    python -m bench.scaling --events 10000 --reference   # also time the old O(C*L) scan
+
+Each size builds one analyzed doc with N chords and N lyric lines spread over the song,
+then times to_frame (columnar mapping), to_timeline (plus Pydantic materialization)
+and the hover-pairing step on its own. Doubling N should roughly double those
+columns; the quadratic reference shows what it replaced. edit_ms (one chord and one
+lyric inserted mid-song and deleted again through timeline_edit) should stay flat.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from app.mappers import timeline_edit
+from app.mappers.timeline import _pair_hover, to_frame, to_timeline
+
+
+def synthetic_doc(n_events: int, *, seed: int = 0) -> Dict[str, Any]:
+    """Analyzed doc with n_events chords and n_events lyrics at jittered beat positions."""
+    rng = random.Random(seed)
+    symbols = ["C", "G", "Am", "F", "Dm7", "E7", "Bb", "Cmaj7"]
+    chords = []
+    lyrics = []
+    beat = 0.0
+    for i in range(n_events):
+        beat += rng.choice((1.0, 2.0, 2.0, 4.0))
+        chords.append({"symbol": rng.choice(symbols), "startBeat": beat})
+        lyrics.append({"id": f"l{i}", "text": f"line {i}", "beat": beat + rng.uniform(-1.5, 1.5)})
+    return {"title": f"synthetic {n_events}", "bpm": 120, "timeSignature": "4/4", "chords": chords, "lyrics": lyrics}
+
+
+def pair_hover_scan(chord_beats: List[float], lyric_beats: List[float]) -> List[int]:
+    """The original front-to-back scan, kept as the reference for equivalence and timing."""
+    out = []
+    for at in chord_beats:
+        best = -1
+        best_dist = 1e9
+        for k, beat in enumerate(lyric_beats):
+            d = abs(beat - at)
+            if d < best_dist:
+                best_dist = d
+                best = k
+            if beat > at + 1:
+                break
+        out.append(best if best >= 0 and best_dist <= 1 else -1)
+    return out
+
+
+def _edit_round_trip(frame: Any) -> None:
+    mid = frame.chord_beat[frame.n_chords // 2] + 0.5 if frame.n_chords else 0.0
+    row = timeline_edit.insert_chord(frame, "C", mid)
+    j = timeline_edit.insert_lyric(frame, "edit", mid)
+    timeline_edit.delete_lyric(frame, j)
+    timeline_edit.delete_chord(frame, row)
+
+
+def _best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(max(1, repeat)):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000.0
+
+
+def run(sizes: List[int], *, repeat: int = 3, reference: bool = False) -> Dict[str, Any]:
+    rows = []
+    for n in sizes:
+        doc = synthetic_doc(n)
+        frame, _, _ = to_frame(json.loads(json.dumps(doc)))
+        chords, lyrics = list(frame.chord_beat), sorted(frame.lyric_beat)
+        row: Dict[str, Any] = {
+            "events": n,
+            "to_frame_ms": round(_best_of(lambda: to_frame(json.loads(json.dumps(doc))), repeat), 2),
+            "to_timeline_ms": round(_best_of(lambda: to_timeline(json.loads(json.dumps(doc))), repeat), 2),
+            "pair_hover_ms": round(_best_of(lambda: _pair_hover(chords, lyrics), repeat), 2),
+            "edit_ms": round(_best_of(lambda: _edit_round_trip(frame), repeat), 3),
+        }
+        if reference:
+            row["pair_hover_scan_ms"] = round(_best_of(lambda: pair_hover_scan(chords, lyrics), 1), 2)
+        rows.append(row)
+    return {"repeat": repeat, "sizes": rows}
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--events", type=int, nargs="+", default=[10000, 20000, 40000])
+    ap.add_argument("--repeat", type=int, default=3)
+    ap.add_argument("--reference", action="store_true", help="also time the quadratic scan (slow)")
+    args = ap.parse_args(argv)
+    report = run(args.events, repeat=args.repeat, reference=args.reference)
+    cols = [k for k in report["sizes"][0] if k != "events"] if report["sizes"] else []
+    print(f"{'events':>8} " + " ".join(f"{c:>20}" for c in cols))
+    for row in report["sizes"]:
+        print(f"{row['events']:>8} " + " ".join(f"{row[c]:>20}" for c in cols))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,31 @@
+"""materialized song timelines
+
+Revision ID: 0003_song_timelines
+Revises: 0002_songdocs
+Create Date: 2026-10-16
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0003_song_timelines"
+down_revision = "0002_songdocs"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('song_timelines',
+        sa.Column('song_id', sa.Integer(), sa.ForeignKey('songs.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='1'),
+        sa.Column('content_hash', sa.String(length=64), nullable=False),
+        sa.Column('analyzed_json', sa.Text(), nullable=False),
+        sa.Column('timeline_json', sa.Text(), nullable=False),
+        sa.Column('warnings_json', sa.Text(), nullable=False, server_default='[]'),
+        sa.Column('validation_json', sa.Text(), nullable=False, server_default='[]'),
+        sa.Column('updated_at', sa.DateTime(), server_default=sa.func.now())
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('song_timelines')
@@ -0,0 +1,56 @@
+"""songs.content_sha256 with a unique index
+
+Revision ID: 0004_song_content_hash
+Revises: 0003_song_timelines
+Create Date: 2026-10-16
+"""
+import hashlib
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "0004_song_content_hash"
+down_revision = "0003_song_timelines"
+branch_labels = None
+depends_on = None
+
+
+def _content_sha256(text):
+    # Frozen copy of app.utils.content_hash.content_sha256 as of this revision
+    text = unicodedata.normalize("NFC", text or "")
+    lines = [line.rstrip() for line in text.replace("\r\n", "\n").replace("\r", "\n").split("\n")]
+    normalized = "\n".join(lines).strip("\n")
+    if not normalized.strip():
+        return None
+    return hashlib.sha256(normalized.encode("utf-8", errors="replace")).hexdigest()
+
+
+def upgrade() -> None:
+    op.add_column('songs', sa.Column('content_sha256', sa.String(length=64), nullable=True))
+
+    # Backfill; when existing rows already duplicate each other only the oldest gets the digest
+    bind = op.get_bind()
+    songs = sa.table('songs', sa.column('id', sa.Integer), sa.column('content', sa.Text), sa.column('content_sha256', sa.String))
+    seen = set()
+    updates = []
+    for song_id, content in bind.execute(sa.select(songs.c.id, songs.c.content).order_by(songs.c.id)):
+        digest = _content_sha256(content)
+        if digest is None or digest in seen:
+            continue
+        seen.add(digest)
+        updates.append({"song_id": song_id, "digest": digest})
+    if updates:
+        bind.execute(
+            songs.update().where(songs.c.id == sa.bindparam("song_id")).values(content_sha256=sa.bindparam("digest")),
+            updates,
+        )
+
+    op.create_index('ix_songs_content_sha256', 'songs', ['content_sha256'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_songs_content_sha256', table_name='songs')
+    with op.batch_alter_table('songs') as batch_op:
+        batch_op.drop_column('content_sha256')
@@ -0,0 +1,48 @@
+from types import SimpleNamespace
+
+from app.services.analysis_cache import AnalysisCache
+
+
+def _song(song_id, content, title="T"):
+    return SimpleNamespace(id=song_id, title=title, artist="A", content=content)
+
+
+def test_hits_misses_and_content_change():
+    cache = AnalysisCache(maxsize=4)
+    s = _song(1, "1\nC  G\nHello\n")
+    doc = cache.analyzed(s)
+    assert cache.analyzed(s) is doc
+    tl, _, _ = cache.timeline(s)  # first timeline for this version is a miss
+    assert cache.timeline(s)[0] is tl
+    assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 2
+    # Edited content -> new key, old version dropped
+    s2 = _song(1, "1\nF  G\nBye\n")
+    assert cache.analyzed(s2) is not doc
+    assert cache.stats()["size"] == 1
+    frame = cache.timeline(s2)[0]
+    assert [frame.chord_symbol(i) for i in range(frame.n_chords)] == ["F", "G"]
+
+
+def test_lru_eviction_and_invalidate():
+    cache = AnalysisCache(maxsize=2)
+    a, b, c = _song(1, "1\nC\nx\n"), _song(2, "1\nD\nx\n"), _song(3, "1\nE\nx\n")
+    cache.analyzed(a)
+    cache.analyzed(b)
+    cache.analyzed(a)  # a is now most recent
+    cache.analyzed(c)  # evicts b
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["size"] == 2
+    cache.analyzed(a)
+    assert cache.stats()["hits"] == 2
+    assert cache.invalidate(1) == 1
+    assert cache.invalidate(1) == 0
+    cache.analyzed(a)
+    assert cache.stats()["misses"] == 4
+
+
+def test_zero_size_disables_storage():
+    cache = AnalysisCache(maxsize=0)
+    s = _song(1, "1\nC\nx\n")
+    cache.analyzed(s)
+    cache.analyzed(s)
+    assert cache.stats()["size"] == 0 and cache.stats()["hits"] == 0
@@ -0,0 +1,31 @@
+from bench.corpus import STAGES, _percentile, compare, load_corpus, run
+
+
+def test_corpus_run_reports_every_stage():
+    songs = load_corpus(limit=3)
+    if not songs:
+        import pytest
+        pytest.skip("References/Beatles-Chords not available")
+    report = run(songs, iterations=1, warmup=0)
+    assert report["songs"] == len(songs)
+    assert set(report["stages"]) == set(STAGES)
+    for r in report["stages"].values():
+        assert r["calls"] == len(songs)
+        assert r["p50_ms"] <= r["p95_ms"] <= r["p99_ms"] <= r["max_ms"]
+        assert r["peak_kib"] > 0
+
+
+def test_percentile_nearest_rank():
+    vals = [float(v) for v in range(1, 101)]
+    assert _percentile(vals, 50) == 50.0
+    assert _percentile(vals, 95) == 95.0
+    assert _percentile(vals, 99) == 99.0
+    assert _percentile([], 50) == 0.0
+
+
+def test_compare_flags_only_regressions_beyond_threshold():
+    base = {"stages": {"to_timeline": {"p50_ms": 1.0, "p95_ms": 2.0, "peak_kib": 100.0}}}
+    cur = {"stages": {"to_timeline": {"p50_ms": 1.05, "p95_ms": 3.0, "peak_kib": 80.0}, "new_stage": {"p50_ms": 9.0}}}
+    regs = compare(base, cur, threshold=0.10)
+    assert [(r["stage"], r["metric"]) for r in regs] == [("to_timeline", "p95_ms")]
+    assert regs[0]["change"] == 0.5
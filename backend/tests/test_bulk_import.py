@@ -0,0 +1,110 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models
+from app.config import settings
+from app.database import Base, get_session
+from app.routers import import_mixed
+from app.services import materialize
+
+
+@pytest.fixture()
+def env(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_WORKERS", 0)
+    monkeypatch.setattr(settings, "IMPORT_PERSIST_CHUNK", 4)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    stats = {"commits": 0, "inserts": 0}
+
+    @event.listens_for(engine.sync_engine, "commit")
+    def _count_commit(conn):
+        stats["commits"] += 1
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_insert(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            stats["inserts"] += 1
+
+    async def session_override():
+        async with Session() as s:
+            yield s
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    app = FastAPI()
+    app.include_router(import_mixed.router)
+    app.dependency_overrides[get_session] = session_override
+    with TestClient(app) as c:
+        c.portal.call(create)
+        yield c, Session, stats
+
+
+def test_persist_batches_inserts(env):
+    client, Session, stats = env
+    songs = [{"title": f"Song {i}", "artist": "X", "content": f"1\nC  G\nline {i}\n"} for i in range(10)]
+    songs.append(dict(songs[0]))  # duplicate is dropped before persisting
+    files = [("files", ("book.json", json.dumps({"songs": songs}), "application/json"))]
+    stats.update(commits=0, inserts=0)
+    body = client.post("/import/multi?persist=true", files=files).json()
+    assert body["counts"]["songs"] == 10 and body["counts"]["inserted"] == 10
+    ids = body["song_ids"]
+    assert len(ids) == 10 and len(set(ids)) == 10
+    # 10 songs in chunks of 4 -> 3 transactions, each one songs INSERT + one timelines INSERT
+    assert stats["commits"] == 3
+    assert stats["inserts"] <= 6
+
+    async def check():
+        async with Session() as s:
+            rows = (await s.execute(select(models.SongORM).order_by(models.SongORM.id))).scalars().all()
+            assert [r.id for r in rows] == ids and [r.title for r in rows] == [f"Song {i}" for i in range(10)]
+            stored = await s.scalar(select(func.count()).select_from(models.MaterializedTimeline))
+            assert stored == 10
+            # Stored rows are fresh, so readers never recompute
+            assert await materialize.load_materialized(s, rows[3]) is not None
+
+    client.portal.call(check)
+
+
+def test_without_persist_nothing_is_written(env):
+    client, Session, stats = env
+    files = [("files", ("a.json", json.dumps({"title": "A", "content": "C"}), "application/json"))]
+    stats.update(commits=0, inserts=0)
+    body = client.post("/import/multi", files=files).json()
+    assert "song_ids" not in body and stats["inserts"] == 0
+
+
+def test_conflicting_song_is_reported_and_the_rest_saved(env, monkeypatch):
+    client, Session, stats = env
+    songs = [{"title": f"Song {i}", "artist": "X", "content": f"1\nC  G\nline {i}\n"} for i in range(6)]
+
+    async def stored_meanwhile():
+        # Another import saves song 5 after this request's digest pre-check
+        async with Session() as s:
+            s.add(models.SongORM(user_id=1, title="Other", artist="", content=songs[5]["content"]))
+            await s.commit()
+
+    async def nothing_stored(session, hashes):
+        return {}
+
+    client.portal.call(stored_meanwhile)
+    monkeypatch.setattr(import_mixed, "existing_hashes", nothing_stored)
+    files = [("files", ("book.json", json.dumps({"songs": songs}), "application/json"))]
+    resp = client.post("/import/multi?persist=true", files=files)
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["counts"]["inserted"] == 5 and body["counts"]["not_saved"] == 1
+    assert body["song_ids"][5] is None and all(body["song_ids"][:5])
+    assert body["not_saved"] == [{"index": 5, "title": "Song 5", "error": "duplicate content", "song_id": 1}]
+
+    async def count():
+        async with Session() as s:
+            return await s.scalar(select(func.count()).select_from(models.SongORM))
+
+    assert client.portal.call(count) == 6
@@ -0,0 +1,48 @@
+from app.services.analysis import analyze_from_content
+from app.services.import_isophonics import from_isophonics
+from app.utils.chords import is_chord_token, normalize_symbol, parse_chord
+
+
+def test_parse_chord_parts():
+    c = parse_chord("F#m7/C#")
+    assert (c.root, c.root_pc, c.quality, c.extensions, c.bass, c.bass_pc) == ("F#", 6, "min", ("7",), "C#", 1)
+    assert parse_chord("G7").quality == "dom" and parse_chord("Bbmaj7").extensions == ("maj7",)
+    assert parse_chord("C7sus4").quality == "sus4" and parse_chord("Csus").quality == "sus4"
+    assert parse_chord("N").root is None
+    assert parse_chord("Chorus") is None and parse_chord("") is None
+
+
+def test_parse_chord_is_interned():
+    assert parse_chord("Am7") is parse_chord("Am7")
+    assert parse_chord(" Am7 ").symbol == "Am7"
+
+
+def test_harte_labels_normalize():
+    assert normalize_symbol("C:min7") == "Cm7"
+    assert normalize_symbol("A:maj") == "A"
+    assert normalize_symbol("B:hdim7") == "Bm7b5"
+    assert normalize_symbol("C:maj7") == "Cmaj7" and parse_chord("C:maj7").quality == "maj"
+    assert normalize_symbol("C:maj9") == "Cmaj9" and parse_chord("C:maj9").quality == "maj"
+    assert normalize_symbol("C:maj6") == "C6" and normalize_symbol("D:min7") == "Dm7"
+    assert normalize_symbol("C:7") == "C7" and parse_chord("C:7").quality == "dom"
+    assert normalize_symbol("C:maj(9)") == "Cadd9" and normalize_symbol("C:(b3,5)") == "Cm"
+    song = from_isophonics({"chord_progression": [{"beat": 0, "chord": "D:min", "duration": 4}]})
+    assert song.lanes[0].items[0]["symbol"] == "Dm"
+
+
+def test_chord_token_grammar_unchanged():
+    for tok in ["C", "F#m7", "Bbmaj7/G", "N", "Csus4", "Cadd9", "E+", "Gdim7"]:
+        assert is_chord_token(tok)
+    for tok in ["Hello", "C-7", "Chorus", "[Verse]", "G7b9"]:
+        assert not is_chord_token(tok)
+    doc = analyze_from_content("t", "a", "1\nC  G\nhello world\nAm F")
+    assert [c["symbol"] for c in doc["chords"]] == ["C", "G", "Am", "F"]
+
+
+def test_harte_interval_bass():
+    c = parse_chord("A:7/5")
+    assert (c.symbol, c.quality, c.bass, c.bass_pc) == ("A7/E", "dom", "E", 4)
+    assert normalize_symbol("E:min/b3") == "Em/G"
+    assert normalize_symbol("C:maj/b7") == "C/Bb" and normalize_symbol("Bb:maj/3") == "Bb/D"
+    assert normalize_symbol("F#:min7/C#") == "F#m7/C#"
+    assert parse_chord("C:maj/x") is None
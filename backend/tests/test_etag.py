@@ -0,0 +1,54 @@
+import json
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models
+from app.database import Base, get_session
+from app.routers import drafts
+from app.services.materialize import song_etag
+from app.utils.etag import etag_matches, strong_etag
+
+
+def test_etag_matching_and_song_tags():
+    tag = strong_etag("x", 1)
+    assert tag.startswith('"') and tag == strong_etag("x", 1) != strong_etag("x", 2)
+    assert etag_matches(tag, tag) and etag_matches(f'"nope", W/{tag}', tag) and etag_matches("*", tag)
+    assert not etag_matches(None, tag) and not etag_matches('"nope"', tag)
+
+    song = SimpleNamespace(id=1, title="T", artist="A", content="1\nC\nx\n")
+    doc_tag = song_etag(song, "doc")
+    assert doc_tag != song_etag(song, "timeline")
+    song.content = "1\nD\nx\n"
+    assert song_etag(song, "doc") != doc_tag
+
+
+def test_draft_songdoc_conditional_get():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def session_override():
+        async with Session() as s:
+            yield s
+
+    app = FastAPI()
+    app.include_router(drafts.router)
+    app.dependency_overrides[get_session] = session_override
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as s:
+            s.add(models.SongDraft(meta=json.dumps({"title": "T"}), bpm=120, lyrics="la"))
+            await s.commit()
+
+    with TestClient(app) as client:
+        client.portal.call(seed)
+        first = client.get("/drafts/1/songdoc")
+        assert first.status_code == 200 and first.json()["meta"]["title"] == "T"
+        tag = first.headers["etag"]
+        again = client.get("/drafts/1/songdoc", headers={"If-None-Match": tag})
+        assert again.status_code == 304 and again.content == b"" and again.headers["etag"] == tag
+        assert client.get("/drafts/1/songdoc", headers={"If-None-Match": '"stale"'}).status_code == 200
@@ -0,0 +1,19 @@
+import random
+
+from app.mappers.timeline import _pair_hover
+from bench.scaling import pair_hover_scan, run
+
+
+def test_two_pointer_matches_scan():
+    rng = random.Random(7)
+    for _ in range(300):
+        # Coarse grid so ties (same beat, equal distance either side) are common
+        chords = sorted(rng.randrange(0, 80) * 0.25 for _ in range(rng.randrange(0, 25)))
+        lyrics = sorted(rng.randrange(0, 80) * 0.25 for _ in range(rng.randrange(0, 25)))
+        assert _pair_hover(chords, lyrics) == pair_hover_scan(chords, lyrics)
+
+
+def test_scaling_bench_runs():
+    report = run([500], repeat=1, reference=True)
+    row = report["sizes"][0]
+    assert row["events"] == 500 and row["pair_hover_ms"] >= 0 and "pair_hover_scan_ms" in row
@@ -0,0 +1,86 @@
+import io
+import json
+import tarfile
+import zipfile
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers import import_mixed
+from app.services.import_archive import member_key, plan
+
+JCRD = {
+    "metadata": {"title": "Michelle", "artist": "The Beatles", "tempo": 120, "time_signature": "4/4"},
+    "chord_progression": [{"time": 0.0, "chord": "F", "duration": 2.0}, {"time": 2.0, "chord": "Bbm", "duration": 2.0}],
+}
+MEMBERS = {
+    "album/07_Michelle.jcrd.json": json.dumps(JCRD).encode(),
+    "album/07_Michelle.lrc": b"[00:00.50] Michelle ma belle\n",
+    "album/08_What_Goes_On.txt": b"What goes on in your heart\n",
+    "album/README.md": b"notes",
+}
+
+
+def _zip() -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w") as zf:
+        for name, data in MEMBERS.items():
+            zf.writestr(name, data)
+    return buf.getvalue()
+
+
+def _targz() -> bytes:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode="w:gz") as tf:
+        for name, data in MEMBERS.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(data)
+            tf.addfile(info, io.BytesIO(data))
+    return buf.getvalue()
+
+
+def _client(monkeypatch) -> TestClient:
+    monkeypatch.setattr(settings, "IMPORT_WORKERS", 0)
+    app = FastAPI()
+    app.include_router(import_mixed.router)
+    return TestClient(app)
+
+
+def test_member_pairing_plan():
+    assert member_key("a/01_X.jcrd.json.json") == ("01_x", "json")
+    units = plan(list(MEMBERS))
+    assert [(u.name, u.lyrics) for u in units] == [
+        ("album/07_Michelle.jcrd.json", "album/07_Michelle.lrc"),
+        ("album/08_What_Goes_On.txt", None),
+        ("album/README.md", None),
+    ]
+
+
+def test_archive_import_streams_units(monkeypatch):
+    client = _client(monkeypatch)
+    for name, payload in (("album.zip", _zip()), ("album.tar.gz", _targz())):
+        r = client.post("/import/archive", files={"file": (name, payload, "application/octet-stream")})
+        assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(ln) for ln in r.text.splitlines()]
+        summary = lines.pop()
+        assert summary["done"] and summary["counts"] == {"members": 4, "units": 3, "songs": 2, "errors": 0}
+        by_member = {ln["member"]: ln for ln in lines}
+        paired = by_member["album/07_Michelle.jcrd.json"]
+        assert paired["lyrics"] == "album/07_Michelle.lrc"
+        assert paired["songs"][0]["title"] == "Michelle" and "Michelle ma belle" in paired["songs"][0]["content"]
+        assert by_member["album/08_What_Goes_On.txt"]["songs"][0]["content"] == "What goes on in your heart"
+        assert by_member["album/README.md"]["skipped"] is True
+
+
+def test_archive_member_limit_and_bad_archive(monkeypatch):
+    client = _client(monkeypatch)
+    # Per-file limit applies to each member, not to the archive
+    monkeypatch.setattr(settings, "UPLOAD_MAX_FILE_BYTES", 40)
+    r = client.post("/import/archive", files={"file": ("album.zip", _zip(), "application/zip")})
+    lines = [json.loads(ln) for ln in r.text.splitlines()]
+    by_member = {ln.get("member"): ln for ln in lines}
+    assert "upload limit" in by_member["album/07_Michelle.jcrd.json"]["errors"][0]
+    assert by_member["album/08_What_Goes_On.txt"]["songs"]
+    r = client.post("/import/archive", files={"file": ("a.bin", b"not an archive", "application/octet-stream")})
+    assert json.loads(r.text.splitlines()[-1])["ok"] is False
@@ -0,0 +1,80 @@
+import asyncio
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base, get_session
+from app.routers import import_mixed
+from app.services import import_pool
+
+
+def _jcrd(title: str) -> bytes:
+    return json.dumps({
+        "metadata": {"title": title, "artist": "X", "tempo": 120, "time_signature": "4/4"},
+        "chord_progression": [{"time": 0.0, "chord": "C", "duration": 2.0}, {"time": 2.0, "chord": "G", "duration": 2.0}],
+    }).encode()
+
+
+def _memory_session():
+    # /import/multi checks content digests against the songs table
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def session_override():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as s:
+            yield s
+
+    return session_override
+
+
+def _client(monkeypatch, delay: float = 0.0) -> TestClient:
+    monkeypatch.setattr(settings, "IMPORT_WORKERS", 0)
+    monkeypatch.setattr(settings, "IMPORT_CONCURRENCY", 8)
+    monkeypatch.setattr(settings, "LYRICS_PROVIDER_ENABLED", True)
+    import_pool.shutdown()
+
+    async def fake_search(title, artist, timeout=None, **kw):
+        await asyncio.sleep(delay)
+        return {"lines": [{"ts_sec": 0.5, "text": f"{title} line"}]}
+
+    monkeypatch.setattr(import_mixed, "search_timestamped_lyrics", fake_search)
+    app = FastAPI()
+    app.include_router(import_mixed.router)
+    app.dependency_overrides[get_session] = _memory_session()
+    return TestClient(app)
+
+
+def test_lyric_lookups_overlap(monkeypatch):
+    client = _client(monkeypatch, delay=0.2)
+    files = [("files", (f"s{i}.json", _jcrd(f"Song {i}"), "application/json")) for i in range(8)]
+    t0 = time.perf_counter()
+    r = client.post("/import/multi", files=files)
+    elapsed = time.perf_counter() - t0
+    assert r.status_code == 200
+    # Eight 0.2 s lookups run side by side rather than back to back
+    assert elapsed < 1.0
+    assert [s["title"] for s in r.json()["songs"]] == [f"Song {i}" for i in range(8)]
+    assert all("line" in s["content"] for s in r.json()["songs"])
+
+
+def test_order_and_dedupe_are_deterministic(monkeypatch):
+    client = _client(monkeypatch)
+    files = [
+        ("files", ("b.txt", b"first\nsecond", "text/plain")),
+        ("files", ("dup.json", json.dumps({"title": "b", "artist": "", "content": "x"}).encode(), "application/json")),
+        ("files", ("a.json", _jcrd("A"), "application/json")),
+        ("files", ("bad.json", b"{not json", "application/json")),
+        ("files", ("notes.xyz", b"", "application/octet-stream")),
+    ]
+    body = client.post("/import/multi", files=files).json()
+    assert body["success"] == ["b.txt", "dup.json", "a.json", "bad.json"]
+    assert body["skipped"] == ["notes.xyz"]
+    assert [s["title"] for s in body["songs"]] == ["b", "A"]
+    assert body["errors"][0].startswith("bad.json")
+    assert body["counts"] == {"input_files": 5, "songs": 2, "duplicates": 0}
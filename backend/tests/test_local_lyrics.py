@@ -0,0 +1,66 @@
+import asyncio
+import os
+
+import pytest
+
+from app.config import settings
+from app.services import lyrics_providers
+from app.services.lyrics_providers import local, lrclib
+from app.services.lyrics_providers.local import LocalLyricsIndex, title_key
+
+
+@pytest.fixture(scope="module")
+def index():
+    if not os.path.isdir(settings.LYRICS_LOCAL_DIR):
+        pytest.skip("References/The Beatles Lyrics not available")
+    return LocalLyricsIndex(settings.LYRICS_LOCAL_DIR, artist="The Beatles")
+
+
+def test_title_key():
+    assert title_key("12 - You_Can't_Do_That") == title_key("You Cant Do That") == "youcantdothat"
+    assert title_key("P. S. I Love You") == title_key("PS I Love You")
+
+
+def test_jcrd_titles_and_near_misses(index):
+    entry, score = index.find("12 - You_Can't_Do_That", "The Beatles")
+    assert (entry.title, entry.album, score) == ("You Cant Do That", "AHardDaysNight", 1.0)
+    # Typo in the corpus file name (Mother_Nautres_Son.txt)
+    entry, score = index.find("Mother Nature's Son", "Beatles")
+    assert entry.album == "TheBeatles" and 0.75 <= score < 1.0
+    # Numbers are never fuzzed, and other artists are not answered
+    assert index.find("Revolution 2") is None
+    assert index.find("Help!", "The Rolling Stones") is None
+
+
+def test_result_shape_matches_lrclib(index):
+    result = asyncio.run(index.search_timestamped_lyrics("You Can't Do That", "The Beatles", timeout=3.0))
+    assert result["source"] == "local" and result["matched"] and not result["synced"]
+    assert result["lines"][0] == {"ts_sec": None, "text": "I got something to say"}
+    assert index.search("No Such Song") == {"source": "local", "matched": False, "synced": False, "lines": []}
+
+
+def test_local_tier_answers_before_lrclib(index, monkeypatch):
+    upstream = []
+
+    async def fake_lrclib(**kw):
+        upstream.append(kw["title"])
+        return {"source": "lrclib", "matched": False, "synced": False, "lines": []}
+
+    monkeypatch.setattr(local, "_index", index)
+    monkeypatch.setattr(lrclib, "search_timestamped_lyrics", fake_lrclib)
+    monkeypatch.setattr(settings, "LYRICS_LOCAL_FIRST", True)
+    hit = asyncio.run(lyrics_providers.search_timestamped_lyrics("Michelle", "The Beatles"))
+    miss = asyncio.run(lyrics_providers.search_timestamped_lyrics("Hey Jude", "The Beatles"))
+    assert hit["source"] == "local" and miss["source"] == "lrclib"
+    assert upstream == ["Hey Jude"]
+
+
+def test_lrclib_answers_first_by_default(index, monkeypatch):
+    async def fake_lrclib(**kw):
+        return {"source": "lrclib", "matched": True, "synced": True, "lines": [{"ts_sec": 1.0, "text": "x"}]}
+
+    monkeypatch.setattr(local, "_index", index)
+    monkeypatch.setattr(lrclib, "search_timestamped_lyrics", fake_lrclib)
+    assert settings.LYRICS_LOCAL_FIRST is False
+    # Synced timestamps win over the untimed corpus copy of a catalog title
+    assert asyncio.run(lyrics_providers.search_timestamped_lyrics("Michelle", "The Beatles"))["synced"]
@@ -0,0 +1,121 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.services.lyrics_providers import lrclib
+from app.services.lyrics_providers.cache import LyricsCache
+from app.services.lyrics_providers.resilience import CircuitBreaker
+
+
+@pytest.fixture()
+def upstream(monkeypatch):
+    monkeypatch.setattr(lrclib, "_cache", LyricsCache())
+    monkeypatch.setattr(lrclib, "breaker", CircuitBreaker())
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(dict(request.url.params))
+        if request.url.params["track_name"] == "Missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"syncedLyrics": "[00:01.50] Hello\n[00:03.00] There"})
+
+    lrclib.configure(transport=httpx.MockTransport(handler))
+    yield seen
+    lrclib.configure(None)
+
+
+def test_lookups_share_one_client(upstream):
+    async def run():
+        clients = set()
+        for title in ("Help", "Yesterday", "Missing"):
+            clients.add(id(lrclib.get_client()))
+            result = await lrclib.search_timestamped_lyrics(title, "The Beatles", duration_sec=120)
+        await lrclib.aclose()
+        return clients, result
+
+    clients, missing = asyncio.run(run())
+    assert len(clients) == 1
+    assert missing == {"source": "lrclib", "matched": False, "synced": False, "lines": []}
+    assert [p["track_name"] for p in upstream] == ["Help", "Yesterday", "Missing"]
+    assert upstream[0]["duration"] == "120"
+
+
+def test_parsed_lines_and_cache(upstream):
+    async def run():
+        first = await lrclib.search_timestamped_lyrics("Help", "The Beatles")
+        again = await lrclib.search_timestamped_lyrics("help ", "the beatles")
+        await lrclib.aclose()
+        return first, again
+
+    first, again = asyncio.run(run())
+    assert first["synced"] and first["lines"] == [{"ts_sec": 1.5, "text": "Hello"}, {"ts_sec": 3.0, "text": "There"}]
+    assert again is first and len(upstream) == 1
+
+
+def test_new_event_loop_gets_new_client(upstream):
+    async def grab():
+        return lrclib.get_client()
+
+    a = asyncio.run(grab())
+    b = asyncio.run(grab())
+    assert a is not b
+
+
+def _slow_upstream(monkeypatch, status: int = 200):
+    monkeypatch.setattr(lrclib, "_cache", LyricsCache())
+    monkeypatch.setattr(lrclib, "breaker", CircuitBreaker())
+    calls = []
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["track_name"])
+        await asyncio.sleep(0.05)
+        if status != 200:
+            return httpx.Response(status)
+        return httpx.Response(200, json={"plainLyrics": "la la"})
+
+    lrclib.configure(transport=httpx.MockTransport(handler))
+    return calls
+
+
+def test_concurrent_lookups_share_one_request(monkeypatch):
+    calls = _slow_upstream(monkeypatch)
+
+    async def run():
+        results = await asyncio.gather(*(
+            lrclib.search_timestamped_lyrics(title, "The Beatles")
+            for title in ("Revolution", "revolution", "Revolution 1", "Revolution")
+        ))
+        await lrclib.aclose()
+        return results
+
+    try:
+        results = asyncio.run(run())
+    finally:
+        lrclib.configure(None)
+    assert sorted(calls) == ["Revolution", "Revolution 1"]
+    assert results[0] is results[1] is results[3]
+    assert lrclib._inflight == {}
+
+
+def test_failures_reach_every_waiter_and_are_not_cached(monkeypatch):
+    calls = _slow_upstream(monkeypatch, status=500)
+
+    async def run():
+        outcomes = await asyncio.gather(
+            *(lrclib.search_timestamped_lyrics("Help", "The Beatles") for _ in range(3)),
+            return_exceptions=True,
+        )
+        with pytest.raises(httpx.HTTPStatusError):
+            await lrclib.search_timestamped_lyrics("Help", "The Beatles")
+        await lrclib.aclose()
+        return outcomes
+
+    try:
+        outcomes = asyncio.run(run())
+    finally:
+        lrclib.configure(None)
+    assert all(isinstance(o, httpx.HTTPStatusError) for o in outcomes)
+    # One shared failed request, then a fresh attempt
+    assert calls == ["Help", "Help"]
+    assert lrclib._cache.stats()["size"] == 0
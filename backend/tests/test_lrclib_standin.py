@@ -0,0 +1,67 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import import_pool
+from app.services.lyrics_providers import lrclib
+from app.services.lyrics_providers.cache import LyricsCache
+from app.services.lyrics_providers.resilience import CircuitBreaker
+from bench import lyrics_paths
+from bench.lrclib_standin import create_app
+
+
+@pytest.fixture()
+def use_standin(monkeypatch):
+    monkeypatch.setattr(lrclib, "_cache", LyricsCache())
+    monkeypatch.setattr(lrclib, "breaker", CircuitBreaker())
+
+    def install(**opts):
+        app = create_app(**opts)
+        lrclib.configure(transport=httpx.ASGITransport(app=app))
+        return app
+
+    yield install
+    lrclib.configure(None)
+
+
+def _lookup(title: str):
+    async def run():
+        try:
+            return await lrclib.search_timestamped_lyrics(title, "The Beatles", duration_sec=150)
+        finally:
+            await lrclib.aclose()
+
+    return asyncio.run(run())
+
+
+def test_standin_serves_corpus_tracks(use_standin):
+    app = use_standin()
+    if app.state.stats["tracks"] == 0:
+        pytest.skip("References/The Beatles Lyrics not available")
+    found = _lookup("12 - You_Can't_Do_That")
+    assert found["matched"] and found["synced"]
+    assert found["lines"][0]["text"] == "I got something to say"
+    assert 0 < found["lines"][0]["ts_sec"] < found["lines"][-1]["ts_sec"] < 150
+    assert _lookup("Not A Beatles Song")["matched"] is False
+    assert app.state.stats == {"requests": 2, "found": 1, "not_found": 1, "errors": 0, "tracks": app.state.stats["tracks"]}
+
+
+def test_standin_injects_errors(use_standin):
+    use_standin(error_rate=1.0)
+    with pytest.raises(httpx.HTTPStatusError):
+        _lookup("Michelle")
+
+
+def test_bench_scenarios_use_standin(monkeypatch):
+    files = lyrics_paths.load_jcrd_files(limit=3)
+    if not files:
+        pytest.skip("References/Beatles-Chords not available")
+    monkeypatch.setattr(settings, "IMPORT_WORKERS", 0)
+    import_pool.shutdown()
+    report = lyrics_paths.run(files, passes=2, batch=2, standin_opts={"latency_ms": 0})
+    for scenario in report["scenarios"]:
+        cold, warm = scenario["passes"]
+        assert cold["failed"] == warm["failed"] == 0
+        assert cold["upstream"] == 3 and warm["upstream"] == 0
@@ -0,0 +1,68 @@
+import asyncio
+
+import httpx
+
+from app.services.lyrics_providers import cache as cache_mod
+from app.services.lyrics_providers import lrclib
+from app.services.lyrics_providers.cache import LyricsCache
+
+FOUND = {"source": "lrclib", "matched": True, "synced": False, "lines": [{"ts_sec": None, "text": "la"}]}
+MISS = {"source": "lrclib", "matched": False, "synced": False, "lines": []}
+
+
+def test_memory_tier_is_bounded_lru():
+    c = LyricsCache(maxsize=2)
+    c.put("a", FOUND)
+    c.put("b", FOUND)
+    assert c.get("a") is FOUND  # a is now most recent
+    c.put("c", FOUND)
+    assert c.get("b") is None and c.get("a") is FOUND and c.get("c") is FOUND
+    stats = c.stats()
+    assert stats["size"] == 2 and stats["evictions"] == 1
+    assert stats["hits"] == 3 and stats["misses"] == 1
+
+
+def test_misses_expire_sooner(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(cache_mod.time, "time", lambda: now[0])
+    c = LyricsCache(ttl=100, negative_ttl=10)
+    c.put("found", FOUND)
+    c.put("missing", MISS)
+    now[0] += 50
+    assert c.get("found") is FOUND
+    assert c.get("missing") is None
+    assert c.stats()["expirations"] == 1
+
+
+def test_disk_tier_survives_restart(tmp_path):
+    path = str(tmp_path / "lyrics.sqlite3")
+    LyricsCache(path=path).put("k", FOUND)
+    # A new process starts with an empty memory tier
+    c = LyricsCache(path=path)
+    assert c.get("k") is None
+    assert c.load("k") == FOUND
+    assert c.get("k") == FOUND
+    assert c.load("other") is None
+    stats = c.stats()
+    assert stats["disk_hits"] == 1 and stats["disk_misses"] == 1 and stats["disk"]
+
+
+def test_provider_reads_through_disk_tier(tmp_path, monkeypatch):
+    path = str(tmp_path / "lyrics.sqlite3")
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.params["track_name"])
+        return httpx.Response(404)
+
+    lrclib.configure(transport=httpx.MockTransport(handler))
+    try:
+        for _ in range(2):
+            # Fresh memory tier each round, as after a worker restart
+            monkeypatch.setattr(lrclib, "_cache", LyricsCache(path=path))
+            result = asyncio.run(lrclib.search_timestamped_lyrics("Her Majesty", "The Beatles"))
+            assert result == MISS
+    finally:
+        lrclib.configure(None)
+    assert calls == ["Her Majesty"]
+    assert lrclib.cache_stats()["disk_hits"] == 1
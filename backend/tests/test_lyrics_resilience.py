@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.config import settings
+from app.services import lyrics_providers
+from app.services.lyrics_providers import local, lrclib
+from app.services.lyrics_providers.cache import LyricsCache
+from app.services.lyrics_providers.local import LocalLyricsIndex
+from app.services.lyrics_providers.resilience import CircuitBreaker, LatencyBudget
+
+
+@pytest.fixture()
+def upstream(monkeypatch):
+    """LRCLIB mock whose behaviour is set per test; local tier empty and not consulted first."""
+    monkeypatch.setattr(lrclib, "_cache", LyricsCache())
+    monkeypatch.setattr(lrclib, "breaker", CircuitBreaker(window=60, min_calls=3, failure_ratio=0.5, open_seconds=60))
+    monkeypatch.setattr(local, "_index", LocalLyricsIndex(""))
+    monkeypatch.setattr(settings, "LYRICS_LOCAL_FIRST", False)
+    state = {"status": 200, "delay": 0.0, "calls": 0}
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        state["calls"] += 1
+        await asyncio.sleep(state["delay"])
+        if state["status"] != 200:
+            return httpx.Response(state["status"])
+        return httpx.Response(200, json={"syncedLyrics": "[00:01.00] Hello"})
+
+    lrclib.configure(transport=httpx.MockTransport(handler))
+    yield state
+    lrclib.configure(None)
+
+
+def _run(coro_fn):
+    async def run():
+        try:
+            return await coro_fn()
+        finally:
+            await lrclib.aclose()
+
+    return asyncio.run(run())
+
+
+def test_breaker_opens_then_probes():
+    b = CircuitBreaker(window=60, min_calls=4, failure_ratio=0.5, open_seconds=0.05)
+    for ok in (True, False, True):
+        assert b.allow()
+        b.record(ok)
+    assert b.state == "closed"
+    b.record(False)  # 2 of 4 failed
+    assert b.state == "open" and not b.allow()
+    time.sleep(0.06)
+    assert b.allow() and b.state == "half_open"
+    assert not b.allow()  # one probe at a time
+    b.record(True)
+    assert b.state == "closed" and b.stats()["window_calls"] == 0
+    assert b.stats()["opened"] == 1 and b.stats()["rejected"] == 2
+
+
+def test_open_breaker_falls_back_without_upstream(upstream):
+    upstream["status"] = 503
+
+    async def lookups():
+        out = []
+        for n in range(5):
+            try:
+                out.append(await lyrics_providers.search_timestamped_lyrics(f"Song {n}", "Band"))
+            except httpx.HTTPStatusError:
+                out.append(None)
+        return out
+
+    results = _run(lookups)
+    assert results[:3] == [None, None, None]
+    assert results[3] == results[4] == {
+        "source": "none", "matched": False, "synced": False, "lines": [], "fallback": "breaker_open"
+    }
+    assert upstream["calls"] == 3
+    stats = lyrics_providers.stats()
+    assert stats["breaker"]["state"] == "open" and stats["breaker"]["failures"] == 3
+    assert stats["fallbacks"]["breaker_open"] >= 2
+
+
+def test_degraded_lookups_still_serve_cached_lyrics(upstream):
+    async def lookups():
+        first = await lyrics_providers.search_timestamped_lyrics("Help", "The Beatles")
+        spent = await lyrics_providers.search_timestamped_lyrics("Help", "The Beatles", budget=LatencyBudget(0))
+        lrclib.breaker._open(time.monotonic())
+        opened = await lyrics_providers.search_timestamped_lyrics("Help", "The Beatles")
+        return first, spent, opened
+
+    first, spent, opened = _run(lookups)
+    assert first["matched"] and spent["fallback"] == "budget_exhausted" and spent["lines"] == first["lines"]
+    assert opened is first
+    assert upstream["calls"] == 1
+
+
+def test_budget_is_shared_across_lookups(upstream):
+    upstream["delay"] = 0.5
+
+    async def lookups():
+        budget = LatencyBudget(0.1)
+        t0 = time.perf_counter()
+        results = await asyncio.gather(
+            *(lyrics_providers.search_timestamped_lyrics(f"Song {n}", "Band", timeout=3.0, budget=budget) for n in range(4))
+        )
+        late = await lyrics_providers.search_timestamped_lyrics("Late", "Band", timeout=3.0, budget=budget)
+        return time.perf_counter() - t0, results, late
+
+    elapsed, results, late = _run(lookups)
+    assert elapsed < 0.4
+    assert all(r["fallback"] == "budget_exhausted" and not r["lines"] for r in results + [late])
+    assert upstream["calls"] == 4  # the late lookup never went upstream
+
+
+def test_cancelled_call_is_not_a_failure(upstream):
+    upstream["delay"] = 5.0
+
+    async def cancel_probe():
+        lrclib.breaker._open(time.monotonic() - 61)  # cool-down over: next call is the probe
+        caller = asyncio.ensure_future(lrclib.search_timestamped_lyrics("Slow", "Band"))
+        await asyncio.sleep(0.05)
+        # Cancel the shared upstream fetch itself, as loop teardown does
+        task = lrclib._inflight[lrclib._mk_cache_key("Slow", "Band", None, None)]
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        return lrclib.breaker.stats(), lrclib.breaker.allow()
+
+    stats, allowed = _run(cancel_probe)
+    assert stats["state"] == "half_open" and stats["failures"] == 0
+    assert allowed  # the probe slot was freed for the next call
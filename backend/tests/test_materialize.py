@@ -0,0 +1,66 @@
+import json
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models
+from app.database import Base
+from app.services import materialize
+from app.services.analysis_cache import analysis_cache
+
+
+@pytest_asyncio.fixture()
+async def session():
+    # Own engine per test: the shared conftest engine is bound to whichever loop used it first
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)() as s:
+        yield s
+    await engine.dispose()
+
+
+@pytest.mark.asyncio
+async def test_materialize_and_read_back(session):
+    analysis_cache.clear()
+    song = models.SongORM(user_id=1, title="M", artist="A", content="1\nC  G  Am\nHello there\n")
+    session.add(song)
+    await materialize.materialize_song(session, song)
+    await session.commit()
+
+    row = await session.get(models.MaterializedTimeline, song.id)
+    assert row.version == materialize.MATERIALIZE_VERSION
+    assert [c["symbol"] for c in json.loads(row.timeline_json)["chords"]] == ["C", "G", "Am"]
+
+    # Served from the stored row (cache cold) and equal to a fresh computation
+    analysis_cache.clear()
+    timeline, warnings, validation = await materialize.analysis_for(session, song, timeline=True)
+    fresh = materialize.compute(song)[1]
+    assert timeline == fresh[0] and warnings == fresh[1] and validation == fresh[2]
+    assert analysis_cache.stats()["misses"] == 0
+
+    # Edited outside the write path -> row is stale, reader recomputes
+    song.content = "1\nF\nBye\n"
+    await session.commit()
+    assert await materialize.load_materialized(session, song) is None
+    tl, _, _ = await materialize.analysis_for(session, song, timeline=True)
+    assert [tl.chord_symbol(i) for i in range(tl.n_chords)] == ["F"]
+
+
+@pytest.mark.asyncio
+async def test_backfill_batches_and_skips_fresh_rows(session, monkeypatch):
+    for i in range(5):
+        session.add(models.SongORM(user_id=1, title=f"B{i}", artist="", content=f"1\nC  D\nline {i}\n"))
+    await session.commit()
+    total = len((await session.execute(select(models.SongORM.id))).all())
+
+    first = await materialize.backfill(session, batch_size=2)
+    assert first == {"scanned": total, "written": total, "skipped": 0}
+    again = await materialize.backfill(session, batch_size=2)
+    assert again == {"scanned": total, "written": 0, "skipped": total}
+
+    monkeypatch.setattr(materialize, "MATERIALIZE_VERSION", materialize.MATERIALIZE_VERSION + 1)
+    bumped = await materialize.backfill(session, batch_size=3)
+    assert bumped["written"] == total
@@ -0,0 +1,59 @@
+import asyncio
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.parser import SongSplitter, aiter_body_lines, parse_songs
+from app.routers import parse as parse_router
+
+BOOK = "{title: One}\n{artist: A}\nC  G\nhello\r\n{title: Two}\nAm  F\r\n---\nThree - B\nworld ‘x’\n"
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(parse_router.router)
+    return TestClient(app)
+
+
+def test_splitter_emits_song_at_next_boundary():
+    splitter = SongSplitter()
+    assert splitter.feed("{title: One}") is None
+    assert splitter.feed("C  G") is None
+    assert splitter.feed("{title: Two}") == "{title: One}\nC  G"
+    assert splitter.feed("---") == "{title: Two}"
+    assert splitter.feed("x") is None
+    assert splitter.close() == "x"
+
+
+def test_body_lines_survive_chunk_boundaries():
+    data = BOOK.encode()
+
+    async def collect(size):
+        async def chunks():
+            for i in range(0, len(data), size):
+                yield data[i:i + size]
+        return [ln async for ln in aiter_body_lines(chunks())]
+
+    for size in (1, 2, 5, 64):
+        assert "".join(asyncio.run(collect(size))) == BOOK.replace("\r\n", "\n")
+
+
+def test_parse_streams_ndjson_per_song():
+    client = _client()
+    r = client.post("/parse?stream=true", content=BOOK, headers={"Content-Type": "text/plain"})
+    assert r.status_code == 200 and r.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(ln) for ln in r.text.splitlines()]
+    assert [ln["index"] for ln in lines] == [0, 1, 2]
+    assert [(ln["title"], ln["artist"]) for ln in lines] == [("One", "A"), ("Two", ""), ("Three", "B")]
+    assert [c["symbol"] for c in lines[0]["analysis"]["chords"]] == ["C", "G"]
+    assert [{k: ln[k] for k in ("title", "artist", "content")} for ln in lines] == parse_songs(BOOK)
+
+
+def test_parse_buffered_and_accept_header():
+    client = _client()
+    r = client.post("/parse", content=BOOK, headers={"Content-Type": "text/plain"})
+    assert [{k: s[k] for k in ("title", "artist", "content")} for s in r.json()["songs"]] == parse_songs(BOOK)
+    r = client.post("/parse?analyze=false", content=BOOK, headers={"Accept": "application/x-ndjson"})
+    lines = [json.loads(ln) for ln in r.text.splitlines()]
+    assert len(lines) == 3 and "analysis" not in lines[0]
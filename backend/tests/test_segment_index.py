@@ -0,0 +1,26 @@
+from app.utils.segments import SegmentIndex
+
+
+def _segs(rows):
+    return [{"start_sec": st, "end_sec": et, "chord": ch} for (st, et, ch) in rows]
+
+
+def test_overlapping_matches_linear_scan():
+    segs = _segs([(0.0, 2.0, "C"), (2.0, 4.0, "F"), (1.0, 9.0, "Pad"), (4.0, 6.0, "G"), (6.0, 8.0, "C")])
+    index = SegmentIndex(segs)
+    for lo, hi in [(0.0, 1.0), (1.5, 4.5), (4.0, 6.0), (7.9, 20.0), (9.0, 10.0)]:
+        expected = [s for s in segs if not (s["end_sec"] <= lo or s["start_sec"] >= hi)]
+        assert index.overlapping(lo, hi) == expected
+    assert index.max_end == 9.0
+
+
+def test_chord_at_prefers_first_in_order_and_falls_back_to_last():
+    segs = _segs([(0.0, 2.0, "C"), (2.0, 4.0, "F"), (5.0, 6.0, "G")])
+    index = SegmentIndex(segs)
+    assert index.chord_at(0.0) == "C"
+    assert index.chord_at(2.0) == "F"
+    # gap between F and G before the last segment starts
+    assert index.chord_at(4.5) is None
+    # past the end -> last chord
+    assert index.chord_at(100.0) == "G"
+    assert SegmentIndex([]).chord_at(1.0) is None
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import event, func, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models
+from app.config import settings
+from app.database import Base, get_session
+from app.routers import combine, import_mixed
+from app.utils.content_hash import content_sha256
+
+
+def _jcrd(title: str) -> dict:
+    return {
+        "metadata": {"title": title, "artist": "X", "tempo": 120, "time_signature": "4/4"},
+        "chord_progression": [{"time": 0.0, "chord": "C", "duration": 2.0}, {"time": 2.0, "chord": "G", "duration": 2.0}],
+    }
+
+
+@pytest.fixture()
+def env(monkeypatch):
+    monkeypatch.setattr(settings, "IMPORT_WORKERS", 0)
+    monkeypatch.setattr(settings, "LYRICS_PROVIDER_ENABLED", True)
+    lookups = []
+
+    async def fake_search(title, artist, timeout=None, **kw):
+        lookups.append(title)
+        return {"lines": [{"ts_sec": 0.5, "text": f"{title} line"}]}
+
+    monkeypatch.setattr(import_mixed, "search_timestamped_lyrics", fake_search)
+    monkeypatch.setattr(combine, "search_timestamped_lyrics", fake_search)
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+    hash_queries = []
+
+    @event.listens_for(engine.sync_engine, "before_cursor_execute")
+    def _count_lookup(conn, cursor, statement, params, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT") and "content_sha256 IN" in statement:
+            hash_queries.append(statement)
+
+    async def session_override():
+        async with Session() as s:
+            yield s
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    app = FastAPI()
+    app.include_router(import_mixed.router)
+    app.include_router(combine.router)
+    app.dependency_overrides[get_session] = session_override
+    with TestClient(app) as c:
+        c.portal.call(create)
+        yield c, Session, lookups, hash_queries
+
+
+def _count_songs(client, Session) -> int:
+    async def count():
+        async with Session() as s:
+            return await s.scalar(select(func.count()).select_from(models.SongORM))
+
+    return client.portal.call(count)
+
+
+def test_normalized_digest():
+    assert content_sha256("Intro\r\nC  G  \n\n") == content_sha256("Intro\nC  G")
+    assert content_sha256("Intro\nC G") != content_sha256("Intro\nC  G")
+    assert content_sha256("  \n") is None
+
+
+def test_reimport_skips_existing_songs(env):
+    client, Session, lookups, hash_queries = env
+    album = [("files", (f"s{i}.json", json.dumps(_jcrd(f"Song {i}")), "application/json")) for i in range(3)]
+    album.append(("files", ("notes.txt", "one\ntwo", "text/plain")))
+    body = client.post("/import/multi?persist=true", files=album).json()
+    assert body["counts"]["inserted"] == 4 and body["duplicates"] == []
+    assert lookups == ["Song 0", "Song 1", "Song 2"]
+
+    lookups.clear()
+    hash_queries.clear()
+    # Same album again (one file re-saved with CRLF endings) plus one new song
+    album[3] = ("files", ("notes.txt", "one  \r\ntwo\r\n", "text/plain"))
+    album.append(("files", ("s9.json", json.dumps(_jcrd("Song 9")), "application/json")))
+    body = client.post("/import/multi?persist=true", files=album).json()
+    assert [s["title"] for s in body["songs"]] == ["Song 9"]
+    assert body["counts"]["duplicates"] == 4 and body["counts"]["inserted"] == 1
+    assert all(d["song_id"] for d in body["duplicates"])
+    # One digest query for the batch, and no lyric lookups for the known songs
+    assert len(hash_queries) == 1
+    assert lookups == ["Song 9"]
+    assert _count_songs(client, Session) == 5
+
+
+def test_repeats_within_one_upload(env):
+    client, Session, lookups, _ = env
+    files = [
+        ("files", ("a.json", json.dumps(_jcrd("A")), "application/json")),
+        ("files", ("copy.json", json.dumps(_jcrd("A")), "application/json")),
+    ]
+    body = client.post("/import/multi", files=files).json()
+    assert body["counts"]["songs"] == 1
+    assert body["duplicates"] == [{"file": "copy.json", "content_sha256": body["songs"][0]["content_sha256"], "song_id": None}]
+    assert lookups == ["A"]
+
+
+def test_combine_save_returns_existing_song(env):
+    client, Session, lookups, _ = env
+    payload = {"jcrd": _jcrd("Michelle"), "lyrics": {"lines": []}}
+    first = client.post("/combine/jcrd-lyrics?save=true", json=payload).json()
+    assert first["song"]["id"] and "duplicate" not in first
+    assert lookups == ["Michelle"]
+    # Key order in the file does not matter
+    payload["jcrd"] = dict(reversed(list(payload["jcrd"].items())))
+    again = client.post("/combine/jcrd-lyrics?save=true", json=payload).json()
+    assert again["duplicate"] is True and again["song"]["id"] == first["song"]["id"]
+    assert lookups == ["Michelle"]
+    assert _count_songs(client, Session) == 1
+
+
+def test_combine_save_race_returns_existing_song(env, monkeypatch):
+    client, Session, _, _ = env
+    payload = {"jcrd": _jcrd("Girl"), "lyrics": {"lines": []}}
+    first = client.post("/combine/jcrd-lyrics?save=true", json=payload).json()
+
+    # A concurrent request that passed the pre-check before the first one committed
+    async def nothing_stored(session, hashes):
+        return {}
+
+    monkeypatch.setattr(combine, "existing_hashes", nothing_stored)
+    again = client.post("/combine/jcrd-lyrics?save=true", json=payload)
+    assert again.status_code == 200
+    assert again.json()["duplicate"] is True and again.json()["song"]["id"] == first["song"]["id"]
+    assert _count_songs(client, Session) == 1
@@ -0,0 +1,93 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models
+from app.database import Base, get_session
+from app.routers import drafts, songs_v1
+from app.services.analysis_cache import analysis_cache
+
+CONTENT = "1\nC  G  Am  F\nHello there world\n2\nDm  G\nSecond line here\n"
+
+
+@pytest.fixture()
+def client():
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def session_override():
+        async with Session() as s:
+            yield s
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as s:
+            s.add(models.SongORM(user_id=1, title="T", artist="A", content=CONTENT))
+            for _ in range(2):
+                s.add(models.SongDraft(meta=json.dumps({"title": "Drafted"}), sections=json.dumps([{"name": "Verse"}]), lyrics="la la"))
+            await s.commit()
+
+    app = FastAPI()
+    app.include_router(songs_v1.router)
+    app.include_router(drafts.router)
+    app.dependency_overrides[get_session] = session_override
+    analysis_cache.clear()
+    with TestClient(app) as c:
+        c.portal.call(seed)
+        yield c
+
+
+def test_doc_and_timeline_read_orm_rows(client):
+    doc = client.get("/v1/songs/1/doc")
+    assert doc.status_code == 200, doc.text
+    timeline = client.get("/v1/songs/1/timeline")
+    assert timeline.status_code == 200, timeline.text
+    assert sorted(c["symbol"] for c in timeline.json()["timeline"]["chords"]) == ["Am", "C", "Dm", "F", "G", "G"]
+    assert client.get("/v1/songs/99/doc").status_code == 404
+    assert client.get("/v1/songs/99/timeline").status_code == 404
+
+
+def test_conditional_reads_return_304(client):
+    for path in ("/v1/songs/1/doc", "/v1/songs/1/timeline", "/v1/songs/1/timeline?fromBeat=0&toBeat=4"):
+        first = client.get(path)
+        tag = first.headers["etag"]
+        again = client.get(path, headers={"If-None-Match": tag})
+        assert again.status_code == 304 and again.content == b"" and again.headers["etag"] == tag
+        assert client.get(path, headers={"If-None-Match": '"stale"'}).status_code == 200
+    full = client.get("/v1/songs/1/timeline").headers["etag"]
+    assert client.get("/v1/songs/1/timeline?fromBeat=0&toBeat=4").headers["etag"] != full
+
+
+def test_timeline_windows(client):
+    full = client.get("/v1/songs/1/timeline").json()["timeline"]
+    beats = client.get("/v1/songs/1/timeline?fromBeat=0&toBeat=4").json()
+    assert beats["window"] == {"fromBeat": 0, "toBeat": 4}
+    want = [
+        c for c in full["chords"]
+        if c["atBeat"] < 4 and (c["atBeat"] >= 0 or (c["durationBeats"] is not None and c["atBeat"] + c["durationBeats"] > 0))
+    ]
+    assert beats["timeline"]["chords"] == want and 0 < len(want) < len(full["chords"])
+    assert beats["timeline"]["lyrics"] == [l for l in full["lyrics"] if 0 <= l["atBeat"] < 4]
+    secs = client.get("/v1/songs/1/timeline?fromSec=0&toSec=2").json()
+    assert secs["window"]["fromBeat"] == 0 and secs["window"]["toBeat"] > 0
+    assert client.get("/v1/songs/1/timeline?fromBeat=0&fromSec=1").status_code == 422
+    assert client.get("/v1/songs/1/timeline?fromBeat=4&toBeat=2").status_code == 422
+
+
+def test_song_from_draft_is_materialized(client):
+    created = client.post("/songs/from-draft", json={"draftId": "draft_1"})
+    assert created.status_code == 200, created.text
+    song_id = created.json()["id"]
+    assert created.json()["title"] == "Drafted"
+    assert client.get(f"/v1/songs/{song_id}/doc").status_code == 200
+
+
+def test_song_from_identical_draft_conflicts(client):
+    first = client.post("/songs/from-draft", json={"draftId": 1}).json()
+    again = client.post("/songs/from-draft", json={"draftId": 2})
+    assert again.status_code == 409
+    assert again.json()["detail"]["song_id"] == first["id"]
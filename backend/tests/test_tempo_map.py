@@ -0,0 +1,75 @@
+import pytest
+
+from app.utils.tempo_map import TempoMap
+from app.utils.align import chords_only_text
+from app.mappers.timeline import to_timeline
+
+
+def test_single_mark_matches_constant_arithmetic():
+    tm = TempoMap([(0.0, 90.0)], [(0.0, 6, 8)])
+    assert tm.is_constant
+    # qbeats: 90 bpm in eighths -> 45 quarter bpm
+    assert tm.sec_to_beats(4.0) == pytest.approx(3.0)
+    assert tm.beats_to_sec(3.0) == pytest.approx(4.0)
+    # 6/8 bar = 3 quarters
+    assert tm.position(7.5) == (3, pytest.approx(2.5), 6)
+
+
+def test_tempo_change_accumulates_beats():
+    tm = TempoMap([(0.0, 120.0), (10.0, 60.0)], [(0.0, 4, 4)])
+    assert tm.sec_to_beats(10.0) == pytest.approx(20.0)
+    assert tm.sec_to_beats(14.0) == pytest.approx(24.0)
+    assert tm.beats_to_sec(24.0) == pytest.approx(14.0)
+    assert tm.span_beats(8.0, 4.0) == pytest.approx(4.0 + 2.0)
+    # unsorted / late first mark still covers time 0
+    late = TempoMap([(10.0, 60.0), (2.0, 120.0)], [])
+    assert late.sec_to_beats(1.0) == pytest.approx(2.0)
+
+
+def test_meter_change_starts_new_bar():
+    # 4/4 for 10 beats (2.5 bars) then 3/4
+    tm = TempoMap([(0.0, 60.0)], [(0.0, 4, 4), (10.0, 3, 4)])
+    assert tm.position(9.0) == (3, pytest.approx(2.0), 4)
+    assert tm.position(10.0) == (4, pytest.approx(1.0), 3)
+    assert tm.position(13.5) == (5, pytest.approx(1.5), 3)
+    assert tm.meter_at_beats(12.0) == (3, 3.0)
+
+
+def test_array_lookups_match_scalar():
+    np = pytest.importorskip("numpy")
+    tm = TempoMap([(0.0, 100.0), (7.3, 140.0), (20.0, 90.0)], [(0.0, 4, 4), (12.0, 7, 8)])
+    secs = [0.0, 3.1, 7.3, 9.99, 12.0, 15.5, 20.0, 33.3]
+    beats = tm.sec_to_beats_array(secs)
+    assert beats.tolist() == pytest.approx([tm.sec_to_beats(s) for s in secs])
+    bars, bib, nums = tm.position_array(beats - 1.0, origin=1.0)
+    for b, bar, beat, num in zip(beats, bars, bib, nums):
+        exp = tm.position(float(b) - 1.0, origin=1.0)
+        assert (int(bar), int(num)) == (exp[0], exp[2])
+        assert float(beat) == pytest.approx(exp[1])
+
+
+def test_docs_with_maps_flow_through():
+    jcrd = {
+        "metadata": {
+            "tempo": 120,
+            "time_signature": "4/4",
+            "tempo_map": [{"time": 0.0, "bpm": 120}, {"time": 4.0, "bpm": 60}],
+        },
+        "chord_progression": [
+            {"time": 0.0, "duration": 4.0, "chord": "C"},
+            {"time": 4.0, "duration": 4.0, "chord": "G"},
+        ],
+    }
+    out = chords_only_text(jcrd, bar_start="zero")
+    # 8 qbeats at 120 -> G lands on bar 3
+    assert [c["bar"] for c in out["chords"]] == [1, 3]
+    assert out["metadata"]["tempo_map"] == [{"time": 0.0, "bpm": 120.0}, {"time": 4.0, "bpm": 60.0}]
+
+    tl, _, _ = to_timeline({
+        "bpm": 120,
+        "tempoMap": [{"atSec": 0.0, "bpm": 120}, {"atSec": 4.0, "bpm": 60}],
+        "chords": [{"symbol": "C", "start_sec": 0.0}, {"symbol": "G", "start_sec": 6.0}],
+    })
+    assert [c.atBeat for c in tl.chords] == [0.0, 10.0]
+    assert tl.chords[1].atSec == pytest.approx(6.0)
+    assert len(tl.tempoMap) == 2
@@ -0,0 +1,53 @@
+import json
+from pathlib import Path
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from app.utils import tempo  # type: ignore
+from app.utils.tempo import convert_jcrd  # type: ignore
+from app.utils.align import merge_jcrd_with_lyrics, chords_only_text  # type: ignore
+
+CORPUS = Path(__file__).resolve().parents[2] / "References" / "Beatles-Chords"
+
+
+def _corpus():
+    return [json.loads(p.read_text(encoding="utf-8")) for p in sorted(CORPUS.glob("*.json"))]
+
+
+def _lyrics_for(jcrd):
+    # Timed lines every ~4s plus a few untimed ones to exercise pseudo placement
+    prog = jcrd.get("chord_progression") or []
+    end = max([float(it.get("time", 0.0)) + float(it.get("duration", 0.0)) for it in prog], default=60.0)
+    lines = [{"ts_sec": round(t * 4.13, 2), "text": f"line {t}"} for t in range(int(end // 4.13))]
+    lines[3:3] = [{"ts_sec": None, "text": "untimed"}]
+    return lines
+
+
+def _run_all(docs):
+    out = []
+    for doc in docs:
+        lines = _lyrics_for(doc)
+        out.append((
+            convert_jcrd(doc),
+            chords_only_text(doc),
+            merge_jcrd_with_lyrics(doc, lines),
+            merge_jcrd_with_lyrics(doc, lines, bar_start="zero"),
+        ))
+    return out
+
+
+def test_vectorized_positions_match_scalar_across_corpus(monkeypatch):
+    docs = _corpus()
+    assert docs, "reference corpus missing"
+    monkeypatch.setattr(tempo, "VECTORIZE_MIN_EVENTS", 10**9)
+    scalar = _run_all(docs)
+    monkeypatch.setattr(tempo, "VECTORIZE_MIN_EVENTS", 0)
+    vectorized = _run_all(docs)
+    assert json.dumps(vectorized) == json.dumps(scalar)
+
+
+def test_round_array_matches_builtin_round_on_ties():
+    vals = np.array([0.0625, 2.675, 1.0005, 0.1235, 5.5555, 1e-7, 3.14159265])
+    assert tempo._round_array(vals, 3).tolist() == [round(float(v), 3) for v in vals]
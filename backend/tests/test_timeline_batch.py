@@ -0,0 +1,66 @@
+import json
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import models
+from app.config import settings
+from app.database import Base, get_session
+from app.routers import songs_v1
+from app.services import materialize, timeline_batch
+from app.services.analysis_cache import analysis_cache
+
+
+@pytest.fixture()
+def client(monkeypatch):
+    monkeypatch.setattr(settings, "TIMELINE_WORKERS", 2)
+    timeline_batch.shutdown()
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def session_override():
+        async with Session() as s:
+            yield s
+
+    async def seed():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as s:
+            for i in range(4):
+                s.add(models.SongORM(user_id=1, title=f"S{i}", artist="", content=f"1\nC  G\nline {i}\n"))
+            s.add(models.SongORM(user_id=1, title="empty", artist="", content=""))
+            await s.flush()
+            first = await s.get(models.SongORM, 1)
+            await materialize.materialize_song(s, first)  # served from the stored row
+            await s.commit()
+
+    app = FastAPI()
+    app.include_router(songs_v1.router)
+    app.dependency_overrides[get_session] = session_override
+    analysis_cache.clear()
+    with TestClient(app) as c:
+        c.portal.call(seed)
+        yield c
+    timeline_batch.shutdown()
+
+
+def test_batch_streams_one_line_per_id(client):
+    resp = client.post("/v1/songs/timelines", json={"ids": [1, 2, 3, 4, 5, 99, 2]})
+    assert resp.status_code == 200 and resp.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(l) for l in resp.text.splitlines()]
+    by_id = {l["id"]: l for l in lines}
+    assert len(lines) == 6 and set(by_id) == {1, 2, 3, 4, 5, 99}
+    assert by_id[99]["error"]["status"] == 404
+    assert by_id[5]["error"]["status"] == 422
+    for i in range(1, 5):
+        assert [c["symbol"] for c in by_id[i]["timeline"]["chords"]] == ["C", "G"]
+    # Pool results seed the process cache
+    assert analysis_cache.stats()["size"] >= 3
+
+
+def test_batch_rejects_empty_and_oversized(client, monkeypatch):
+    assert client.post("/v1/songs/timelines", json={"ids": []}).status_code == 422
+    monkeypatch.setattr(settings, "TIMELINE_BATCH_MAX", 2)
+    assert client.post("/v1/songs/timelines", json={"ids": [1, 2, 3]}).status_code == 422
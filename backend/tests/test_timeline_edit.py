@@ -0,0 +1,122 @@
+import copy
+import random
+
+import pytest
+
+from app.mappers import timeline_edit as edit
+from app.mappers.timeline import _quantize, to_frame
+from app.mappers.timeline_frame import TimelineFrame
+
+SYMBOLS = ["C", "G", "Am", "F", "D7"]
+
+
+def _doc(rng, n_chords, n_lyrics, n_sections):
+    doc = {"id": 1, "bpm": rng.choice([90, 120, 132.5]), "timeSignature": "4/4", "chords": [], "lyrics": [], "sections": []}
+    for _ in range(n_chords):
+        _add_chord(rng, doc)
+    for _ in range(n_lyrics):
+        _add_lyric(rng, doc)
+    for _ in range(n_sections):
+        _add_section(rng, doc)
+    return doc
+
+
+def _beat(rng):
+    # Coarse grid with off-grid values mixed in, so ties and snapping both occur
+    return rng.randrange(0, 64) * 0.5 if rng.random() < 0.8 else rng.uniform(0, 32)
+
+
+def _add_chord(rng, doc):
+    c = {"symbol": rng.choice(SYMBOLS), "startBeat": _beat(rng)}
+    if rng.random() < 0.3:
+        c["lengthBeats"] = rng.choice([1.0, 2.0, 6.5])
+    doc["chords"].append(c)
+    return c
+
+
+def _add_lyric(rng, doc):
+    l = {"text": f"w{rng.randrange(1000)}", "beat": _beat(rng)}
+    if rng.random() < 0.5:
+        l["id"] = f"id{rng.randrange(1000)}"
+    doc["lyrics"].append(l)
+    return l
+
+
+def _add_section(rng, doc):
+    s = {"name": rng.choice(["Verse", "Chorus 1", "Bridge"]), "startBeat": rng.randrange(0, 32) * 1.0}
+    if rng.random() < 0.8:
+        s["lengthBeats"] = rng.choice([4.0, 8.0, 16.0])
+    doc["sections"].append(s)
+    return s
+
+
+def _doc_chord_index(doc, row):
+    beats = [_quantize(float(c["startBeat"] or 0.0), 0.25) for c in doc["chords"]]
+    return sorted(range(len(beats)), key=beats.__getitem__)[row]
+
+
+def _apply(rng, frame, doc):
+    op = rng.choice(["ins_c", "del_c", "mov_c", "ins_l", "del_l", "mov_l", "ins_s", "del_s", "mov_s"])
+    if op == "ins_c":
+        c = _add_chord(rng, doc)
+        edit.insert_chord(frame, c["symbol"], c["startBeat"], c.get("lengthBeats"))
+    elif op in ("del_c", "mov_c") and frame.n_chords:
+        row = rng.randrange(frame.n_chords)
+        c = doc["chords"].pop(_doc_chord_index(doc, row))
+        if op == "del_c":
+            edit.delete_chord(frame, row)
+        else:
+            c = {**c, "startBeat": _beat(rng)}
+            doc["chords"].append(c)
+            edit.move_chord(frame, row, c["startBeat"])
+    elif op == "ins_l":
+        l = _add_lyric(rng, doc)
+        edit.insert_lyric(frame, l["text"], l["beat"], l.get("id"))
+    elif op in ("del_l", "mov_l") and frame.n_lyrics:
+        j = rng.randrange(frame.n_lyrics)
+        l = doc["lyrics"].pop(j)
+        if op == "del_l":
+            edit.delete_lyric(frame, j)
+        else:
+            beat = _beat(rng)
+            # A moved lyric keeps its resolved id
+            doc["lyrics"].append({"text": l["text"], "beat": beat, "id": frame.lyric_id[j]})
+            edit.move_lyric(frame, j, beat)
+    elif op == "ins_s":
+        s = _add_section(rng, doc)
+        edit.insert_section(frame, s["name"], s["startBeat"], s.get("lengthBeats"))
+    elif op in ("del_s", "mov_s") and doc["sections"]:
+        k = rng.randrange(len(doc["sections"]))
+        s = doc["sections"].pop(k)
+        if op == "del_s":
+            edit.delete_section(frame, k)
+        else:
+            sec = frame.sections[k]
+            length = None
+            if sec["endSec"] is not None:
+                length = frame.sec_to_beats(sec["endSec"]) - frame.sec_to_beats(sec["startSec"])
+            start = rng.randrange(0, 32) * 1.0
+            doc["sections"].append({"name": sec["name"], "startBeat": start, "lengthBeats": length})
+            edit.move_section(frame, k, start)
+
+
+def test_random_edits_match_full_remap():
+    rng = random.Random(11)
+    for _ in range(60):
+        doc = _doc(rng, rng.randrange(0, 12), rng.randrange(0, 12), rng.randrange(0, 3))
+        frame, _, _ = to_frame(copy.deepcopy(doc))
+        for _ in range(25):
+            _apply(rng, frame, doc)
+            expected, _, _ = to_frame(copy.deepcopy(doc))
+            assert frame.to_dict() == expected.to_dict()
+            # Window queries keep working off the incrementally maintained index
+            assert frame.window(4.0, 12.0) == expected.window(4.0, 12.0)
+
+
+def test_edits_need_duration_provenance():
+    frame, _, _ = to_frame({"chords": [{"symbol": "C", "startBeat": 0}], "lyrics": [{"text": "a", "beat": 0}]})
+    stored = TimelineFrame.from_dict(frame.to_dict())
+    with pytest.raises(ValueError):
+        edit.insert_chord(stored, "G", 4)
+    with pytest.raises(ValueError):
+        edit.insert_chord(frame, "", 4)
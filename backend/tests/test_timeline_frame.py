@@ -0,0 +1,49 @@
+import copy
+import random
+import json
+
+from app.mappers.timeline import to_frame, to_timeline
+from app.mappers.timeline_frame import TimelineFrame
+from app.schemas_timeline import SongTimeline
+from bench.scaling import synthetic_doc
+
+
+def test_frame_matches_pydantic_timeline_and_round_trips():
+    doc = {**synthetic_doc(200), "id": 7, "sections": [{"name": "Chorus", "startBeat": 0, "lengthBeats": 64}]}
+    frame, warnings, validation = to_frame(copy.deepcopy(doc))
+    timeline, warnings2, validation2 = to_timeline(copy.deepcopy(doc))
+    assert frame.to_dict() == timeline.model_dump() == SongTimeline.model_validate(frame.to_dict()).model_dump()
+    assert (warnings, validation) == (warnings2, validation2)
+    assert any(frame.chord_lyric_id(i) for i in range(frame.n_chords))
+    # Stored JSON (what materialize writes) decodes to an equal frame
+    assert TimelineFrame.from_dict(json.loads(json.dumps(frame.to_dict()))) == frame
+    assert len(frame.symbols) <= 8 and frame.n_chords == 200
+
+
+def test_frame_helpers():
+    frame, _, _ = to_frame({"chords": [{"symbol": "G", "startBeat": 4}, {"symbol": "C", "startBeat": 0}],
+                            "lyrics": [{"text": "hi", "beat": 4.5}]})
+    assert [frame.chord_symbol(i) for i in range(frame.n_chords)] == ["C", "G"]
+    assert frame.chord_duration(0) == 4.0 and frame.chord_duration(1) is None
+    assert frame.chord_lyric_id(1) == "b4.5" and frame.chord_lyric_id(0) is None
+    assert frame.last_beat() == 4.5
+
+
+def test_window_matches_linear_filter():
+    doc = {**synthetic_doc(400, seed=3), "id": 1}
+    doc["chords"][10]["lengthBeats"] = 40  # one long chord reaching into later windows
+    frame, _, _ = to_frame(doc)
+    full = frame.to_dict()
+    rng = random.Random(5)
+    for _ in range(50):
+        lo = rng.uniform(-10, frame.last_beat())
+        hi = lo + rng.uniform(0.5, 60)
+        got = frame.window(lo, hi)
+        want_chords = [
+            c for c in full["chords"]
+            if c["atBeat"] < hi and (c["atBeat"] >= lo or (c["durationBeats"] is not None and c["atBeat"] + c["durationBeats"] > lo))
+        ]
+        want_lyrics = [l for l in full["lyrics"] if lo <= l["atBeat"] < hi]
+        assert got["chords"] == want_chords and got["lyrics"] == want_lyrics
+    assert frame.window(None, None) == full
+    assert frame.sec_to_beats(frame.beats_to_sec(12.0)) == 12.0
@@ -0,0 +1,77 @@
+import io
+import json
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.config import settings
+from app.database import Base, get_session
+from app.legacy.ingest.lyrics import parse_lyrics_file, parse_lyrics_payload
+from app.legacy.router import router as legacy_router
+from app.routers import import_json, import_lyrics, import_mixed
+
+
+def _memory_session():
+    # /import/multi checks content digests against the songs table
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    Session = async_sessionmaker(engine, expire_on_commit=False, class_=AsyncSession)
+
+    async def session_override():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with Session() as s:
+            yield s
+
+    return session_override
+
+
+def _client(monkeypatch, file_max: int = 1000, request_max: int = 5000) -> TestClient:
+    monkeypatch.setattr(settings, "UPLOAD_MAX_FILE_BYTES", file_max)
+    monkeypatch.setattr(settings, "UPLOAD_MAX_REQUEST_BYTES", request_max)
+    monkeypatch.setattr(settings, "IMPORT_WORKERS", 0)
+    monkeypatch.setattr(settings, "LYRICS_PROVIDER_ENABLED", False)
+    app = FastAPI()
+    app.include_router(legacy_router, prefix="/legacy")
+    app.include_router(import_json.router)
+    app.include_router(import_lyrics.router)
+    app.include_router(import_mixed.router)
+    app.dependency_overrides[get_session] = _memory_session()
+    return TestClient(app)
+
+
+def test_small_uploads_parse_from_spooled_files(monkeypatch):
+    client = _client(monkeypatch)
+    r = client.post("/import/lyrics", files={"file": ("a.lrc", "[00:10.5] Line A\r\n[00:12] Line B", "text/plain")})
+    assert [(it["line"], it["timestamp"]) for it in r.json()["items"]] == [("Line A", 10.5), ("Line B", 12.0)]
+    assert r.json()["size_bytes"] == 32
+    r = client.post("/import/json", files={"file": ("s.json", json.dumps({"title": "T"}), "application/json")})
+    assert r.json()["summary"]["title"] == "T"
+    r = client.post("/legacy/lyrics/parse", content="one\ntwo", headers={"Content-Type": "text/plain"})
+    assert [l["text"] for l in r.json()["lines"]] == ["one", "two"]
+
+
+def test_per_file_limit(monkeypatch):
+    client = _client(monkeypatch, file_max=100)
+    big = "x" * 200
+    assert client.post("/import/lyrics", files={"file": ("a.txt", big, "text/plain")}).status_code == 413
+    assert client.post("/legacy/lyrics/parse", content=big).status_code == 413
+    # /import/multi reports the oversized file and keeps the rest
+    files = [("files", ("big.txt", big, "text/plain")), ("files", ("ok.txt", "fine", "text/plain"))]
+    body = client.post("/import/multi", files=files).json()
+    assert body["success"] == ["ok.txt"] and body["errors"][0].startswith("big.txt: 413")
+
+
+def test_per_request_limit(monkeypatch):
+    client = _client(monkeypatch, file_max=10_000, request_max=1000)
+    files = [("files", (f"f{i}.txt", "y" * 400, "text/plain")) for i in range(4)]
+    assert client.post("/import/multi", files=files).status_code == 413
+    # Chunked bodies (no Content-Length) are counted while they are read
+    chunks = iter([b"z" * 600, b"z" * 600])
+    assert client.post("/legacy/lyrics/parse", content=chunks).status_code == 413
+
+
+def test_lyrics_file_matches_payload_parser():
+    text = "WEBVTT\n\n00:00:01.000 --> 00:00:02.000\nhello\r\nNOTE skip\n"
+    for name in (None, "a.vtt", "a.txt", "a.csv"):
+        assert parse_lyrics_file(io.BytesIO(text.encode()), name) == parse_lyrics_payload(text, name)
@@ -2,6 +2,8 @@ from fastapi import APIRouter, HTTPException
 from pydantic import BaseModel
 from typing import List, Optional
 
+from webapp.backend.app.utils.chords import parse_chord
+
 router = APIRouter()
 
 
@@ -17,15 +19,16 @@ class KeyHintResponse(BaseModel):
     confidence: float
 
 
+def _parse(ch: str):
+    # lower-case roots ("am7") are accepted as their capitalized spelling
+    ch = (ch or '').strip()
+    return parse_chord(ch[:1].upper() + ch[1:]) if ch else None
+
+
 def normalize_chord(ch: str) -> str:
-    # strip extensions like Cmaj7 -> C, Am7 -> A
-    if not ch: return ''
-    ch = ch.strip()
-    # root is first char(s) with optional #/b
-    m = ch[0]
-    if len(ch) > 1 and ch[1] in ['#','b']:
-        m = ch[:2]
-    return m.upper()
+    # strip extensions like Cmaj7 -> C, Am7 -> A; '' for anything that is not a chord
+    parsed = _parse(ch)
+    return parsed.root if parsed is not None and parsed.root else ''
 
 
 @router.post('/hint/key_chroma', response_model=KeyHintResponse)
@@ -45,7 +48,7 @@ async def key_chroma(req: KeyHintRequest):
     best = max(counts.items(), key=lambda kv: kv[1])
     key = best[0]
     confidence = best[1] / total
-    # naive mode detection: if minor chords (m/a) appear often, mark minor
-    minor_count = sum(1 for c in req.chords if 'm' in c.lower() and not c.lower().startswith('m'))
+    # mode: minor when minor/diminished chords make up a large share of the progression
+    minor_count = sum(1 for c in req.chords if (p := _parse(c)) is not None and p.is_minor)
     mode = 'minor' if minor_count / max(1, total) > 0.4 else 'major'
     return KeyHintResponse(key=key, mode=mode, confidence=round(confidence, 3))
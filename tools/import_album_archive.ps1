@@ -0,0 +1,38 @@
+param(
+  [string]$AlbumMatch = "Rubber_Soul",
+  [string]$ApiBase = "http://localhost:8000",
+  [string]$Root = "$PSScriptRoot/../References/Beatles-Chords"
+)
+
+# One request per album: zip the matching files and POST them to /import/archive
+$ErrorActionPreference = 'Stop'
+
+Write-Host "Album match:" $AlbumMatch
+$files = Get-ChildItem -Path $Root -File | Where-Object { $_.Name -like "*${AlbumMatch}*" } | Sort-Object Name
+if (-not $files -or $files.Count -eq 0) {
+  Write-Host "No files matched." -ForegroundColor Yellow
+  exit 1
+}
+
+$zip = Join-Path ([System.IO.Path]::GetTempPath()) "$AlbumMatch.zip"
+if (Test-Path $zip) { Remove-Item $zip }
+Compress-Archive -Path ($files | ForEach-Object { $_.FullName }) -DestinationPath $zip
+
+try {
+  $out = & curl.exe -s -N -F "file=@$zip;type=application/zip" "$ApiBase/import/archive"
+  $songs = 0
+  foreach ($line in $out) {
+    if (-not $line) { continue }
+    $r = $line | ConvertFrom-Json
+    if ($r.done) {
+      Write-Host "Done:" ($r.counts | ConvertTo-Json -Compress)
+    } else {
+      $songs += @($r.songs).Count
+      Write-Host $r.member "->" (@($r.songs) | ForEach-Object { $_.title }) -join ", "
+      foreach ($e in @($r.errors)) { if ($e) { Write-Warning $e } }
+    }
+  }
+  Write-Host "Songs:" $songs
+} finally {
+  Remove-Item $zip -ErrorAction SilentlyContinue
+}